@@ -0,0 +1,300 @@
+# alarm_clips.py
+# 알람 이벤트 클립: 알람이 켜진 시각 기준 PREROLL_SEC 전 ~ POSTROLL_SEC 후 영상을 파일로 남긴다.
+#
+# 프리롤은 FrameReader 의 FrameRing (약 DELAY_SEC 길이) 보다 길어야 하므로 따로 모아 둔다.
+# ClipCapture 스레드가 링 슬롯을 "preroll" 핀으로 읽어 CLIP_FPS 간격으로 JPEG 압축해 메모리에 보관하고
+# (720p 원본 2.7 MB → 약 0.1 MB), 클립 구간이 끝나면 JPEG 목록을 ClipEncoder 스레드에 넘긴다.
+# 인코더는 우선순위를 낮춘 별도 스레드에서 디코딩 → ROI/온도/알람 burn-in → VideoWriter 로 쓰고,
+# 세그먼트 녹화와 같은 형식의 .frames / .thermal 사이드카도 함께 남긴다 (segment_recorder.read_segment).
+#
+# 켜진 알람 규칙이 하나도 없으면 (engine.rules) 프리롤을 모으지 않는다 (카메라마다 15 fps JPEG 압축 비용).
+# 클립 폴더는 세그먼트 녹화와 같은 방식으로 CLIP_RETENTION_SEC / CLIP_RETENTION_BYTES 를 넘으면 오래된 것부터 지운다.
+#
+# 알람 리스너(on_alarm_transitions)는 열화상 구독 스레드에서 불리므로 작업 등록만 하고 바로 반환한다.
+# 클립 구간이 겹치는 알람은 하나의 클립으로 합치고 (뒤 구간만 늘림), 클립 길이는 MAX_CLIP_SEC 까지.
+#
+#   {name}_{YYYYmmdd_HHMMSS_mmm}_ROI{0-3}.mp4 (+ .frames, .thermal)  시각은 첫 알람 시각
+import glob
+import os
+import queue
+import time
+from collections import deque
+from threading import Event, Lock, Thread
+
+import cv2
+import numpy as np
+
+from frame_reader import DECODE_SLACK
+from roi_utils import RoiOverlay, draw_rois
+from segment_recorder import (CLIP_TAG, FRAME_TIME, RECORD_EXT, RECORD_FOURCC, enforce_retention,
+                              lower_priority, segment_files)
+from thermal_store import SAMPLE_DTYPE
+
+PREROLL_SEC = 10
+POSTROLL_SEC = 10
+MAX_CLIP_SEC = 120          # 알람이 계속 이어져도 클립 하나는 이 길이까지 (넘으면 새 클립)
+CLIP_FPS = 15               # 프리롤 보관/클립 프레임 속도 (원본보다 높으면 원본 속도)
+PREROLL_QUALITY = 80        # 프리롤 JPEG 품질
+STALL_SEC = 2.0             # 영상이 끊겨 클립 끝 시각의 프레임이 오지 않으면 이만큼 기다린 뒤 있는 프레임으로 저장
+POLL_SEC = 0.005
+IDLE_SEC = 0.5              # 켜진 알람 규칙이 없을 때 확인 주기
+CLIP_RETENTION_SEC = 7 * 24 * 3600    # 이보다 오래된 클립 삭제
+CLIP_RETENTION_BYTES = 5 * 1024 ** 3  # 카메라별 클립 전체 크기가 이를 넘으면 오래된 것부터 삭제
+RING_OWNER = "preroll"
+CLIP_DIR = os.environ.get("CLIP_DIR", "clips")
+ALARM_CLIPS = os.environ.get("ALARM_CLIPS", "1") != "0"  # 0 이면 뷰어에서 클립 저장 안 함
+
+
+def list_clips(directory, prefix, ext=RECORD_EXT):
+    # prefix 카메라의 알람 클립 경로, 오래된 것부터. 세그먼트 녹화 파일은 같은 폴더에 있어도 빠진다
+    pattern = f"{glob.escape(prefix)}_*{CLIP_TAG}*{ext}"
+    return sorted(glob.glob(os.path.join(glob.escape(directory), pattern)))
+
+
+class ClipJob:
+    def __init__(self, trigger_time, roi, preroll_sec, postroll_sec):
+        self.trigger_time = trigger_time
+        self.start = trigger_time - preroll_sec
+        self.end = trigger_time + postroll_sec
+        self.rois = [roi]            # 이 클립에 포함된 알람 ROI (켜진 순서)
+        self.triggered = time.perf_counter()
+
+
+class ClipEncoder(Thread):
+    # 클립 파일 쓰기 전용 스레드. 종료 시 대기 중인 클립을 모두 쓴 뒤 끝나도록 daemon 이 아님
+    def __init__(self, directory, prefix, store=None, engine=None, fourcc=RECORD_FOURCC, ext=RECORD_EXT,
+                 retention_sec=CLIP_RETENTION_SEC, retention_bytes=CLIP_RETENTION_BYTES):
+        super().__init__(name=f"ClipEncoder-{prefix}")
+        self.directory = directory
+        self.prefix = prefix
+        self.store = store        # ThermalStore (burn-in 온도, .thermal 사이드카)
+        self.engine = engine      # AlarmEngine (프레임 시각의 알람 채우기)
+        self.fourcc = fourcc
+        self.ext = ext
+        self.retention_sec = retention_sec
+        self.retention_bytes = retention_bytes
+        self.clips = 0
+        self.failed = 0
+        self.deleted = 0          # 보관 한도로 지운 클립 수
+        self.encode_sec = 0.0     # 클립 파일 쓰기 누적 시간
+        self.last_path = None
+        self._jobs = queue.Queue()
+        self._overlay = RoiOverlay()
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def pending(self):
+        return self._jobs.qsize()
+
+    def submit(self, job, frames, rois):
+        # frames: [(캡처 시각, JPEG 바이트 배열)], rois: 클립을 만들 때의 ROI 설정
+        self._jobs.put((job, frames, rois))
+
+    def finish(self):
+        self._jobs.put(None)
+
+    def run(self):
+        lower_priority()
+        self._enforce_retention()
+        while True:
+            item = self._jobs.get()
+            if item is None:
+                break
+            job, frames, rois = item
+            t0 = time.perf_counter()
+            try:
+                self.last_path = self._write(job, frames, rois)
+                self.clips += 1
+            except Exception as e:
+                self.failed += 1
+                print(f"[ClipEncoder] 클립 저장 실패: {e}")
+            self.encode_sec += time.perf_counter() - t0
+            self._enforce_retention()
+
+    def _enforce_retention(self):
+        paths = list_clips(self.directory, self.prefix, self.ext)
+        self.deleted += enforce_retention(paths, self.retention_sec, self.retention_bytes)
+
+    def _write(self, job, frames, rois):
+        stamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(job.trigger_time))
+        stamp += f"_{int(job.trigger_time * 1000) % 1000:03d}"
+        tag = "-".join(str(r) for r in job.rois)
+        path = os.path.join(self.directory, f"{self.prefix}_{stamp}{CLIP_TAG}{tag}{self.ext}")
+        _, frames_path, thermal_path = segment_files(path)
+
+        span = frames[-1][0] - frames[0][0]
+        fps = (len(frames) - 1) / span if span > 0 and len(frames) > 1 else CLIP_FPS
+        writer = None
+        try:
+            with open(frames_path, "wb") as times_file:
+                for frame_time, jpeg in frames:
+                    frame = cv2.imdecode(jpeg, cv2.IMREAD_COLOR)
+                    if frame is None:
+                        continue
+                    if writer is None:
+                        h, w = frame.shape[:2]
+                        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*self.fourcc), fps, (w, h))
+                        if not writer.isOpened():
+                            raise RuntimeError(f"{path} 를 열 수 없습니다 ({self.fourcc})")
+                    self._burn_in(frame, frame_time, rois)
+                    writer.write(frame)
+                    times_file.write(FRAME_TIME.pack(frame_time))
+        finally:
+            if writer is not None:
+                writer.release()
+
+        if self.store is not None:
+            parts = [self.store.window(area, job.start, job.end) for area in range(self.store.max_areas)]
+            samples = np.concatenate(parts) if parts else np.zeros(0, SAMPLE_DTYPE)
+            samples[np.argsort(samples["recv_time"], kind="stable")].tofile(thermal_path)
+        print(f"[ClipEncoder] 저장: {path} ({len(frames)} frames, ROI {tag})")
+        return path
+
+    def _burn_in(self, frame, frame_time, rois):
+        thermal = self.store.at(frame_time) if self.store is not None else None
+        alarms = self.engine.active_fields(frame_time) if self.engine is not None else ()
+        if rois:
+            draw_rois(frame, rois, thermal, 1.0, 1.0, self._overlay, alarms, bgr=True)
+        text = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(frame_time)) + f".{int(frame_time * 1000) % 1000:03d}"
+        cv2.putText(frame, text, (10, frame.shape[0] - 12), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 0), 3, cv2.LINE_AA)
+        cv2.putText(frame, text, (10, frame.shape[0] - 12), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1, cv2.LINE_AA)
+
+
+class ClipCapture(Thread):
+    # reader: FrameReader, store: ThermalStore, engine: AlarmEngine (None 이면 burn-in/사이드카 생략)
+    def __init__(self, reader, store=None, engine=None, directory=CLIP_DIR, name="camera",
+                 preroll_sec=PREROLL_SEC, postroll_sec=POSTROLL_SEC, fps=CLIP_FPS, quality=PREROLL_QUALITY):
+        super().__init__(name=f"ClipCapture-{name}", daemon=True)
+        self.reader = reader
+        self.engine = engine
+        self.preroll_sec = preroll_sec
+        self.postroll_sec = postroll_sec
+        self.fps = fps
+        self.quality = quality
+        self.rois = []            # GUI 스레드가 ROI 갱신 때 참조를 교체
+        self.triggers = 0         # 받은 알람 ON 수
+        self.merged = 0           # 진행 중인 클립에 합쳐진 알람 수
+        self.frames = 0           # 프리롤에 넣은 프레임 수
+        self.compress_sec = 0.0   # JPEG 압축 누적 시간
+        self.raw_bytes = 0        # 보관 중인 프레임의 원본 크기 합
+        self.preroll_bytes = 0    # 보관 중인 JPEG 크기 합
+        self.encoder = ClipEncoder(directory, name.replace(":", "_").replace("/", "_"), store, engine)
+        self._buffer = deque()    # (캡처 시각, JPEG, 원본 크기)
+        self._jobs = []           # 구간이 아직 끝나지 않은 ClipJob (시작 순)
+        self._lock = Lock()
+        self._stop_event = Event()
+
+    @property
+    def directory(self):
+        return self.encoder.directory
+
+    def on_alarm_transitions(self, transitions):
+        # AlarmEngine 리스너 (열화상 구독 스레드): 켜진 알람만 작업으로 등록
+        for t in transitions:
+            if t.active:
+                self.trigger(t.time, t.roi)
+
+    def trigger(self, trigger_time, roi=None):
+        with self._lock:
+            self.triggers += 1
+            job = self._jobs[-1] if self._jobs else None
+            end = trigger_time + self.postroll_sec
+            if job is not None and trigger_time <= job.end and end - job.start <= MAX_CLIP_SEC:
+                job.end = max(job.end, end)
+                if roi not in job.rois:
+                    job.rois.append(roi)
+                self.merged += 1
+                return job
+            job = ClipJob(trigger_time, roi, self.preroll_sec, self.postroll_sec)
+            self._jobs.append(job)
+            return job
+
+    def run(self):
+        lower_priority()
+        self.encoder.start()
+        ring = self.reader.frames
+        last_time = None
+        kept_time = 0.0
+        try:
+            while not self._stop_event.is_set():
+                if not self._jobs and not self.armed:
+                    # 알람이 날 수 없는 동안은 프리롤을 버리고 링 슬롯도 잡지 않음
+                    self._clear_buffer()
+                    ring.release(RING_OWNER)
+                    last_time = None
+                    self._stop_event.wait(IDLE_SEC)
+                    continue
+                frame, frame_time = ring.next_after(last_time, RING_OWNER)
+                if frame is None:
+                    self._stop_event.wait(POLL_SEC)
+                    self._dispatch(last_time)
+                    continue
+                last_time = frame_time
+                if frame_time - kept_time >= DECODE_SLACK / self.fps:
+                    self._keep(frame, frame_time)
+                    kept_time = frame_time
+                self._dispatch(frame_time)
+                self._trim(frame_time)
+        finally:
+            ring.release(RING_OWNER)
+            self._dispatch(None, force=True)
+            self.encoder.finish()
+
+    @property
+    def armed(self):
+        # 켜진 알람 규칙이 있는지 (engine 이 없으면 trigger 를 직접 부르는 용도라 항상 모음)
+        return self.engine is None or bool(self.engine.rules.enabled.any())
+
+    def _keep(self, frame, frame_time):
+        t0 = time.perf_counter()
+        ok, jpeg = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+        self.compress_sec += time.perf_counter() - t0
+        if not ok:
+            return
+        self._buffer.append((frame_time, jpeg, frame.nbytes))
+        self.frames += 1
+        self.preroll_bytes += jpeg.nbytes
+        self.raw_bytes += frame.nbytes
+
+    def _dispatch(self, frame_time, force=False):
+        # 끝 시각의 프레임까지 모은 작업을 인코더로 (영상이 끊겼으면 STALL_SEC 뒤에 있는 것만으로)
+        with self._lock:
+            if not self._jobs:
+                return
+            now = time.time()
+            ready = [job for job in self._jobs
+                     if force or (frame_time is not None and frame_time >= job.end) or now >= job.end + STALL_SEC]
+            if not ready:
+                return
+            self._jobs = [job for job in self._jobs if job not in ready]
+        rois = self.rois
+        for job in ready:
+            frames = [(t, jpeg) for t, jpeg, _ in self._buffer if job.start <= t <= job.end]
+            if frames:
+                self.encoder.submit(job, frames, rois)
+            else:
+                print(f"[ClipCapture] ROI{job.rois} 알람 구간에 영상 프레임이 없어 클립을 만들지 않음")
+
+    def _trim(self, frame_time):
+        # 프리롤 구간과 아직 끝나지 않은 클립 구간만 남김
+        keep_from = frame_time - self.preroll_sec
+        with self._lock:
+            if self._jobs:
+                keep_from = min(keep_from, self._jobs[0].start)
+        buffer = self._buffer
+        while buffer and buffer[0][0] < keep_from:
+            _, jpeg, raw = buffer.popleft()
+            self.preroll_bytes -= jpeg.nbytes
+            self.raw_bytes -= raw
+
+    def _clear_buffer(self):
+        self._buffer.clear()
+        self.preroll_bytes = self.raw_bytes = 0
+
+    def status(self):
+        return f"CLIP {self.encoder.clips}/{self.triggers - self.merged} (대기 {self.encoder.pending})"
+
+    def stop(self):
+        # 진행 중인 클립은 있는 프레임까지만 넘기고, 파일 쓰기는 인코더 스레드가 마저 끝낸다
+        self._stop_event.set()
+        self.join()
@@ -1,3 +1,10 @@
+import bisect
+import threading
+from collections import namedtuple
+
+import numpy as np
+
+import perf_stats
 from roi_utils import fetch_all_rois
 
 # fetch_alarm_conditions는 메인 뷰어에서 영상이 연결될 때 1번,
@@ -15,44 +22,248 @@ def fetch_alarm_conditions(ip, user_id, user_pw):
         #       f"온도: {alarm.get('temperature')}, 시작지연: {alarm.get('start_delay')}, 종료지연: {alarm.get('stop_delay')}")
     return rois
 
-# evaluate_alarms는 열화상 TCP/IP 수신 시마다 호출되어야 합니다.
-def evaluate_alarms(rois, thermal_data):
-    for idx, roi in enumerate(rois):
-        alarm = roi.get("alarm", {})
-        use = alarm.get("alarm_use")
-        condition = alarm.get("condition")
-        threshold = alarm.get("temperature")
-        mode = alarm.get("mode", "maximum")  # maximum, minimum, average
 
-        if use != "on" or condition not in ("above", "below") or threshold is None:
-            continue
+# --- 알람 규칙 엔진 ---
+# fetch_all_rois 의 알람 설정을 ROI 설정이 바뀔 때 한 번만 배열로 컴파일하고,
+# 열화상 메시지마다 모든 ROI 를 NumPy 비교 한 번으로 판정한다.
+# 카메라의 start_delay / stop_delay (초) 는 ROI 별 상태 머신으로 처리:
+#   꺼짐 → 조건을 start_delay 동안 계속 넘으면 켜짐, 켜짐 → stop_delay 동안 계속 벗어나면 꺼짐.
+# 상태가 바뀔 때마다 AlarmTransition 을 리스너에 알리고 시각별 상태 이력에 남겨서
+# overlay (지연 영상 프레임 시각 기준) 와 ROI 표가 같은 결과를 쓴다.
+
+MODE_KEYS = ("max", "min", "avr")  # RoiSample 필드 순서와 같음
+MODE_INDEX = {"maximum": 0, "minimum": 1, "average": 2}
+ALARM_HISTORY = 512  # state_at 으로 되돌아볼 수 있는 상태 변화 수
+
+AlarmTransition = namedtuple("AlarmTransition", [
+    "roi", "active", "time", "mode", "temperature", "threshold",
+])
 
-        try:
-            threshold = float(threshold)
-            data_entry = thermal_data.get(idx, {})
 
-            mode_key = {
-                "maximum": "max",
-                "minimum": "min",
-                "average": "avr"
-            }.get(mode)
+def _delay(value):
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        return 0.0
 
-            if not mode_key or mode_key not in data_entry:
+
+class AlarmRules:
+    # 알람 설정 배열 (ROI i 는 i 번째 원소)
+    def __init__(self, rois):
+        n = len(rois)
+        self.count = n
+        self.enabled = np.zeros(n, bool)
+        self.mode = np.zeros(n, np.intp)
+        self.above = np.zeros(n, bool)
+        self.threshold = np.full(n, np.nan)
+        self.start_delay = np.zeros(n)
+        self.stop_delay = np.zeros(n)
+        for i, roi in enumerate(rois):
+            alarm = roi.get("alarm", {}) if isinstance(roi, dict) else {}
+            mode = MODE_INDEX.get(alarm.get("mode", "maximum"))
+            condition = alarm.get("condition")
+            if alarm.get("alarm_use") != "on" or condition not in ("above", "below") or mode is None:
+                continue
+            try:
+                threshold = float(alarm.get("temperature"))
+            except (TypeError, ValueError):
+                print(f"[AlarmRules] ROI{i} 알람 온도 값 오류: {alarm.get('temperature')!r}")
                 continue
+            self.enabled[i] = True
+            self.mode[i] = mode
+            self.above[i] = condition == "above"
+            self.threshold[i] = threshold
+            self.start_delay[i] = _delay(alarm.get("start_delay"))
+            self.stop_delay[i] = _delay(alarm.get("stop_delay"))
+        self._rows = np.arange(n)
+
+    def values(self, temps):
+        # temps: (n, 3) max/min/avr → ROI 별 감시 대상 온도
+        return temps[self._rows, self.mode]
+
+    def exceeded(self, temps):
+        # 측정값이 없으면(NaN) 비교 결과가 False 라서 알람이 아님
+        values = self.values(temps)
+        with np.errstate(invalid="ignore"):
+            return self.enabled & np.where(self.above, values > self.threshold, values < self.threshold)
+
+    def same_rule(self, other):
+        # ROI 별로 규칙이 그대로인지 (설정 갱신 후 알람 상태를 이어갈지 판단)
+        n = min(self.count, other.count)
+        same = np.zeros(self.count, bool)
+        same[:n] = (
+            self.enabled[:n] & other.enabled[:n]
+            & (self.mode[:n] == other.mode[:n])
+            & (self.above[:n] == other.above[:n])
+            & (self.threshold[:n] == other.threshold[:n])
+        )
+        return same
+
+
+def samples_to_temps(samples, count):
+    # RoiSample 목록 → (count, 3) 온도 배열과 이번 메시지에 들어 있던 ROI 표시
+    temps = np.full((count, 3), np.nan)
+    present = np.zeros(count, bool)
+    rows = [s for s in samples if 0 <= s.area_id < count]
+    if rows:
+        ids = [s.area_id for s in rows]
+        # dtype=float 로 만들면 None 은 NaN 이 된다
+        temps[ids] = np.array([(s.max, s.min, s.avr) for s in rows], dtype=float)
+        present[ids] = True
+    return temps, present
+
 
-            temp = float(data_entry[mode_key])
+def split_messages(samples):
+    # 배치 → 메시지별 RoiSample 목록 (같은 메시지의 샘플은 recv_time 이 같음), 시각 순
+    messages = {}
+    for s in samples:
+        messages.setdefault(s.recv_time, []).append(s)
+    return [messages[t] for t in sorted(messages)]
 
-            # if condition == "above" and temp > threshold:
-            #     print(f"[알람] ROI{idx}: {mode} {temp}℃ > 기준 {threshold}℃")
-            # elif condition == "below" and temp < threshold:
-            #     print(f"[알람] ROI{idx}: {mode} {temp}℃ < 기준 {threshold}℃")
 
-        except Exception as e:
-            print(f"[에러] ROI{idx} 알람 판별 중 오류: {e}")
+class AlarmEngine:
+    def __init__(self, rois=()):
+        self._lock = threading.Lock()
+        self._listeners = ()
+        self.rules = AlarmRules([])
+        self.active = np.zeros(0, bool)
+        self._since = np.zeros(0)           # 현재 상태와 반대 조건이 시작된 시각 (없으면 NaN)
+        self._history_time = [0.0]          # 상태가 바뀐 시각
+        self._history_state = [self.active.copy()]
+        self.configure(rois)
+
+    def add_listener(self, fn):
+        # fn(transitions) 는 update 를 부른 스레드(열화상 수신/구독 스레드)에서 호출된다
+        self._listeners = self._listeners + (fn,)
+
+    def remove_listener(self, fn):
+        self._listeners = tuple(f for f in self._listeners if f != fn)
+
+    def configure(self, rois, now=0.0):
+        # ROI 설정 갱신: 규칙이 그대로인 ROI 는 알람 상태를 유지하고 나머지는 해제
+        rules = AlarmRules(rois)
+        with self._lock:
+            n = rules.count
+            keep = rules.same_rule(self.rules)
+            active = np.zeros(n, bool)
+            since = np.full(n, np.nan)
+            m = min(n, self.rules.count)
+            active[:m] = self.active[:m] & keep[:m]
+            since[:m] = np.where(keep[:m], self._since[:m], np.nan)
+            cleared = np.flatnonzero(self.active[:m] & ~keep[:m]).tolist()
+            cleared += np.flatnonzero(self.active[m:]).tolist()
+            self.rules = rules
+            self.active = active
+            self._since = since
+            transitions = [AlarmTransition(i, False, now, None, None, None) for i in cleared]
+            if transitions:
+                self._record(now)
+        self._publish(transitions)
+
+    def update(self, samples, now=None):
+        # 열화상 메시지 하나(RoiSample 목록) 반영, 상태가 바뀐 ROI 의 AlarmTransition 목록 반환.
+        # 구독 콜백이 넘기는 배치(여러 메시지)는 recv_time 별로 나눠 받은 순서대로 하나씩 판정한다
+        # (한 번에 판정하면 같은 ROI 는 마지막 값만 남아 배치 중간에 넘은 알람과 지연 시각을 잃음)
+        if not samples:
+            return []
+        if now is None:
+            messages = split_messages(samples)
+            if len(messages) > 1:
+                transitions = []
+                for message in messages:
+                    transitions += self.update(message, message[0].recv_time)
+                return transitions
+            now = samples[0].recv_time
+        t0 = perf_stats.begin()
+        with self._lock:
+            rules = self.rules
+            if not rules.count:
+                return []
+            temps, present = samples_to_temps(samples, rules.count)
+            exceeded = rules.exceeded(temps)
+            # 이번 메시지에 없는 ROI 는 판정하지 않음
+            pending = present & (exceeded != self.active)
+            settled = present & ~pending
+            self._since[settled] = np.nan
+            started = pending & np.isnan(self._since)
+            self._since[started] = now
+            delay = np.where(self.active, rules.stop_delay, rules.start_delay)
+            flip = pending & (now - self._since >= delay)
+            if not flip.any():
+                perf_stats.end("alarm.update", t0)
+                return []
+            self.active ^= flip
+            self._since[flip] = np.nan
+            self._record(now)
+            values = rules.values(temps)
+            transitions = [
+                AlarmTransition(i, bool(self.active[i]), now, MODE_KEYS[rules.mode[i]],
+                                float(values[i]), float(rules.threshold[i]))
+                for i in np.flatnonzero(flip).tolist()
+            ]
+        perf_stats.end("alarm.update", t0)
+        self._publish(transitions)
+        return transitions
+
+    def _record(self, now):
+        # 락 안에서 호출
+        self._history_time.append(now)
+        self._history_state.append(self.active.copy())
+        if len(self._history_time) > 2 * ALARM_HISTORY:
+            del self._history_time[:ALARM_HISTORY]
+            del self._history_state[:ALARM_HISTORY]
+
+    def _publish(self, transitions):
+        if not transitions:
+            return
+        for fn in self._listeners:
+            fn(transitions)
+
+    def state_at(self, t=None):
+        # 시각 t 의 ROI 별 알람 상태 (bool 배열). t 가 None 이면 현재 상태.
+        with self._lock:
+            if t is None:
+                return self.active.copy()
+            i = bisect.bisect_right(self._history_time, t) - 1
+            return self._history_state[max(i, 0)]
+
+    def active_fields(self, t=None):
+        # {roi_idx: ["max"]} 형태: ROI 표에서 강조할 항목
+        state = self.state_at(t)
+        mode = self.rules.mode
+        return {i: [MODE_KEYS[mode[i]]] for i in np.flatnonzero(state).tolist() if i < len(mode)}
+
+
+_compiled = (None, None)
+
+
+# evaluate_alarms는 열화상 TCP/IP 수신 시마다 호출되어야 합니다.
+def evaluate_alarms(rois, thermal_data):
+    # 지연 없이 지금 조건을 넘은 ROI 번호 목록 (rois 가 바뀔 때만 다시 컴파일)
+    global _compiled
+    compiled_rois, rules = _compiled
+    if compiled_rois is not rois:
+        rules = AlarmRules(rois)
+        _compiled = (rois, rules)
+    samples = [s for s in (thermal_data.get(i) for i in range(rules.count)) if s is not None]
+    temps, _ = samples_to_temps(samples, rules.count)
+    return np.flatnonzero(rules.exceeded(temps)).tolist()
 
 
 
 if __name__ == "__main__":
+    from thermal_receiver import RoiSample
+
+    # 배치 판정 확인: 배치 중간 메시지에서만 넘은 알람도 켜져야 함 (ROI0, 50℃ 초과, 지연 0)
+    rule = {"alarm": {"alarm_use": "on", "mode": "maximum", "condition": "above", "temperature": "50",
+                      "start_delay": "0", "stop_delay": "5"}}
+    engine = AlarmEngine([rule])
+    batch = [RoiSample(0, t, v, None, None, None, None, None, None) for t, v in ((1.0, 40.0), (1.1, 60.0), (1.2, 40.0))]
+    transitions = engine.update(batch)
+    assert [(t.roi, t.active, t.time) for t in transitions] == [(0, True, 1.1)], transitions
+    assert engine.state_at(1.2)[0], "stop_delay 전에 꺼짐"
+    print("[AlarmEngine] 배치 판정 확인 OK")
+
     # 예시 테스트용
     ip = "192.168.0.56"
     user_id = "admin"
@@ -63,9 +274,8 @@ if __name__ == "__main__":
 
     print("\n[모의 온도 수신 데이터 평가 중...]")
     dummy_thermal_data = {
-        0: {"max": 65.3},
-        1: {"max": 72.0},
-        2: {"max": 48.7},
+        i: RoiSample(i, 0.0, t, None, None, None, None, None, None)
+        for i, t in enumerate((65.3, 72.0, 48.7))
     }
 
-    evaluate_alarms(rois, dummy_thermal_data)
+    print(evaluate_alarms(rois, dummy_thermal_data))
@@ -0,0 +1,164 @@
+# benchmarks/bench_alarm_clips.py
+# 알람 이벤트 클립 비용: 카메라 시뮬레이터 N 대에 FrameReader + ThermalBus + AlarmEngine 을 붙이고
+#   1) 수신 + 표시 합성만  2) ClipCapture (프리롤 JPEG 보관) 추가  3) 모든 카메라에 알람을 동시에 여러 개 발생
+# 단계마다 프로세스 CPU, 스트림당 수신 fps, 표시 합성 fps (카메라마다 30 Hz 로 render_into 하는 스레드) 와
+# 합성 시간 p99 를 재고, 프리롤 메모리 (JPEG vs 원본), 프레임당 압축 시간, 알람 리스너 호출 시간,
+# 클립 파일 쓰기 시간을 잰다.
+#   python benchmarks/bench_alarm_clips.py [--streams 1 4] [--size 1280x720] [--seconds 10] [--alarms 8]
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("VIDEO_URL", "http://{ip}:554/stream1")
+
+from alarm_clips import PREROLL_SEC, ClipCapture
+from alarm_utils import AlarmEngine, AlarmTransition
+from camera_simulator import SimConfig, SimulatorFarm
+from frame_reader import FrameReader, DELAY_SEC, DISPLAY_FPS, VIDEO_URL
+from frame_renderer import DISPLAY_FORMAT, DisplayBuffers, fit_size, render_into
+from thermal_bus import acquire_bus, release_bus
+from benchmarks.thermal_fixtures import make_rois
+
+THERMAL_PORT = 60110
+WARMUP_SEC = 2
+LABEL = (960, 540)
+
+
+class RenderProbe(threading.Thread):
+    # 뷰어의 FrameRenderer 처럼 DISPLAY_FPS 주기로 지연 프레임을 합성
+    def __init__(self, reader, store, engine):
+        super().__init__(daemon=True)
+        self.reader, self.store, self.engine = reader, store, engine
+        self.buffers = DisplayBuffers()
+        self.times = []
+        self.running = True
+
+    def run(self):
+        interval = 1 / DISPLAY_FPS
+        last = None
+        while self.running:
+            t0 = time.perf_counter()
+            frame = self.reader.get_delayed()
+            if frame is not None and self.reader.frame_time != last:
+                last = self.reader.frame_time
+                size = fit_size(frame.shape[1], frame.shape[0], *LABEL)
+                render_into(self.buffers, frame, size, DISPLAY_FORMAT, [], self.store.at(last),
+                            self.engine.active_fields(last), None)
+                self.times.append(time.perf_counter() - t0)
+            time.sleep(max(0.0, interval - (time.perf_counter() - t0)))
+
+
+def measure(readers, probes, seconds):
+    decoded0 = [r.decoded for r in readers]
+    rendered0 = [len(p.times) for p in probes]
+    cpu0, t0 = time.process_time(), time.perf_counter()
+    time.sleep(seconds)
+    elapsed = time.perf_counter() - t0
+    cpu = (time.process_time() - cpu0) / elapsed * 100
+    n = len(readers)
+    fps = sum(r.decoded - d for r, d in zip(readers, decoded0)) / elapsed / n
+    render_fps = sum(len(p.times) - r for p, r in zip(probes, rendered0)) / elapsed / n
+    render = np.concatenate([p.times[r:] for p, r in zip(probes, rendered0)]) * 1000
+    p99 = np.percentile(render, 99) if len(render) else float("nan")
+    return f"CPU {cpu:5.1f}%  recv {fps:5.1f} fps  render {render_fps:5.1f} fps (p99 {p99:5.2f} ms)"
+
+
+def run(hosts, seconds, alarms):
+    readers, buses, engines, subs, probes = [], [], [], [], []
+    for ip in hosts:
+        reader = FrameReader(VIDEO_URL.format(user="admin", pw="admin", ip=ip, port=554), DELAY_SEC)
+        reader.start()
+        bus = acquire_bus(ip, THERMAL_PORT)
+        # 켜져 있지만 넘을 수 없는 알람 규칙: ClipCapture 가 프리롤을 모으되 시뮬레이터 알람은 나지 않음 (아래에서 직접 발생)
+        rois = make_rois(alarm_ratio=1.0)
+        for roi in rois:
+            roi["alarm"].update(mode="maximum", condition="above", temperature="10000")
+        engine = AlarmEngine(rois)
+        subs.append(bus.subscribe(callback=engine.update, name="bench-alarm"))
+        probe = RenderProbe(reader, bus.data_store, engine)
+        probe.start()
+        readers.append(reader)
+        buses.append(bus)
+        engines.append(engine)
+        probes.append(probe)
+    time.sleep(WARMUP_SEC)
+    n = len(hosts)
+    print(f"{n} stream(s): receive + render      {measure(readers, probes, seconds)}")
+
+    directory = tempfile.mkdtemp(prefix="bench_alarm_clips_")
+    # 프리롤이 다 찬 상태를 재도록 측정 구간보다 짧게
+    preroll = min(PREROLL_SEC, seconds)
+    captures = [ClipCapture(r, b.data_store, e, directory, ip, preroll_sec=preroll, postroll_sec=seconds / 2)
+                for r, b, e, ip in zip(readers, buses, engines, hosts)]
+    for cap in captures:
+        cap.start()
+    time.sleep(preroll + 1)
+    frames0 = [c.frames for c in captures]
+    compress0 = [c.compress_sec for c in captures]
+    print(f"{'':12} + preroll buffer     {measure(readers, probes, seconds)}")
+    frames = sum(c.frames - f for c, f in zip(captures, frames0))
+    compress = sum(c.compress_sec - s for c, s in zip(captures, compress0))
+    jpeg = sum(c.preroll_bytes for c in captures) / n
+    raw = sum(c.raw_bytes for c in captures) / n
+    print(f"{'':12} preroll {preroll:.0f}s/stream  JPEG {jpeg / 1024 ** 2:6.1f} MiB  raw {raw / 1024 ** 2:7.1f} MiB "
+          f"(x{raw / max(jpeg, 1):.0f})  compress {compress / max(frames, 1) * 1000:5.2f} ms/frame")
+
+    # 카메라마다 ROI alarms 개가 같은 시각에 켜짐 (열화상 메시지 하나에서 여러 ROI 가 넘은 경우)
+    listener = []
+    now = time.time()
+    for cap in captures:
+        transitions = [AlarmTransition(i, True, now, "max", 80.0, 70.0) for i in range(alarms)]
+        t0 = time.perf_counter()
+        cap.on_alarm_transitions(transitions)
+        listener.append(time.perf_counter() - t0)
+    print(f"{'':12} {alarms} alarms x {n} stream(s): listener {max(listener) * 1e6:6.1f} us max")
+    print(f"{'':12} + clips (post-roll)  {measure(readers, probes, seconds / 2 + 0.5)}")
+    t0 = time.perf_counter()
+    print(f"{'':12} + clip encoding      {measure(readers, probes, 2)}")
+    for cap in captures:
+        cap.stop()
+    for cap in captures:
+        cap.encoder.join()
+    clips = sum(c.encoder.clips for c in captures)
+    encode = sum(c.encoder.encode_sec for c in captures)
+    print(f"{'':12} clips {clips}  write {encode / max(clips, 1):5.2f} s/clip  "
+          f"all written {time.perf_counter() - t0:5.2f} s after post-roll  "
+          f"size {sum(os.path.getsize(os.path.join(directory, f)) for f in os.listdir(directory)) / max(clips, 1) / 1024 ** 2:5.1f} MiB/clip")
+
+    for probe in probes:
+        probe.running = False
+    for reader in readers:
+        reader.stop()
+        reader.join()
+    for sub in subs:
+        sub.close()
+    for bus in buses:
+        release_bus(bus)
+    shutil.rmtree(directory)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--streams", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--size", default="1280x720")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--alarms", type=int, default=8, help="카메라당 동시에 켜지는 알람 수")
+    args = parser.parse_args()
+    width, height = (int(v) for v in args.size.split("x"))
+
+    farm = SimulatorFarm(max(args.streams), SimConfig(width=width, height=height)).start()
+    print(f"{width}x{height} @ 30 fps, {os.cpu_count()} CPU")
+    for n in args.streams:
+        run(farm.hosts[:n], args.seconds, args.alarms)
+    farm.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# benchmarks/bench_display_path.py
+# 프레임 1장 표시 비용: 예전 경로 vs 재사용 버퍼 경로 (frame_renderer.DISPLAY_FORMAT)
+#   legacy: cv2.resize (새 배열) → cvtColor RGB (새 배열) → QImage Format_RGB888 → QPixmap.fromImage
+#   bgr888: cv2.resize(dst=재사용 버퍼, 라벨 크기/종횡비 유지) → QImage Format_BGR888 → QPixmap.fromImage
+#   rgb32 : cv2.resize(dst=작업 버퍼) → cvtColor BGR2BGRA(dst=재사용 버퍼) → Format_RGB32 → QPixmap.fromImage
+# 렌더 스레드 몫(compose_frame)과 GUI 스레드 몫(fromImage)을 나눠 재고,
+# tracemalloc 으로 프레임당 Python/NumPy 할당량을 잰다 (QPixmap 변환 버퍼는 Qt 쪽이라 제외).
+#   QT_QPA_PLATFORM=offscreen python benchmarks/bench_display_path.py [--repeat 300] [--rois]
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtGui import QPixmap
+from PyQt5.QtWidgets import QApplication
+
+from frame_renderer import DisplayBuffers, RenderedFrame, fit_size, render_into
+from roi_utils import RoiOverlay
+from thermal_receiver import RoiSample
+from benchmarks.thermal_fixtures import make_rois
+
+SOURCES = [(640, 480), (1920, 1080)]
+LABELS = [(640, 480), (960, 540), (1280, 720)]
+
+
+def run(frame, label, display_format, rois, thermal, repeat):
+    h, w = frame.shape[:2]
+    # 예전 경로는 종횡비와 관계없이 라벨 크기로 늘림
+    size = label if display_format == "legacy" else fit_size(w, h, *label)
+    buffers = DisplayBuffers()
+    overlay = RoiOverlay()
+    alarms = {0: ["max"], 3: ["max"]} if rois else {}
+    render, gui, allocated = [], [], []
+    tracemalloc.start()
+    for seq in range(repeat):
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        t0 = time.perf_counter()
+        buffer, image = render_into(buffers, frame, size, display_format, rois, thermal, alarms, overlay)
+        buffers.latest = RenderedFrame(seq, image, buffer, 0.0, thermal, alarms, 0.0)
+        t1 = time.perf_counter()
+        pixmap = QPixmap.fromImage(buffers.take().image)
+        t2 = time.perf_counter()
+        allocated.append(tracemalloc.get_traced_memory()[1] - base)
+        render.append(t1 - t0)
+        gui.append(t2 - t1)
+        del pixmap
+    tracemalloc.stop()
+    return np.array(render) * 1000, np.array(gui) * 1000, np.array(allocated), size
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=300)
+    parser.add_argument("--rois", action="store_true", help="ROI overlay/알람 채우기 포함")
+    args = parser.parse_args()
+    app = QApplication.instance() or QApplication([])
+
+    rois = make_rois(alarm_ratio=1.0) if args.rois else []
+    thermal = {i: RoiSample(i, 0.0, 50.0, 20.0, 30.0, 100, 100, 200, 200) for i in range(len(rois))}
+    print(f"{'source':<10} {'label':<9} {'path':<7} {'out':<9} {'render p50/p99 ms':>18}  "
+          f"{'fromImage p50 ms':>16}  {'alloc/frame':>12}")
+    for sw, sh in SOURCES:
+        frame = np.random.default_rng(0).integers(0, 255, (sh, sw, 3), np.uint8)
+        for label in LABELS:
+            for name in ("legacy", "bgr888", "rgb32"):
+                render, gui, allocated, size = run(frame, label, name, rois, thermal, args.repeat)
+                # 첫 프레임(버퍼 할당, overlay 생성)은 빼고 정상 상태만
+                steady = allocated[5:]
+                print(f"{sw}x{sh:<5} {label[0]}x{label[1]:<4} {name:<7} {size[0]}x{size[1]:<4} "
+                      f"{np.percentile(render, 50):8.3f} / {np.percentile(render, 99):7.3f}  "
+                      f"{np.percentile(gui, 50):16.3f}  {np.median(steady) / 1024:9.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
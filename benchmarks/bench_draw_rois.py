@@ -0,0 +1,76 @@
+# benchmarks/bench_draw_rois.py
+# draw_rois 프레임당 비용: 알람 ROI 0 / 5 / 10 개, 640x480 과 1080p
+# legacy 는 알람 ROI 마다 frame.copy() + 프레임 전체 addWeighted 하던 예전 채움 방식
+#   python benchmarks/bench_draw_rois.py [--repeat 300]
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from roi_utils import RoiOverlay, blend_alarm_rects, draw_rois
+from thermal_receiver import RoiSample
+from benchmarks.thermal_fixtures import make_rois
+
+SIZES = [(640, 480), (1920, 1080)]
+ALARM_COUNTS = [0, 5, 10]
+
+
+def make_case(alarms):
+    # 모든 ROI 에 알람 조건을 걸고, 앞쪽 alarms 개만 조건을 넘도록 온도를 준다
+    rois = make_rois(alarm_ratio=1.0)
+    thermal = {}
+    for i, roi in enumerate(rois):
+        roi["alarm"].update(mode="maximum", condition="above", temperature="50")
+        t_max = 80.0 if i < alarms else 30.0
+        thermal[i] = RoiSample(i, 0.0, t_max, 20.0, 25.0, 100, 100, 200, 200)
+    return rois, thermal
+
+
+def legacy_fill(frame, rects):
+    for sx, sy, ex, ey in rects:
+        overlay = frame.copy()
+        cv2.rectangle(overlay, (sx, sy), (ex, ey), (255, 0, 0), -1)
+        cv2.addWeighted(overlay, 0.3, frame, 0.7, 0, frame)
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    a = np.array(samples) * 1000
+    return np.percentile(a, 50), np.percentile(a, 99)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=300)
+    args = parser.parse_args()
+
+    print(f"{'size':<10} {'alarms':>6}  {'fill legacy':>20}  {'fill ROI-local':>20}  {'draw_rois':>20}")
+    for width, height in SIZES:
+        sx, sy = width / 640, height / 480
+        base = np.random.default_rng(0).integers(0, 255, (height, width, 3), np.uint8)
+        frame = base.copy()
+        for alarms in ALARM_COUNTS:
+            rois, thermal = make_case(alarms)
+            rects = [(int(x0 * sx), int(y0 * sy), int(x1 * sx), int(y1 * sy))
+                     for x0, y0, x1, y1 in (r["coords"] for r in rois[:alarms])]
+            overlay = RoiOverlay()
+            legacy = timed(lambda: legacy_fill(frame, rects), args.repeat)
+            local = timed(lambda: blend_alarm_rects(frame, rects), args.repeat)
+            active = range(alarms)
+            full = timed(lambda: draw_rois(frame, rois, thermal, sx, sy, overlay, active), args.repeat)
+            print(f"{width}x{height:<5} {alarms:>6}  "
+                  + "  ".join(f"p50 {p50:6.3f} p99 {p99:6.3f}" for p50, p99 in (legacy, local, full))
+                  + "  ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# benchmarks/bench_frame_decode.py
+# FrameReader 디코딩 비용: 모든 프레임 read() vs grab() + 표시 주기 프레임만 retrieve()
+# 원본 FPS 가 표시 FPS 보다 높거나 해상도가 큰 스트림에서 프로세스 CPU 시간을 비교한다.
+# 프레임 도착 시각은 스트림 시간(n / fps)으로 계산하므로 대기 없이 최대 속도로 돈다.
+#   python benchmarks/bench_frame_decode.py [--frames 300] [--target 30] [--video clip.mp4 --fps 60]
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from frame_reader import DISPLAY_FPS, DECODE_SLACK
+
+CASES = [
+    # (fourcc, 확장자, 너비, 높이, 원본 fps)
+    ("MJPG", "avi", 1920, 1080, 30),
+    ("MJPG", "avi", 1920, 1080, 60),
+    ("mp4v", "mp4", 1920, 1080, 60),
+    ("mp4v", "mp4", 3840, 2160, 30),
+]
+
+
+def make_video(path, fourcc, width, height, fps, frames=120):
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*fourcc), fps, (width, height))
+    rng = np.random.default_rng(0)
+    base = rng.integers(0, 255, (height // 16, width // 16, 3), np.uint8)
+    base = cv2.resize(base, (width, height), interpolation=cv2.INTER_LINEAR)
+    for i in range(frames):
+        writer.write(np.roll(base, i * 8, axis=1))
+    writer.release()
+
+
+def read_all(cap, fps, total):
+    decoded = 0
+    for _ in range(total):
+        ret, frame = cap.read()
+        if not ret:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            continue
+        decoded += 1
+    return decoded
+
+
+def grab_retrieve(cap, fps, total, target):
+    # FrameReader.run 과 같은 판단, 시각만 스트림 시간을 사용
+    decoded = 0
+    last_decode = -1.0
+    buf = None
+    for n in range(total):
+        if not cap.grab():
+            cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            continue
+        now = n / fps
+        if now - last_decode < DECODE_SLACK / target:
+            continue
+        ret, frame = cap.retrieve(buf)
+        if ret:
+            buf = frame
+            decoded += 1
+            last_decode = now
+    return decoded
+
+
+def measure(path, fps, total, fn, *args, repeat=3):
+    # 가장 적게 든 CPU 시간 (반복 측정으로 노이즈 제거)
+    best = None
+    for _ in range(repeat):
+        cap = cv2.VideoCapture(path)
+        cpu0 = time.process_time()
+        decoded = fn(cap, fps, total, *args)
+        cpu = time.process_time() - cpu0
+        cap.release()
+        if best is None or cpu < best[1]:
+            best = (decoded, cpu)
+    return best
+
+
+def run_case(path, label, fps, total, target):
+    cv2.setNumThreads(1)
+    base = measure(path, fps, total, read_all)
+    split = measure(path, fps, total, grab_retrieve, target)
+    stream_sec = total / fps
+    print(f"{label:<26} read()        {base[0]:4d} frames  cpu {base[1] / stream_sec * 100:6.1f}% of a core")
+    print(f"{'':<26} grab/retrieve {split[0]:4d} frames  cpu {split[1] / stream_sec * 100:6.1f}% of a core  "
+          f"saved {(1 - split[1] / base[1]) * 100:5.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--target", type=float, default=DISPLAY_FPS, help="표시 FPS")
+    parser.add_argument("--video", help="측정할 영상 파일 (없으면 합성 영상들)")
+    parser.add_argument("--fps", type=float, help="--video 의 원본 FPS (기본: 파일 정보)")
+    args = parser.parse_args()
+
+    if args.video:
+        fps = args.fps or cv2.VideoCapture(args.video).get(cv2.CAP_PROP_FPS) or 30
+        run_case(args.video, os.path.basename(args.video), fps, args.frames, args.target)
+        return
+
+    print(f"target {args.target:g} fps, {args.frames} frames per case")
+    for fourcc, ext, width, height, fps in CASES:
+        path = os.path.join(tempfile.gettempdir(), f"bench_decode_{fourcc}_{width}x{height}_{fps}.{ext}")
+        if not os.path.exists(path):
+            make_video(path, fourcc, width, height, fps)
+        run_case(path, f"{fourcc} {width}x{height}@{fps}", fps, args.frames, args.target)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# benchmarks/bench_frame_ring.py
+# FrameReader 의 지연 버퍼: 기존 deque(매 프레임 새 배열) vs FrameRing(고정 풀에 제자리 디코딩)
+# 각 방식을 별도 프로세스에서 돌려 할당량, minor page fault, 최대 RSS 와 실제 지연을 비교.
+# --rate 로 카메라 실제 FPS 를 흉내낸다 (지연 버퍼는 FPS 가 30 이라고 믿고 크기를 정함).
+#   python benchmarks/bench_frame_ring.py [--video clip.avi] [--frames 300] [--rate 30] [--size 1920x1080]
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from frame_ring import FrameRing
+
+DELAY_SEC = 1
+FPS = 30
+
+
+def make_video(path, width, height, frames=60):
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), FPS, (width, height))
+    rng = np.random.default_rng(0)
+    base = rng.integers(0, 255, (height // 8, width // 8, 3), np.uint8)
+    base = cv2.resize(base, (width, height), interpolation=cv2.INTER_LINEAR)
+    for i in range(frames):
+        writer.write(np.roll(base, i * 8, axis=1))
+    writer.release()
+
+
+def paced(total, rate):
+    # rate fps 로 프레임 도착 시각을 맞춘다 (0 이면 디코딩 속도 그대로)
+    start = time.perf_counter()
+    for n in range(total):
+        if rate:
+            delay = start + n / rate - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        yield n
+
+
+def run_deque(path, total, rate, delays):
+    frames = deque(maxlen=int(DELAY_SEC * FPS) + 1)
+    times = deque(maxlen=frames.maxlen)  # 측정용 캡처 시각
+    allocated = 0
+    cap = cv2.VideoCapture(path)
+    for _ in paced(total, rate):
+        ret, frame = cap.read()
+        if not ret:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = cap.read()
+        frames.append(frame)
+        times.append(time.time())
+        allocated += frame.nbytes
+        if len(frames) == frames.maxlen:
+            delays.append(time.time() - times[0])
+    return allocated, 0
+
+
+def run_ring(path, total, rate, delays):
+    ring = FrameRing(DELAY_SEC, FPS)
+    allocated = 0
+    shape = None
+    cap = cv2.VideoCapture(path)
+    for _ in paced(total, rate):
+        buf = None
+        if shape is not None:
+            slot, buf = ring.acquire(shape)
+        ret, frame = cap.read(buf) if buf is not None else cap.read()
+        if not ret:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = cap.read(buf) if buf is not None else cap.read()
+        if buf is None or frame.ctypes.data != buf.ctypes.data:
+            allocated += frame.nbytes
+            shape = frame.shape
+            slot, buf = ring.acquire(shape)
+            np.copyto(buf, frame)
+        ring.commit(slot, time.time())
+        now = time.time()
+        frame, ts = ring.get_delayed(now)
+        if frame is not None:
+            delays.append(now - ts)
+    return allocated, ring.nbytes()
+
+
+def child(mode, path, total, rate):
+    delays = []
+    usage0 = resource.getrusage(resource.RUSAGE_SELF)
+    t0 = time.perf_counter()
+    allocated, pool = (run_deque if mode == "deque" else run_ring)(path, total, rate, delays)
+    elapsed = time.perf_counter() - t0
+    usage1 = resource.getrusage(resource.RUSAGE_SELF)
+    faults = usage1.ru_minflt - usage0.ru_minflt
+    print(f"{mode:<6} {total / elapsed:7.1f} fps  "
+          f"alloc {allocated / total / 2**20:6.2f} MiB/frame ({allocated / elapsed / 2**20:7.1f} MiB/s) "
+          f"+ pool {pool / 2**20:6.1f} MiB  "
+          f"minflt {faults / total:8.1f}/frame  maxrss {usage1.ru_maxrss / 1024:7.1f} MiB  "
+          f"delay {np.median(delays) if delays else float('nan'):5.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--video", help="측정에 쓸 영상 파일 (없으면 MJPG 합성 영상 생성)")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--rate", type=float, default=FPS, help="실제 프레임 도착 속도 (0 이면 제한 없음)")
+    parser.add_argument("--size", default="1920x1080")
+    parser.add_argument("--mode", choices=("deque", "ring"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        child(args.mode, args.video, args.frames, args.rate)
+        return
+
+    path = args.video
+    if path is None:
+        width, height = (int(v) for v in args.size.split("x"))
+        path = os.path.join(tempfile.gettempdir(), f"bench_frame_ring_{width}x{height}.avi")
+        if not os.path.exists(path):
+            make_video(path, width, height)
+    print(f"{path}, {args.frames} frames at {args.rate or 'max'} fps, "
+          f"delay {DELAY_SEC}s sized for {FPS} fps")
+    for mode in ("deque", "ring"):
+        subprocess.run([sys.executable, os.path.abspath(__file__), "--mode", mode,
+                        "--video", path, "--frames", str(args.frames), "--rate", str(args.rate)], check=True)
+
+
+if __name__ == "__main__":
+    main()
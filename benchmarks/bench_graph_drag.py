@@ -0,0 +1,97 @@
+# benchmarks/bench_graph_drag.py
+# 그래프 다시 그리기 비용: 전체 그리기 (GRAPH_BLIT=0, 예전 방식) vs blit (배경 복원 + 선/드래그 영역만)
+#   drag   : 확대 드래그 중 마우스 이동 이벤트마다 on_motion + Qt 화면 갱신 → 이벤트당 시간과 낼 수 있는 FPS
+#   fixed  : 스크롤해서 과거를 보는 중 (축 범위 그대로) 1초 갱신 update_plot
+#            (이력이 MAX_SECONDS 로 꽉 차면 보는 구간이 인덱스 기준이라 매초 한 칸씩 밀려 전체 그리기가 됨 → 기본 1200 점)
+#   follow : 자동 따라가기 중 1초 갱신 (축 범위가 매번 바뀌므로 둘 다 전체 그리기)
+#   QT_QPA_PLATFORM=offscreen python benchmarks/bench_graph_drag.py [--moves 200] [--points 1200] [--size 940x480]
+import argparse
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+
+from graph_viewer import AREA_COUNT, WINDOW_DURATION, GraphCanvas
+
+GAP_RATIO = 0.02
+
+
+def fill(canvas, points, seed=0):
+    rng = np.random.default_rng(seed)
+    for k in range(points):
+        canvas.history.append(float(k), [None if rng.random() < GAP_RATIO else float(rng.uniform(20, 80))
+                                         for _ in range(AREA_COUNT)])
+
+
+def mouse(canvas, x, **kw):
+    return SimpleNamespace(inaxes=canvas.ax, xdata=x, button=1, dblclick=False, **kw)
+
+
+def bench_drag(app, canvas, moves):
+    x0, x1 = canvas.ax.get_xlim()
+    canvas.on_press(mouse(canvas, x0 + 5))
+    app.processEvents()
+    times = []
+    for k in range(moves):
+        t0 = time.perf_counter()
+        canvas.on_motion(mouse(canvas, x0 + 6 + (x1 - x0 - 12) * (k % 50) / 50))
+        app.processEvents()
+        times.append(time.perf_counter() - t0)
+    # 확대 없이 놓기 (축 범위 유지)
+    canvas.on_release(mouse(canvas, canvas._drag_start))
+    app.processEvents()
+    return np.array(times[5:]) * 1000
+
+
+def bench_refresh(app, canvas, points, repeat, follow):
+    # follow 가 아니면 마지막에서 한 창 앞을 보고 있는 상태 (새 점은 화면 밖)
+    canvas.auto_follow = follow
+    canvas.view_start = points - 2 * WINDOW_DURATION
+    times = []
+    for k in range(repeat):
+        canvas.history.append(float(points + k), [50.0] * AREA_COUNT)
+        t0 = time.perf_counter()
+        canvas.update_plot()
+        app.processEvents()
+        times.append(time.perf_counter() - t0)
+    return np.median(times[2:]) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--moves", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--points", type=int, default=1200, help="시작할 때 채워 둘 이력 길이")
+    parser.add_argument("--size", default="940x480")
+    args = parser.parse_args()
+    width, height = (int(v) for v in args.size.split("x"))
+
+    app = QApplication.instance() or QApplication([])
+    points = args.points
+    print(f"{width}x{height}, {points} points, {AREA_COUNT} lines, ms (median)")
+    print(f"{'mode':<6} {'drag p50':>9} {'drag p99':>9} {'drag FPS':>9} {'fixed':>8} {'follow':>8}")
+    for name, blit in (("draw", False), ("blit", True)):
+        canvas = GraphCanvas()
+        canvas.set_blit(blit)
+        canvas.resize(width, height)
+        canvas.show()
+        fill(canvas, points)
+        canvas.update_plot()
+        app.processEvents()
+        drag = bench_drag(app, canvas, args.moves)
+        fixed = bench_refresh(app, canvas, points, args.repeat, follow=False)
+        follow = bench_refresh(app, canvas, points + args.repeat, args.repeat, follow=True)
+        print(f"{name:<6} {np.median(drag):9.2f} {np.percentile(drag, 99):9.2f} {1000 / np.median(drag):9.0f} "
+              f"{fixed:8.2f} {follow:8.2f}")
+        canvas.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# benchmarks/bench_graph_history.py
+# 그래프 1초 갱신 비용과 이력 길이의 관계: 예전 deque (None 포함, 갱신마다 list() 로 전체 복사 후 60개 슬라이스) vs
+# GraphHistory (미러 링 버퍼 view, NaN). 이력을 capacity 까지 채우고 마지막 60 초 창을 그린다.
+#   prep : 창 꺼내기 + Line2D.set_data 10개 + set_xlim
+#   draw : prep + canvas.draw() (update_plot 전체, 데이터 변환은 matplotlib 이 draw 때 함)
+#   QT_QPA_PLATFORM=offscreen python benchmarks/bench_graph_history.py [--lengths 60 600 1800 7200 36000]
+import argparse
+import os
+import sys
+import time
+from collections import deque
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+
+from graph_viewer import AREA_COUNT, WINDOW_DURATION, GraphCanvas, GraphHistory
+
+GAP_RATIO = 0.02  # ROI 값이 빠지는 초 비율
+
+
+def make_series(length, seed=0):
+    rng = np.random.default_rng(seed)
+    values = rng.uniform(20, 80, (length, AREA_COUNT))
+    values[rng.random((length, AREA_COUNT)) < GAP_RATIO] = np.nan
+    return [(float(k), [None if np.isnan(v) else float(v) for v in row]) for k, row in enumerate(values)]
+
+
+def legacy_prep(canvas, times, data):
+    # 수정 전 update_plot 의 데이터 준비 (auto_follow, 마지막 창)
+    window_end = len(times)
+    window_start = max(0, window_end - WINDOW_DURATION)
+    for i in range(AREA_COUNT):
+        full_y_data = list(data[i])
+        full_x_data = list(times)
+        x_data = full_x_data[window_start:window_end]
+        canvas.lines[i].set_data(x_data, full_y_data[window_start:window_end])
+    canvas.ax.set_xlim(x_data[0], x_data[-1])
+
+
+def ring_prep(canvas, history):
+    x_data, y_data = history.window(max(0, len(history) - WINDOW_DURATION), len(history))
+    for i in range(AREA_COUNT):
+        canvas.lines[i].set_data(x_data, y_data[i])
+    canvas.ax.set_xlim(x_data[0], x_data[-1])
+
+
+def timed(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return np.median(times[2:]) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lengths", type=int, nargs="+", default=[60, 600, 1800, 7200, 36000])
+    parser.add_argument("--repeat", type=int, default=200, help="prep 반복 수 (draw 는 1/10)")
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+    canvas = GraphCanvas()
+    canvas.resize(940, 480)
+    app.processEvents()
+
+    print(f"{'history':>8} {'legacy prep':>12} {'ring prep':>10} {'legacy draw':>12} {'ring draw':>10}  (ms, median)")
+    for length in args.lengths:
+        series = make_series(length)
+        times = deque(maxlen=length)
+        data = [deque(maxlen=length) for _ in range(AREA_COUNT)]
+        history = GraphHistory(capacity=length)
+        for t, row in series:
+            times.append(t)
+            for i, v in enumerate(row):
+                data[i].append(v)
+            history.append(t, row)
+
+        legacy = timed(lambda: legacy_prep(canvas, times, data), args.repeat)
+        ring = timed(lambda: ring_prep(canvas, history), args.repeat)
+        draw_repeat = max(5, args.repeat // 10)
+        legacy_draw = timed(lambda: (legacy_prep(canvas, times, data), canvas.draw()), draw_repeat)
+        canvas.history = history
+        ring_draw = timed(canvas.update_plot, draw_repeat)
+        print(f"{length:8d} {legacy:12.3f} {ring:10.3f} {legacy_draw:12.2f} {ring_draw:10.2f}")
+
+
+if __name__ == "__main__":
+    main()
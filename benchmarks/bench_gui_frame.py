@@ -0,0 +1,94 @@
+# benchmarks/bench_gui_frame.py
+# 카메라 시뮬레이터에 OpenCVViewer 를 붙여서 GUI 스레드가 프레임 타이머 한 번에 쓰는 시간
+# (update_frame) 과 화면 갱신 간격의 p50/p99 를 측정
+#   QT_QPA_PLATFORM=offscreen python benchmarks/bench_gui_frame.py [--size 1920x1080] [--seconds 10]
+#   --busy 30 : 100 ms 마다 GUI 스레드를 30 ms 씩 붙잡는 작업(그래프 redraw 등)을 흉내
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("VIDEO_URL", "http://{ip}:554/stream1")
+
+from camera_simulator import SimConfig, SimulatorFarm
+
+
+def percentiles(values):
+    if not values:
+        return "-"
+    a = np.array(values) * 1000
+    return f"p50 {np.percentile(a, 50):7.2f} ms  p99 {np.percentile(a, 99):7.2f} ms  (n={len(a)})"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", default="1920x1080")
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--busy", type=float, default=0, help="100 ms 마다 GUI 스레드를 붙잡는 시간 (ms)")
+    args = parser.parse_args()
+    width, height = (int(v) for v in args.size.split("x"))
+
+    farm = SimulatorFarm(1, SimConfig(width=width, height=height, fps=args.fps)).start()
+
+    from PyQt5.QtCore import QTimer
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+    import opencv_viewer_module as viewer_module
+
+    tick_times = []
+    original = viewer_module.OpenCVViewer.update_frame
+
+    def timed_update_frame(self):
+        t0 = time.perf_counter()
+        original(self)
+        tick_times.append(time.perf_counter() - t0)
+
+    viewer_module.OpenCVViewer.update_frame = timed_update_frame
+    viewer = viewer_module.OpenCVViewer()
+
+    paint_times = []
+    set_pixmap = viewer.video_label.setPixmap
+
+    def timed_set_pixmap(pixmap):
+        paint_times.append(time.perf_counter())
+        set_pixmap(pixmap)
+
+    viewer.video_label.setPixmap = timed_set_pixmap
+
+    busy = QTimer()
+    if args.busy:
+        busy.timeout.connect(lambda: time.sleep(args.busy / 1000))
+        busy.start(100)
+
+    viewer.ip_input.setText(farm.hosts[0])
+    viewer.id_input.setText("admin")
+    viewer.pw_input.setText("admin")
+    viewer.start_stream()
+
+    # 연결/지연 버퍼가 찰 때까지 기다린 뒤 측정 시작
+    deadline = time.time() + 3
+    while time.time() < deadline:
+        app.processEvents()
+        time.sleep(0.002)
+    tick_times.clear()
+    paint_times.clear()
+    deadline = time.time() + args.seconds
+    while time.time() < deadline:
+        app.processEvents()
+        time.sleep(0.002)
+
+    busy.stop()
+    viewer.close()
+    farm.stop()
+
+    print(f"{width}x{height}@{args.fps}, {args.seconds:g}s, busy {args.busy:g} ms/100 ms")
+    print(f"  GUI tick        {percentiles(tick_times)}")
+    print(f"  paint interval  {percentiles(np.diff(paint_times).tolist())}")
+
+
+if __name__ == "__main__":
+    main()
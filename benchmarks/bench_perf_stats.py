@@ -0,0 +1,93 @@
+# benchmarks/bench_perf_stats.py
+# perf_stats 계측 비용: 끈 상태 / 켠 상태에서
+#   - 계측 지점 1개 (begin + end, count) 호출 비용
+#   - 1920x1080 → 960x540 표시 합성 (render_into, ROI overlay 포함, 계측 지점 3~4개)
+#   - 열화상 스트림 처리 (ThermalStream.feed: 프레이밍 + JSON 파싱, 메시지당 계측 지점 2~3개)
+# 를 재고, 계측을 넣기 전 (계측 함수 자체를 빈 함수로 바꾼 것) 과 비교한다.
+#   python benchmarks/bench_perf_stats.py [--repeat 300]
+import argparse
+import os
+import sys
+import time
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import perf_stats
+from frame_renderer import DISPLAY_FORMAT, DisplayBuffers, render_into
+from roi_utils import RoiOverlay
+from thermal_receiver import RoiSample, ThermalStream
+from thermal_store import ThermalStore
+from benchmarks.thermal_fixtures import chunked, make_rois, make_stream
+
+MODES = ("none", "off", "on")
+
+
+def set_mode(mode, originals):
+    # none: 계측 함수를 아무것도 안 하는 함수로 (계측 전 코드와 같은 비용의 기준선)
+    begin, end, count = originals
+    if mode == "none":
+        perf_stats.begin = lambda: 0.0
+        perf_stats.end = lambda name, t0: None
+        perf_stats.count = lambda name, n=1: None
+    else:
+        perf_stats.begin, perf_stats.end, perf_stats.count = begin, end, count
+    perf_stats.enable(mode == "on")
+    perf_stats.STATS.reset()
+
+
+def bench_calls(number=200000):
+    def span():
+        t0 = perf_stats.begin()
+        perf_stats.end("bench.span", t0)
+
+    def counter():
+        perf_stats.count("bench.count")
+
+    return (min(timeit.repeat(span, number=number, repeat=3)) / number * 1e9,
+            min(timeit.repeat(counter, number=number, repeat=3)) / number * 1e9)
+
+
+def bench_render(repeat):
+    frame = np.random.default_rng(0).integers(0, 255, (1080, 1920, 3), np.uint8)
+    rois = make_rois(width=1920, height=1080, alarm_ratio=1.0)
+    thermal = {i: RoiSample(i, 0.0, 50.0, 20.0, 30.0, 100, 100, 200, 200) for i in range(len(rois))}
+    buffers, overlay = DisplayBuffers(), RoiOverlay()
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        render_into(buffers, frame, (960, 540), DISPLAY_FORMAT, rois, thermal, {0: ["max"]}, overlay)
+        times.append(time.perf_counter() - t0)
+    return np.median(times[5:]) * 1000
+
+
+def bench_thermal(chunks, messages):
+    stream = ThermalStream(ThermalStore())
+    t0 = time.perf_counter()
+    for data in chunks:
+        stream.feed(data)
+    return (time.perf_counter() - t0) / messages * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=300)
+    parser.add_argument("--messages", type=int, default=5000)
+    args = parser.parse_args()
+
+    originals = (perf_stats.begin, perf_stats.end, perf_stats.count)
+    chunks = list(chunked(make_stream(args.messages)))
+    print(f"{'mode':<5} {'span ns':>8} {'count ns':>9} {'render ms':>10} {'thermal us/msg':>15}")
+    for mode in MODES:
+        set_mode(mode, originals)
+        span, counter = bench_calls()
+        render = bench_render(args.repeat)
+        thermal = bench_thermal(chunks, args.messages)
+        print(f"{mode:<5} {span:8.0f} {counter:9.0f} {render:10.3f} {thermal:15.2f}")
+    set_mode("off", originals)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# benchmarks/bench_recording.py
+# 스트림당 녹화 비용: 카메라 시뮬레이터 N 대에 FrameReader + ThermalBus 를 붙여
+#   1) 수신만 (녹화 없음)  2) SegmentRecorder 추가
+# 의 프로세스 CPU 를 비교하고, 스트림당 디스크 쓰기량, 프레임당 인코딩 시간,
+# 녹화가 밀려 건너뛴 프레임, 수신(표시) 경로 fps 변화를 잰다.
+#   python benchmarks/bench_recording.py [--streams 1 4] [--size 1280x720] [--seconds 15] [--fourcc mp4v]
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("VIDEO_URL", "http://{ip}:554/stream1")
+
+from camera_simulator import SimConfig, SimulatorFarm
+from frame_reader import FrameReader, DELAY_SEC, VIDEO_URL
+from segment_recorder import RECORD_EXT, SegmentRecorder
+from thermal_bus import acquire_bus, release_bus
+
+THERMAL_PORT = 60110
+WARMUP_SEC = 2
+
+
+def dir_bytes(path):
+    return sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+
+
+def measure(readers, seconds):
+    decoded0 = [r.decoded for r in readers]
+    cpu0, t0 = time.process_time(), time.perf_counter()
+    time.sleep(seconds)
+    elapsed = time.perf_counter() - t0
+    cpu = (time.process_time() - cpu0) / elapsed * 100
+    fps = sum(r.decoded - d for r, d in zip(readers, decoded0)) / elapsed / len(readers)
+    return cpu, fps, elapsed
+
+
+def run(hosts, seconds, segment, fourcc, ext):
+    readers, buses = [], []
+    for ip in hosts:
+        reader = FrameReader(VIDEO_URL.format(user="admin", pw="admin", ip=ip, port=554), DELAY_SEC)
+        reader.start()
+        readers.append(reader)
+        buses.append(acquire_bus(ip, THERMAL_PORT))
+    time.sleep(WARMUP_SEC)
+    base_cpu, base_fps, _ = measure(readers, seconds)
+
+    directory = tempfile.mkdtemp(prefix="bench_recording_")
+    recorders = [SegmentRecorder(r, b, directory, ip, segment, fourcc=fourcc, ext=ext)
+                 for r, b, ip in zip(readers, buses, hosts)]
+    for rec in recorders:
+        rec.start()
+    time.sleep(1)
+    bytes0 = dir_bytes(directory)
+    frames0 = [rec.frames for rec in recorders]
+    encode0 = [rec.encode_sec for rec in recorders]
+    rec_cpu, rec_fps, elapsed = measure(readers, seconds)
+    written = dir_bytes(directory) - bytes0
+    frames = sum(rec.frames - f for rec, f in zip(recorders, frames0))
+    encode = sum(rec.encode_sec - e for rec, e in zip(recorders, encode0))
+    for rec in recorders:
+        rec.stop()
+    n = len(hosts)
+    print(f"{n} stream(s): receive only  CPU {base_cpu:5.1f}%  fps/stream {base_fps:5.1f}")
+    print(f"{'':12} + recording   CPU {rec_cpu:5.1f}%  fps/stream {rec_fps:5.1f}  "
+          f"recording CPU/stream {(rec_cpu - base_cpu) / n:5.1f}%")
+    print(f"{'':12} disk {written / elapsed / n / 1024 ** 2:6.2f} MiB/s/stream  "
+          f"encode {encode / max(frames, 1) * 1000:6.2f} ms/frame  "
+          f"recorded {frames / elapsed / n:5.1f} fps/stream  skipped {sum(r.skipped for r in recorders)}  "
+          f"segments {sum(r.segments for r in recorders)}  samples {sum(r.samples for r in recorders)}")
+    for reader in readers:
+        reader.stop()
+        reader.join()
+    for bus in buses:
+        release_bus(bus)
+    shutil.rmtree(directory)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--streams", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--size", default="1280x720")
+    parser.add_argument("--seconds", type=float, default=15)
+    parser.add_argument("--segment", type=float, default=5)
+    parser.add_argument("--fourcc", default="mp4v")
+    parser.add_argument("--ext", default=RECORD_EXT)
+    args = parser.parse_args()
+    width, height = (int(v) for v in args.size.split("x"))
+
+    farm = SimulatorFarm(max(args.streams), SimConfig(width=width, height=height)).start()
+    print(f"{width}x{height} @ 30 fps, {args.fourcc}{args.ext}, segment {args.segment}s, {os.cpu_count()} CPU")
+    for n in args.streams:
+        run(farm.hosts[:n], args.seconds, args.segment, args.fourcc, args.ext)
+    farm.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# benchmarks/bench_replay_pipeline.py
+# 녹화 파일(또는 합성 스트림)을 재생 서버로 보내고 ThermalReceiver 로 받아
+# parse → store → alarm → render 전체 경로의 처리량과 지연을 측정
+#   python benchmarks/bench_replay_pipeline.py [--capture capture.thrc] [--speed max]
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from alarm_utils import AlarmEngine
+from roi_utils import draw_rois
+from thermal_capture import ThermalReplayServer, read_capture
+from thermal_receiver import ThermalReceiver
+from thermal_store import ThermalStore
+from benchmarks.thermal_fixtures import make_stream, make_rois, chunked
+
+
+def synthetic_records(messages, rate):
+    stream = make_stream(messages)
+    chunks = list(chunked(stream, 4096, jitter=True))
+    span = messages / rate
+    t0 = time.time()
+    return [(t0 + span * i / len(chunks), c) for i, c in enumerate(chunks)]
+
+
+def percentiles(values):
+    if not values:
+        return "-"
+    a = np.array(values) * 1000
+    return f"p50 {np.percentile(a, 50):7.3f} ms  p99 {np.percentile(a, 99):7.3f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--capture", help="thermal_capture.py 로 녹화한 파일")
+    parser.add_argument("--messages", type=int, default=3000)
+    parser.add_argument("--rate", type=float, default=10.0, help="합성 스트림의 초당 메시지 수")
+    parser.add_argument("--speed", default="max", help="재생 배속 또는 max")
+    args = parser.parse_args()
+
+    records = read_capture(args.capture) if args.capture else synthetic_records(args.messages, args.rate)
+    speed = None if args.speed == "max" else float(args.speed)
+    server = ThermalReplayServer(records, speed=speed).start()
+
+    rois = make_rois()
+    base = np.zeros((480, 640, 3), np.uint8)
+    frame = base.copy()
+    store = ThermalStore(capacity=max(1000, len(records)))
+    engine = AlarmEngine(rois)
+    timings = {"parse": [], "alarm": [], "render": [], "total": []}
+    last_recv = [0.0]
+
+    def on_raw(data):
+        last_recv[0] = time.perf_counter()
+
+    def on_samples(samples):
+        t_parsed = time.perf_counter()
+        engine.update(samples)
+        t_alarm = time.perf_counter()
+        np.copyto(frame, base)
+        draw_rois(frame, rois, store, alarms=engine.active_fields())
+        t_render = time.perf_counter()
+        timings["parse"].append(t_parsed - last_recv[0])
+        timings["alarm"].append(t_alarm - t_parsed)
+        timings["render"].append(t_render - t_alarm)
+        timings["total"].append(t_render - last_recv[0])
+
+    receiver = ThermalReceiver("127.0.0.1", server.port, store, on_samples=on_samples)
+    receiver.raw_tap = on_raw
+    receiver.link.max_retries = 0  # 재생이 끝나면 재연결하지 않고 종료
+    t0 = time.perf_counter()
+    receiver.start()
+    receiver.join()
+    elapsed = time.perf_counter() - t0
+    server.stop()
+
+    messages = receiver.framer.frames
+    total_bytes = sum(len(d) for _, d in records)
+    print(f"{len(records)} records, {total_bytes} bytes, speed={args.speed}")
+    print(f"  messages {messages}  parse errors {receiver.parse_errors}  "
+          f"{messages / elapsed:8.0f} msg/s  {total_bytes / elapsed / 2**20:6.2f} MiB/s")
+    for stage, values in timings.items():
+        print(f"  {stage:<7} {percentiles(values)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# benchmarks/bench_roi_table.py
+# ROI 표 갱신의 GUI 스레드 비용: 라벨 30개 setText/setStyleSheet (예전 update_frame) vs RoiTableModel
+# 30 fps 로 스냅샷을 넣고 (열화상 값은 10 Hz 로 바뀌고 알람은 가끔 켜졌다 꺼짐)
+# 프레임마다 갱신 호출 + 이벤트 처리(다시 그리기) 시간을 잰다.
+#   QT_QPA_PLATFORM=offscreen python benchmarks/bench_roi_table.py [--frames 600]
+import argparse
+import cProfile
+import os
+import pstats
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QApplication, QGridLayout, QLabel, QWidget
+
+from roi_table import RoiTableModel, format_temp, make_roi_table
+from thermal_receiver import RoiSample
+
+ALARM_STYLE = "background-color: rgb(255, 128, 128);"
+
+
+def make_snapshots(frames, seed=0):
+    rng = random.Random(seed)
+    snapshots = []
+    thermal, alarms = {}, {}
+    for n in range(frames):
+        if n % 3 == 0:  # 30 fps 영상에 10 Hz 열화상
+            thermal = {
+                i: RoiSample(i, n / 30, round(rng.uniform(30, 70), 1), round(rng.uniform(15, 25), 1),
+                             round(rng.uniform(20, 40), 1), 0, 0, 0, 0)
+                for i in range(10)
+            }
+        if n % 45 == 0:
+            alarms = {i: ["max"] for i in range(10) if rng.random() < 0.3}
+        snapshots.append((thermal, alarms))
+    return snapshots
+
+
+class LegacyLabels(QWidget):
+    # 예전 OpenCVViewer 의 roi_label_matrix 와 update_frame 라벨 갱신
+    def __init__(self):
+        super().__init__()
+        grid = QGridLayout(self)
+        for c, text in enumerate(("영역", "Max", "Min", "Avg")):
+            grid.addWidget(QLabel(text), 0, c)
+        self.roi_label_matrix = []
+        for i in range(10):
+            labels = {key: QLabel("-") for key in ("max", "min", "avr")}
+            grid.addWidget(QLabel(f"ROI{i}"), i + 1, 0)
+            for c, key in enumerate(("max", "min", "avr")):
+                grid.addWidget(labels[key], i + 1, c + 1)
+            self.roi_label_matrix.append(labels)
+
+    def update_labels(self, thermal, alarms):
+        for i in range(10):
+            temp = thermal.get(i)
+            alerts = alarms.get(i, [])
+            for key in ("max", "min", "avr"):
+                self.roi_label_matrix[i][key].setText(format_temp(getattr(temp, key)) if temp else "-")
+                self.roi_label_matrix[i][key].setStyleSheet(ALARM_STYLE if key in alerts else "")
+
+
+def run(app, update, snapshots):
+    # 프레임마다: 갱신 호출 + 쌓인 이벤트(타이머, 다시 그리기) 처리, 실제 30 fps 간격
+    # 프레임 사이 대기 중에 처리된 다시 그리기까지 포함하려고 프로세스 CPU 시간도 함께 잰다
+    times = []
+    cpu0 = time.process_time()
+    next_frame = time.perf_counter()
+    for thermal, alarms in snapshots:
+        t0 = time.perf_counter()
+        update(thermal, alarms)
+        app.processEvents()
+        times.append(time.perf_counter() - t0)
+        next_frame += 1 / 30
+        while time.perf_counter() < next_frame:
+            app.processEvents()
+            time.sleep(0.001)
+    return times, time.process_time() - cpu0
+
+
+def report(name, result, profile):
+    times, cpu = result
+    a = np.array(times) * 1000
+    print(f"{name:<8} update+events p50 {np.percentile(a, 50):6.3f} ms  p99 {np.percentile(a, 99):6.3f} ms  "
+          f"GUI CPU {cpu * 1000 / len(times):6.3f} ms/frame")
+    stats = pstats.Stats(profile)
+    stats.sort_stats("tottime").print_stats("setText|setStyleSheet|processEvents|flush|data|update_labels")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--frames", type=int, default=600)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+    snapshots = make_snapshots(args.frames)
+
+    # 대기 루프 자체의 CPU (갱신 없음) — 아래 두 결과에서 이만큼은 공통
+    _, idle_cpu = run(app, lambda thermal, alarms: None, snapshots)
+    print(f"idle     GUI CPU {idle_cpu * 1000 / args.frames:6.3f} ms/frame")
+
+    legacy = LegacyLabels()
+    legacy.show()
+    profile = cProfile.Profile()
+    profile.enable()
+    legacy_result = run(app, legacy.update_labels, snapshots)
+    profile.disable()
+    legacy.close()
+    report("labels", legacy_result, profile)
+
+    model = RoiTableModel()
+    view = make_roi_table(model)
+    view.show()
+    profile = cProfile.Profile()
+    profile.enable()
+    model_result = run(app, model.set_snapshot, snapshots)
+    profile.disable()
+    view.close()
+    report("model", model_result, profile)
+    print(f"model cell updates {model.cell_updates} (labels: {args.frames * 30} setText + setStyleSheet)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# benchmarks/bench_thermal_framer.py
+# 기존 read 단위 split 방식과 ThermalFramer 비교
+#   python benchmarks/bench_thermal_framer.py [--payload recorded.bin]
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from thermal_framer import ThermalFramer
+from benchmarks.thermal_fixtures import make_stream, load_stream, chunked
+
+
+def legacy_split(chunks):
+    # 수정 전 ThermalReceiver.run 과 동일한 처리
+    parsed = lost = 0
+    for data in chunks:
+        try:
+            decoded = data.decode('utf-8').strip()
+        except UnicodeDecodeError:
+            lost += 1
+            continue
+        for chunk in decoded.replace('][', ']|[').split('|'):
+            try:
+                json.loads(chunk)
+                parsed += 1
+            except ValueError:
+                lost += 1
+    return parsed, lost
+
+
+def framer(chunks):
+    f = ThermalFramer()
+    parsed = lost = 0
+    for data in chunks:
+        for frame in f.feed(data):
+            try:
+                json.loads(frame)
+                parsed += 1
+            except ValueError:
+                lost += 1
+    return parsed, lost
+
+
+def run(name, fn, chunks, expected):
+    t0 = time.perf_counter()
+    parsed, lost = fn(chunks)
+    dt = time.perf_counter() - t0
+    print(f"  {name:<8} parsed={parsed:>6}/{expected}  errors={lost:>5}  "
+          f"{dt * 1000:8.1f} ms  {parsed / dt:10.0f} msg/s")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--payload", help="녹화된 60110 바이트 스트림 파일")
+    parser.add_argument("--messages", type=int, default=5000)
+    args = parser.parse_args()
+
+    if args.payload:
+        cases = {"recorded": load_stream(args.payload)}
+    else:
+        cases = {
+            "ascii": make_stream(args.messages),
+            "utf-8": make_stream(args.messages, label="열화상 구역"),
+        }
+
+    for label, stream in cases.items():
+        expected = framer([stream])[0]
+        for mode, jitter in (("4096", False), ("jitter", True)):
+            chunks = list(chunked(stream, 4096, jitter=jitter))
+            print(f"[{label} / {mode}] {len(stream)} bytes, {len(chunks)} reads")
+            run("legacy", legacy_split, chunks, expected)
+            run("framer", framer, chunks, expected)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# benchmarks/bench_thermal_store.py
+# 기존 dict-of-dicts 레이아웃과 ThermalStore 의 메모리/속도 비교
+#   python benchmarks/bench_thermal_store.py [--seconds 600] [--rate 10]
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from thermal_receiver import RoiSample
+from thermal_store import ThermalStore, SAMPLE_DTYPE, MAX_AREAS, memory_per_hour
+from benchmarks.thermal_fixtures import make_message
+
+
+def make_items(count, seed=0):
+    rng = random.Random(seed)
+    items = []
+    while len(items) < count:
+        items.extend(json.loads(make_message(rng)))
+    return items[:count]
+
+
+def legacy_history(items):
+    # 수정 전 ThermalReceiver 가 만들던 7키 dict 를 이력으로 보관한다고 가정
+    history = [[] for _ in range(MAX_AREAS)]
+    for item in items:
+        history[item["area_id"]].append({
+            "max": item.get("temp_max", "-"),
+            "min": item.get("temp_min", "-"),
+            "avr": item.get("temp_avr", "-"),
+            "point_max_x": item.get("point_max_x"),
+            "point_max_y": item.get("point_max_y"),
+            "point_min_x": item.get("point_min_x"),
+            "point_min_y": item.get("point_min_y"),
+        })
+    return history
+
+
+def store_history(items, capacity):
+    store = ThermalStore(capacity=capacity)
+    now = time.time()
+    for i, item in enumerate(items):
+        store.append(RoiSample(
+            item["area_id"], now + i * 0.01,
+            item["temp_max"], item["temp_min"], item["temp_avr"],
+            item["point_max_x"], item["point_max_y"], item["point_min_x"], item["point_min_y"],
+        ))
+    return store
+
+
+def measure(fn, *args):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    result = fn(*args)
+    dt = time.perf_counter() - t0
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, dt
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=int, default=600)
+    parser.add_argument("--rate", type=int, default=10)
+    args = parser.parse_args()
+
+    per_area = args.seconds * args.rate
+    items = make_items(per_area * MAX_AREAS)
+    n = len(items)
+    print(f"{args.seconds}s @ {args.rate} Hz x {MAX_AREAS} ROI = {n} samples")
+
+    _, legacy_bytes, legacy_dt = measure(legacy_history, items)
+    store, store_bytes, store_dt = measure(store_history, items, per_area)
+
+    scale = 3600 / args.seconds
+    print(f"  dict-of-dicts : {legacy_bytes / n:7.1f} B/sample  {legacy_bytes * scale / 2**20:8.1f} MiB/camera-hour  "
+          f"ingest {n / legacy_dt:10.0f} samples/s")
+    print(f"  ThermalStore  : {store_bytes / n:7.1f} B/sample  {store_bytes * scale / 2**20:8.1f} MiB/camera-hour  "
+          f"ingest {n / store_dt:10.0f} samples/s  (itemsize {SAMPLE_DTYPE.itemsize} B, mirrored)")
+    print(f"  memory_per_hour(rate={args.rate}) = {memory_per_hour(rate=args.rate) / 2**20:.1f} MiB")
+
+    reps = 100000
+    t0 = time.perf_counter()
+    for i in range(reps):
+        store.latest(i % MAX_AREAS)
+    print(f"  latest()      : {(time.perf_counter() - t0) / reps * 1e6:7.2f} us")
+
+    t0 = time.perf_counter()
+    for i in range(reps):
+        store.last(i % MAX_AREAS, 600)
+    print(f"  last(600)     : {(time.perf_counter() - t0) / reps * 1e6:7.2f} us (view, no copy)")
+
+    view = store.last(0, 600)
+    print(f"  view shares memory with store: {view.base is not None}")
+
+
+if __name__ == "__main__":
+    main()
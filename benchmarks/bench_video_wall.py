@@ -0,0 +1,157 @@
+# benchmarks/bench_video_wall.py
+# 카메라 시뮬레이터 N 대 (기본 16) 를 영상 월에 붙여서 측정:
+#   - GUI 반응성: 10 ms 주기 probe 타이머의 지연 p50/p99 (이벤트 루프가 막힌 만큼 늦어짐)
+#   - 타일당 실제 표시 fps, 프로세스 CPU, OS 스레드 수 (FFmpeg 디코더 스레드 포함)
+# 비교 대상 per-camera 는 OpenCVViewer 방식을 카메라마다 띄운 것
+# (카메라마다 FrameRenderer 스레드, 640x480 고정 합성, FFmpeg 기본 디코더 스레드, 30 fps 표시).
+# wall 은 보이는 상태 / 최소화 직후(grab 만) / HIDDEN_RELEASE_SEC 이후(연결 끊음) 를 차례로 재고,
+# 다시 보이게 했을 때 모든 타일에 첫 프레임이 뜰 때까지의 시간도 잰다.
+#   QT_QPA_PLATFORM=offscreen python benchmarks/bench_video_wall.py [--cameras 16] [--seconds 10]
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import psutil
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("VIDEO_URL", "http://{ip}:554/stream1")
+
+from camera_simulator import SimConfig, SimulatorFarm
+
+PROBE_MS = 10
+WARMUP_SEC = 3
+
+
+def measure(app, seconds, frames_shown):
+    # seconds 동안 이벤트 루프를 돌리며 probe 타이머 지연과 CPU, 표시 프레임 수를 잰다
+    from PyQt5.QtCore import QTimer
+
+    lateness = []
+    last = [time.perf_counter()]
+
+    def probe():
+        now = time.perf_counter()
+        lateness.append(now - last[0] - PROBE_MS / 1000)
+        last[0] = now
+
+    timer = QTimer()
+    timer.timeout.connect(probe)
+    timer.start(PROBE_MS)
+    shown0 = frames_shown()
+    cpu0, t0 = time.process_time(), time.perf_counter()
+    while time.perf_counter() - t0 < seconds:
+        app.processEvents()
+        time.sleep(0.001)
+    elapsed = time.perf_counter() - t0
+    cpu = time.process_time() - cpu0
+    timer.stop()
+    a = np.maximum(np.array(lateness), 0) * 1000
+    return {
+        "late_p50": np.percentile(a, 50), "late_p99": np.percentile(a, 99),
+        "fps": (frames_shown() - shown0) / elapsed, "cpu": cpu / elapsed * 100,
+        "threads": psutil.Process().num_threads(),
+    }
+
+
+def report(name, cameras, r):
+    print(f"{name:<12} GUI probe late p50 {r['late_p50']:6.2f} ms  p99 {r['late_p99']:7.2f} ms  "
+          f"tile fps {r['fps'] / cameras:5.1f}  CPU {r['cpu']:5.0f}%  threads {r['threads']}")
+
+
+def run_wall(app, hosts, seconds):
+    from video_wall import HIDDEN_RELEASE_SEC, VideoWallWindow
+
+    wall = VideoWallWindow(hosts, "admin", "admin")
+    wall.resize(1280, 720)
+    wall.show()
+    measure(app, WARMUP_SEC, lambda: wall.blits)
+    results = {"wall": measure(app, seconds, lambda: wall.blits)}
+    sizes = sorted({c.buffers.latest.image.width() for c in wall.cameras if c.buffers.latest})
+    decoded = sum(c.reader.decoded for c in wall.cameras)
+
+    wall.showMinimized()
+    measure(app, 1, lambda: wall.blits)
+    results["wall (grab)"] = measure(app, min(seconds, HIDDEN_RELEASE_SEC - 2), lambda: wall.blits)
+    measure(app, HIDDEN_RELEASE_SEC - min(seconds, HIDDEN_RELEASE_SEC - 2), lambda: wall.blits)
+    results["wall (rel.)"] = measure(app, seconds, lambda: wall.blits)
+
+    wall.showNormal()
+    t0 = time.perf_counter()
+    app.processEvents()
+    while time.perf_counter() - t0 < 30 and not all(tile.shown_seq for tile in wall.tiles):
+        app.processEvents()
+        time.sleep(0.001)
+    restore = time.perf_counter() - t0
+    wall.close()
+    return results, sizes, decoded, restore
+
+
+def run_per_camera(app, hosts, seconds):
+    from PyQt5.QtGui import QPixmap
+    from PyQt5.QtWidgets import QGridLayout, QLabel, QWidget
+    from frame_reader import FrameReader, DELAY_SEC, DISPLAY_FPS, VIDEO_URL
+    from frame_renderer import FrameRenderer
+
+    window = QWidget()
+    grid = QGridLayout(window)
+    cols = int(np.ceil(np.sqrt(len(hosts))))
+    pipelines = []
+    shown = [0]
+    for i, ip in enumerate(hosts):
+        label = QLabel()
+        label.setScaledContents(True)
+        grid.addWidget(label, i // cols, i % cols)
+        reader = FrameReader(VIDEO_URL.format(user="admin", pw="admin", ip=ip, port=554), DELAY_SEC)
+        reader.start()
+        renderer = FrameRenderer(reader, DISPLAY_FPS)
+
+        def update(label=label, renderer=renderer):
+            rendered = renderer.take()
+            if rendered is not None:
+                label.setPixmap(QPixmap.fromImage(rendered.image))
+                shown[0] += 1
+
+        renderer.frame_ready.connect(update)
+        renderer.start()
+        pipelines.append((reader, renderer))
+    window.resize(1280, 720)
+    window.show()
+    measure(app, WARMUP_SEC, lambda: shown[0])
+    result = measure(app, seconds, lambda: shown[0])
+    for reader, renderer in pipelines:
+        renderer.frame_ready.disconnect()
+        renderer.stop()
+        reader.stop()
+        reader.join()
+    window.close()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cameras", type=int, default=16)
+    parser.add_argument("--size", default="640x480")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--skip-baseline", action="store_true")
+    args = parser.parse_args()
+    width, height = (int(v) for v in args.size.split("x"))
+
+    farm = SimulatorFarm(args.cameras, SimConfig(width=width, height=height)).start()
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+    print(f"{args.cameras} cameras {width}x{height} @ 30 fps, {os.cpu_count()} CPU")
+
+    if not args.skip_baseline:
+        report("per-camera", args.cameras, run_per_camera(app, farm.hosts, args.seconds))
+    results, sizes, decoded, restore = run_wall(app, farm.hosts, args.seconds)
+    for name, result in results.items():
+        report(name, args.cameras, result)
+    print(f"wall tile image widths {sizes}, frames retrieved {decoded}, "
+          f"restore to all tiles showing {restore:.1f} s")
+    farm.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# benchmarks/load_thermal_hub.py
+# 로컬 모의 카메라 N 대를 띄워 ThermalHub 의 CPU/스레드 수를 측정
+#   python benchmarks/load_thermal_hub.py --steps 1 8 16 32 64 --backend hub
+#   python benchmarks/load_thermal_hub.py --backend thread   (비교용)
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from thermal_hub import ThermalHub
+from thermal_receiver import ThermalReceiver
+from thermal_store import ThermalStore
+from benchmarks.thermal_fixtures import make_message
+
+
+async def _serve_camera(rate, seed, ports):
+    rng = random.Random(seed)
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                writer.write(make_message(rng))
+                await writer.drain()
+                await asyncio.sleep(1.0 / rate)
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    ports.append(server.sockets[0].getsockname()[1])
+    return server
+
+
+def camera_process(count, rate, conn):
+    # 모의 카메라는 별도 프로세스에서 동작 (측정 대상 CPU 에 섞이지 않도록)
+    async def main():
+        ports = []
+        servers = [await _serve_camera(rate, i, ports) for i in range(count)]
+        conn.send(ports)
+        await asyncio.Event().wait()
+        del servers
+    asyncio.run(main())
+
+
+def measure(backend, ports, duration):
+    hub = ThermalHub() if backend == "hub" else None
+    stores = [ThermalStore(capacity=1000) for _ in ports]
+    receivers = []
+    for port, store in zip(ports, stores):
+        if hub:
+            r = hub.connect("127.0.0.1", port, store)
+        else:
+            r = ThermalReceiver("127.0.0.1", port, store)
+        r.start()
+        receivers.append(r)
+
+    time.sleep(1.0)  # 연결 안정화
+    frames0 = sum(r.framer.frames for r in receivers)
+    cpu0, wall0 = time.process_time(), time.perf_counter()
+    time.sleep(duration)
+    cpu = time.process_time() - cpu0
+    wall = time.perf_counter() - wall0
+    frames = sum(r.framer.frames for r in receivers) - frames0
+    threads = threading.active_count()
+
+    for r in receivers:
+        r.stop()
+    if hub:
+        hub.shutdown()
+    return cpu / wall * 100, threads, frames / wall
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--steps", type=int, nargs="+", default=[1, 8, 16, 32, 64])
+    parser.add_argument("--rate", type=float, default=10.0, help="카메라당 초당 메시지 수")
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--backend", choices=("hub", "thread"), default="hub")
+    args = parser.parse_args()
+
+    print(f"backend={args.backend} rate={args.rate}/s per camera")
+    print(f"{'cameras':>8} {'cpu %':>8} {'threads':>8} {'msg/s':>10}")
+    for n in args.steps:
+        parent, child = multiprocessing.Pipe()
+        proc = multiprocessing.Process(target=camera_process, args=(n, args.rate, child), daemon=True)
+        proc.start()
+        ports = parent.recv()
+        try:
+            cpu, threads, rate = measure(args.backend, ports, args.duration)
+        finally:
+            proc.terminate()
+            proc.join()
+        print(f"{n:>8} {cpu:>8.1f} {threads:>8} {rate:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
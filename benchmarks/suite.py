@@ -0,0 +1,266 @@
+# benchmarks/suite.py
+# 핫 패스 벤치마크 모음 (headless, 카메라/네트워크 없이 합성 프레임과 녹화된 열화상 페이로드로 측정)
+#   draw_rois   : ROI 1/5/10 개 x 640x480, 1280x720, 1920x1080 (온도 글자 + 알람 채우기 포함)
+#   thermal     : ThermalStream.feed (프레이밍 + JSON 파싱 + 저장소 기록), 녹화 파일 / 합성 스트림
+#   alarm       : AlarmEngine.update (ROI 10개, 메시지 1개)
+#   graph       : GraphCanvas.update_plot, 1800 포인트 (MAX_SECONDS) 가 찬 상태 (축 범위 그대로 → blit)
+#                 와 전체 그리기 (자동 따라가기로 축 범위가 바뀌는 매초 갱신)
+#   cgi         : fetch_all_rois 의 getthermalroi0..9 응답 파싱
+# 결과는 JSON 기준선으로 저장하고, 비교 모드는 중앙값이 기준선보다 threshold 넘게 느려진 항목을 표시하고
+# 하나라도 있으면 종료 코드 1 을 돌려준다.
+#
+#   python benchmarks/suite.py [--only draw_rois graph] [--save benchmarks/baselines/local.json]
+#   python benchmarks/suite.py --compare benchmarks/baselines/local.json [--threshold 0.15]
+#   python benchmarks/suite.py --thermal-capture capture.thrc   (thermal_capture.py 로 녹화한 실제 카메라 스트림)
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from benchmarks.thermal_fixtures import chunked, make_cgi_responses, make_rois, make_stream
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+THERMAL_FIXTURE = os.path.join(FIXTURE_DIR, "thermal_sim.thrc")  # 시뮬레이터 10초 녹화 (fragment, ROI 갱신 알림 포함)
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "baseline.json")
+MIN_TIME = 1.0         # 항목당 최소 측정 시간 (초)
+MAX_SAMPLES = 2000
+WARMUP = 3
+THRESHOLD = 0.15       # 기준선 대비 이만큼 (비율) 넘게 느려지면 회귀
+
+SIZES = [(640, 480), (1280, 720), (1920, 1080)]
+ROI_COUNTS = [1, 5, 10]
+GRAPH_POINTS = 1800
+
+
+# --- 측정 항목: (이름, 호출 함수, 호출 1회당 작업 수) 를 yield ---
+
+def draw_rois_cases(args):
+    from roi_utils import RoiOverlay, draw_rois
+    from thermal_receiver import RoiSample
+
+    for w, h in SIZES:
+        frame = np.random.default_rng(0).integers(0, 255, (h, w, 3), np.uint8)
+        for n in ROI_COUNTS:
+            rois = make_rois(n, 640, 480, alarm_ratio=1.0)
+            for roi in rois:
+                roi["alarm"].update(mode="maximum", condition="above", temperature="50")
+            thermal = {i: RoiSample(i, 0.0, 80.0 if i % 2 == 0 else 30.0, 20.0, 25.0, 100, 100, 200, 200)
+                       for i in range(n)}
+            alarms = {i: ["max"] for i in range(0, n, 2)}
+            overlay = RoiOverlay()
+            sx, sy = w / 640, h / 480
+
+            def run(frame=frame, rois=rois, thermal=thermal, alarms=alarms, overlay=overlay, sx=sx, sy=sy):
+                draw_rois(frame, rois, thermal, sx, sy, overlay, alarms, bgr=True)
+
+            yield f"draw_rois/{w}x{h}/{n}roi", run, 1
+
+
+def thermal_cases(args):
+    from thermal_capture import read_capture
+    from thermal_receiver import ThermalStream
+    from thermal_store import ThermalStore
+
+    sources = [("recorded", [data for _, data in read_capture(args.thermal_capture)])]
+    sources.append(("synthetic", list(chunked(make_stream(300), jitter=True))))
+    for name, chunks in sources:
+        probe = ThermalStream(ThermalStore())
+        for data in chunks:
+            probe.feed(data)
+        messages = probe.framer.frames
+
+        def run(chunks=chunks):
+            stream = ThermalStream(ThermalStore(), on_roi_refresh=lambda: None)
+            for data in chunks:
+                stream.feed(data)
+
+        yield f"thermal/feed_{name}", run, messages
+
+
+def alarm_cases(args):
+    from alarm_utils import AlarmEngine
+    from thermal_capture import read_capture
+    from thermal_receiver import ThermalStream
+    from thermal_store import ThermalStore
+
+    messages = []
+    stream = ThermalStream(ThermalStore(), on_samples=messages.append)
+    for _, data in read_capture(args.thermal_capture):
+        stream.feed(data)
+    rois = make_rois(10, alarm_ratio=1.0)
+    for i, roi in enumerate(rois):
+        roi["alarm"].update(start_delay=str(i % 3), stop_delay="1")
+    engine = AlarmEngine(rois)
+    now = [0.0]
+
+    def run():
+        # 메시지마다 시각을 0.1 초씩 진행 (녹화 시각을 반복해서 쓰면 지연 상태가 되돌아감)
+        for samples in messages:
+            now[0] += 0.1
+            engine.update(samples, now[0])
+
+    yield "alarm/update", run, len(messages)
+
+
+def graph_cases(args):
+    from PyQt5.QtWidgets import QApplication
+
+    from graph_viewer import GraphCanvas
+
+    app = QApplication.instance() or QApplication([])
+    canvas = GraphCanvas()
+    canvas.resize(940, 480)
+    rng = np.random.default_rng(0)
+    for k in range(GRAPH_POINTS):
+        # ROI 가 잠깐씩 빠지는 구간 포함
+        canvas.history.append(float(k), [None if rng.random() < 0.02 else float(rng.uniform(20, 80))
+                                         for _ in range(10)])
+    app.processEvents()
+
+    yield f"graph/update_plot_{GRAPH_POINTS}", canvas.update_plot, 1
+    yield f"graph/draw_{GRAPH_POINTS}", canvas.draw, 1
+
+
+def cgi_cases(args):
+    from roi_utils import parse_cgi, roi_from_cgi
+
+    responses = make_cgi_responses()
+
+    def run():
+        return [roi_from_cgi(parse_cgi(text)) for text in responses]
+
+    yield "cgi/parse_rois", run, 1
+
+
+GROUPS = {
+    "draw_rois": draw_rois_cases,
+    "thermal": thermal_cases,
+    "alarm": alarm_cases,
+    "graph": graph_cases,
+    "cgi": cgi_cases,
+}
+
+
+# --- 실행 / 저장 / 비교 ---
+
+def measure(fn, ops, min_time=MIN_TIME):
+    for _ in range(WARMUP):
+        fn()
+    times = []
+    start = time.perf_counter()
+    while len(times) < MAX_SAMPLES and (time.perf_counter() - start < min_time or len(times) < 5):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    per_op = np.array(times) / ops * 1e6
+    return {
+        "unit": "us/op",
+        "ops_per_call": ops,
+        "samples": len(times),
+        "median": float(np.median(per_op)),
+        "p90": float(np.percentile(per_op, 90)),
+        "min": float(per_op.min()),
+    }
+
+
+def environment():
+    import cv2
+    import matplotlib
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = ""
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "numpy": np.__version__,
+        "opencv": cv2.__version__,
+        "matplotlib": matplotlib.__version__,
+    }
+
+
+def run_suite(args):
+    results = {}
+    for group in args.only or list(GROUPS):
+        for name, fn, ops in GROUPS[group](args):
+            results[name] = measure(fn, ops, args.min_time)
+            r = results[name]
+            print(f"{name:<32} {r['median']:12.2f} us/op  (p90 {r['p90']:.2f}, {r['samples']} samples)", flush=True)
+    return results
+
+
+def compare(results, baseline, threshold, partial=False):
+    # 반환: 회귀 항목 이름 목록
+    regressions = []
+    print(f"\n{'benchmark':<32} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, r in results.items():
+        base = baseline["results"].get(name)
+        if base is None:
+            print(f"{name:<32} {'-':>12} {r['median']:12.2f} {'new':>8}")
+            continue
+        change = r["median"] / base["median"] - 1
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        elif change < -threshold:
+            flag = "  faster"
+        print(f"{name:<32} {base['median']:12.2f} {r['median']:12.2f} {change * 100:+7.1f}%{flag}")
+    missing = sorted(set(baseline["results"]) - set(results))
+    if missing and not partial:
+        print(f"(기준선에만 있는 항목: {', '.join(missing)})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--only", nargs="+", choices=list(GROUPS))
+    parser.add_argument("--save", nargs="?", const=DEFAULT_BASELINE, help="결과를 기준선 JSON 으로 저장")
+    parser.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE, help="기준선 JSON 과 비교")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="회귀로 볼 중앙값 증가 비율")
+    parser.add_argument("--min-time", type=float, default=MIN_TIME, help="항목당 최소 측정 시간 (초)")
+    parser.add_argument("--thermal-capture", default=THERMAL_FIXTURE, help="thermal_capture.py 녹화 파일")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        meta = baseline.get("environment", {})
+        print(f"기준선: {args.compare} ({meta.get('created')}, commit {meta.get('commit') or '?'}, "
+              f"{meta.get('cpus')} CPU, {meta.get('platform')})")
+
+    results = run_suite(args)
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        data = {"environment": environment(), "threshold": args.threshold, "partial": bool(args.only),
+                "results": results}
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1)
+        print(f"기준선 저장: {args.save}")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold, partial=bool(args.only))
+        if regressions:
+            print(f"\n{len(regressions)}개 항목이 기준선보다 {args.threshold * 100:.0f}% 넘게 느려짐")
+            sys.exit(1)
+        print(f"\n회귀 없음 (threshold {args.threshold * 100:.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
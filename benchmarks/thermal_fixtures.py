@@ -0,0 +1,89 @@
+# benchmarks/thermal_fixtures.py
+# 카메라 60110 포트 스트림과 같은 형식의 열화상 페이로드 생성/로드
+import json
+import random
+
+ROI_COUNT = 10
+
+
+def make_message(rng, roi_count=ROI_COUNT, width=640, height=480):
+    items = []
+    for area_id in range(roi_count):
+        t_min = round(rng.uniform(15.0, 30.0), 1)
+        t_max = round(t_min + rng.uniform(0.5, 60.0), 1)
+        items.append({
+            "area_id": area_id,
+            "temp_max": t_max,
+            "temp_min": t_min,
+            "temp_avr": round((t_max + t_min) / 2, 1),
+            "point_max_x": rng.randrange(width),
+            "point_max_y": rng.randrange(height),
+            "point_min_x": rng.randrange(width),
+            "point_min_y": rng.randrange(height),
+        })
+    return json.dumps(items, ensure_ascii=False).encode("utf-8")
+
+
+def make_rois(count=ROI_COUNT, width=640, height=480, seed=0, alarm_ratio=0.5):
+    # fetch_all_rois 가 돌려주는 것과 같은 형태의 ROI 설정
+    rng = random.Random(seed)
+    rois = []
+    for i in range(count):
+        w, h = rng.randint(60, 200), rng.randint(60, 160)
+        sx, sy = rng.randrange(width - w), rng.randrange(height - h)
+        use = i < count * alarm_ratio
+        rois.append({
+            "coords": (sx, sy, sx + w, sy + h),
+            "alarm": {
+                "alarm_use": "on" if use else "off",
+                "mode": rng.choice(("maximum", "minimum", "average")),
+                "condition": rng.choice(("above", "below")),
+                "temperature": str(rng.randint(20, 60)),
+                "start_delay": "0",
+                "stop_delay": "0",
+            },
+        })
+    return rois
+
+
+def make_cgi_responses(rois=None, extra_keys=20):
+    # getthermalroi0..9 응답 본문 (key=value 줄). 실제 카메라처럼 쓰지 않는 키도 섞는다
+    rois = make_rois() if rois is None else rois
+    responses = []
+    for i in range(ROI_COUNT):
+        if i < len(rois):
+            sx, sy, ex, ey = rois[i]["coords"]
+            fields = {"roi_use": "on", "startx": sx, "starty": sy, "endx": ex, "endy": ey}
+            fields.update(rois[i]["alarm"])
+        else:
+            fields = {"roi_use": "off", "startx": 0, "starty": 0, "endx": 0, "endy": 0}
+        fields.update({f"reserved{k}": "0" for k in range(extra_keys)})
+        responses.append("".join(f"{k}={v}\n" for k, v in fields.items()))
+    return responses
+
+
+def make_stream(messages=5000, roi_count=ROI_COUNT, seed=0, label=None):
+    # label 을 주면 멀티바이트 UTF-8 문자열 필드를 섞어 넣는다
+    rng = random.Random(seed)
+    parts = []
+    for _ in range(messages):
+        msg = make_message(rng, roi_count)
+        if label:
+            msg = msg[:-1] + b',{"name":"' + label.encode("utf-8") + b'"}]'
+        parts.append(msg)
+    return b"".join(parts)
+
+
+def load_stream(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def chunked(data, size=4096, jitter=False, seed=0):
+    # recv() 가 돌려주는 조각을 흉내낸다 (jitter=True 면 임의 크기)
+    rng = random.Random(seed)
+    i = 0
+    while i < len(data):
+        n = rng.randint(1, size) if jitter else size
+        yield data[i:i + n]
+        i += n
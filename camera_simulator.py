@@ -0,0 +1,373 @@
+# camera_simulator.py
+# 실제 카메라 없이 부하/장시간 테스트를 하기 위한 로컬 카메라 시뮬레이터.
+# 카메라 1대가 제공하는 세 가지를 흉내낸다:
+#   - HTTP  : /cgi-bin/control/camthermalroi.cgi, camthermalfunc.cgi (key=value 응답)
+#   - 영상  : /stream1 (RTSP 대신 HTTP multipart MJPEG, OpenCV/FFmpeg 로 그대로 열림)
+#   - 열화상: 60110 TCP JSON 스트림
+# 모든 인스턴스는 하나의 asyncio 루프에서 돌며, 127.0.1.1 부터 루프백 주소를 하나씩 써서
+# 각 인스턴스가 실제 카메라처럼 표준 포트(80/554/60110)를 갖는다.
+# (1024 미만 포트는 root 권한이나 sysctl net.ipv4.ip_unprivileged_port_start=0 필요.
+#  --http-port 등으로 바꿀 수 있지만 그 경우 뷰어가 아닌 부하 테스트 클라이언트용)
+#
+#   python camera_simulator.py --count 100 --rois 10 --rate 10 --fragment --disconnect-every 120
+#   뷰어: VIDEO_URL="http://{ip}:554/stream1" python main.py  (IP 127.0.1.1, admin/admin)
+import argparse
+import asyncio
+import ipaddress
+import json
+import random
+import threading
+import time
+from urllib.parse import urlsplit, parse_qsl
+
+import cv2
+import numpy as np
+
+THERMAL_PORT = 60110
+
+
+class SimConfig:
+    def __init__(self, **kwargs):
+        self.rois = 10                 # 활성 ROI 수 (최대 10)
+        self.rate = 10.0               # 열화상 메시지/초
+        self.jitter = 0.2              # 전송 간격 흔들림 비율
+        self.payload_jitter = 0.0      # 메시지마다 ROI 가 빠질 확률
+        self.fragment = False          # 메시지를 여러 TCP 조각으로 나눠 전송
+        self.disconnect_every = 0.0    # 평균 끊김 주기(초), 0 이면 끊지 않음
+        self.refresh_every = 0.0       # ROI 설정 변경 + area_id 100 알림 주기(초)
+        self.width = 640
+        self.height = 480
+        self.fps = 30.0
+        self.video_file = None
+        self.timestamp = False         # 보내는 시각을 프레임에 찍음 (latency_probe.py, 프레임마다 JPEG 재인코딩)
+        self.user = "admin"
+        self.password = "admin"
+        self.http_port = 80
+        self.video_port = 554
+        self.thermal_port = THERMAL_PORT
+        for k, v in kwargs.items():
+            if not hasattr(self, k):
+                raise TypeError(f"unknown option: {k}")
+            setattr(self, k, v)
+
+
+def load_video_frames(config, count=60, quality=80):
+    # 모든 인스턴스가 공유하는 JPEG 프레임 목록 (파일이 있으면 파일에서, 없으면 합성)
+    frames = []
+    if config.video_file:
+        cap = cv2.VideoCapture(config.video_file)
+        while len(frames) < count:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            frame = cv2.resize(frame, (config.width, config.height))
+            frames.append(cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, quality])[1].tobytes())
+        cap.release()
+    if not frames:
+        w, h = config.width, config.height
+        gradient = np.tile(np.linspace(0, 255, w, dtype=np.uint8), (h, 1))
+        for i in range(count):
+            gray = np.roll(gradient, i * w // count, axis=1)
+            frame = cv2.applyColorMap(gray, cv2.COLORMAP_INFERNO)
+            cv2.putText(frame, f"SIM {i:02d}", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
+            frames.append(cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, quality])[1].tobytes())
+    return frames
+
+
+class CameraSimulator:
+    def __init__(self, host, config, video_frames, seed=0):
+        self.host = host
+        self.config = config
+        self.video_frames = video_frames
+        self.rng = random.Random(seed)
+        self.servers = []
+        self.roi_config = [self._make_roi(i) for i in range(10)]
+        self.temps = [self.rng.uniform(20.0, 40.0) for _ in range(10)]
+        self.thermal_func = {
+            "supportmode": "1", "temp_mode": "1", "correct_use": "off",
+            "emissivity": "0.95", "transmission": "1.0", "atmosphere": "20.0", "zerooffset": "0.0",
+            "showcenter_use": "off", "showtemp_use": "on", "showindcator_use": "off", "showcbar_use": "on",
+            "edgenhance": "off", "noisereducefliter": "off", "imgenhance_use": "off",
+            "imgAHE": "off", "imgCIE": "off", "imgweightcie": "lowest", "gamma_use": "off",
+            "gamma_param1": "256", "gamma_param2": "768",
+            "color": "grey", "gainctrl": "auto", "usergainmin": "1", "usergainmax": "1",
+            "bright": "0", "contrast": "0", "colorinv_use": "off", "mirror_use": "off", "flip_use": "off",
+            "nucmode": "off", "nuctime": "60", "nucautosens": "middle",
+        }
+        self._refresh_flag = False
+        self._refresh_task = None
+        self.stats = {"http": 0, "video_frames": 0, "thermal_messages": 0, "disconnects": 0}
+        self._raw_frames = None
+
+    def _make_roi(self, i):
+        rng = self.rng
+        cfg = self.config
+        w, h = rng.randint(60, 160), rng.randint(50, 120)
+        sx, sy = rng.randrange(cfg.width - w), rng.randrange(cfg.height - h)
+        return {
+            "roi_use": "on" if i < cfg.rois else "off",
+            "startx": sx, "starty": sy, "endx": sx + w, "endy": sy + h,
+            "alarm_use": "on" if i % 2 == 0 else "off",
+            "mode": rng.choice(("maximum", "minimum", "average")),
+            "condition": rng.choice(("above", "below")),
+            "temperature": rng.randint(25, 45),
+            "start_delay": 0, "stop_delay": 0,
+        }
+
+    async def start(self):
+        cfg = self.config
+        self.servers = [
+            await asyncio.start_server(self._handle_http, self.host, cfg.http_port),
+            await asyncio.start_server(self._handle_video, self.host, cfg.video_port),
+            await asyncio.start_server(self._handle_thermal, self.host, cfg.thermal_port),
+        ]
+        if cfg.refresh_every:
+            self._refresh_task = asyncio.ensure_future(self._refresh_loop())
+
+    async def stop(self):
+        if self._refresh_task:
+            self._refresh_task.cancel()
+        for server in self.servers:
+            server.close()
+
+    # --- HTTP CGI ---
+
+    async def _handle_http(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                keep_alive = True
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    if line.lower().startswith(b"connection:") and b"close" in line.lower():
+                        keep_alive = False
+                parts = request_line.decode("latin-1").split()
+                body = self._cgi(parts[1] if len(parts) > 1 else "/")
+                self.stats["http"] += 1
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: text/plain\r\n"
+                    + f"Content-Length: {len(body)}\r\n".encode()
+                    + (b"" if keep_alive else b"Connection: close\r\n")
+                    + b"\r\n" + body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    def _cgi(self, target):
+        url = urlsplit(target)
+        params = dict(parse_qsl(url.query))
+        if params.get("id") != self.config.user or params.get("passwd") != self.config.password:
+            return b"Unauthorized\n"
+        action = params.get("action", "")
+        if url.path.endswith("camthermalroi.cgi") and action.startswith("getthermalroi"):
+            try:
+                roi = self.roi_config[int(action[len("getthermalroi"):])]
+            except (ValueError, IndexError):
+                return b"Error\n"
+            return "".join(f"{k}={v}\n" for k, v in roi.items()).encode()
+        if url.path.endswith("camthermalfunc.cgi"):
+            if action == "getthermalfunc":
+                return "".join(f"{k}={v}\n" for k, v in self.thermal_func.items()).encode()
+            if action == "setthermalfunc":
+                for k, v in params.items():
+                    if k in self.thermal_func:
+                        self.thermal_func[k] = v
+                return b"OK\n"
+            return b"OK\n"
+        return b"Error\n"
+
+    # --- 영상 (multipart MJPEG) ---
+
+    async def _handle_video(self, reader, writer):
+        try:
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            writer.write(b"HTTP/1.0 200 OK\r\n"
+                         b"Content-Type: multipart/x-mixed-replace; boundary=frame\r\n\r\n")
+            interval = 1.0 / self.config.fps
+            loop = asyncio.get_running_loop()
+            next_time = loop.time()
+            i = 0
+            deadline = self._disconnect_deadline(loop)
+            while deadline is None or loop.time() < deadline:
+                jpeg = self.video_frames[i % len(self.video_frames)]
+                if self.config.timestamp:
+                    jpeg = self._stamped(i)
+                writer.write(b"--frame\r\nContent-Type: image/jpeg\r\n"
+                             + f"Content-Length: {len(jpeg)}\r\n\r\n".encode() + jpeg + b"\r\n")
+                await writer.drain()
+                self.stats["video_frames"] += 1
+                i += 1
+                next_time += interval
+                await asyncio.sleep(max(0.0, next_time - loop.time()))
+            self.stats["disconnects"] += 1
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    def _stamped(self, i):
+        from latency_probe import stamp_frame
+
+        if self._raw_frames is None:
+            self._raw_frames = [cv2.imdecode(np.frombuffer(j, np.uint8), cv2.IMREAD_COLOR) for j in self.video_frames]
+        frame = stamp_frame(self._raw_frames[i % len(self._raw_frames)].copy(), time.time())
+        return cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, 80])[1].tobytes()
+
+    # --- 열화상 60110 ---
+
+    def _message(self):
+        cfg = self.config
+        rng = self.rng
+        items = []
+        if self._refresh_flag:
+            self._refresh_flag = False
+            items.append({"area_id": 100})
+        for i, roi in enumerate(self.roi_config):
+            if roi["roi_use"] != "on" or rng.random() < cfg.payload_jitter:
+                continue
+            self.temps[i] = min(120.0, max(-20.0, self.temps[i] + rng.gauss(0, 0.5)))
+            t_max = round(self.temps[i] + rng.uniform(0, 5), 1)
+            t_min = round(self.temps[i] - rng.uniform(0, 5), 1)
+            items.append({
+                "area_id": i,
+                "temp_max": t_max, "temp_min": t_min,
+                "temp_avr": round((t_max + t_min) / 2, 1),
+                "point_max_x": rng.randint(roi["startx"], roi["endx"]),
+                "point_max_y": rng.randint(roi["starty"], roi["endy"]),
+                "point_min_x": rng.randint(roi["startx"], roi["endx"]),
+                "point_min_y": rng.randint(roi["starty"], roi["endy"]),
+            })
+        return json.dumps(items).encode()
+
+    async def _handle_thermal(self, reader, writer):
+        cfg = self.config
+        rng = self.rng
+        loop = asyncio.get_running_loop()
+        deadline = self._disconnect_deadline(loop)
+        try:
+            while deadline is None or loop.time() < deadline:
+                msg = self._message()
+                if cfg.fragment and len(msg) > 8:
+                    cuts = sorted(rng.sample(range(1, len(msg)), rng.randint(1, 3)))
+                    for a, b in zip([0] + cuts, cuts + [len(msg)]):
+                        writer.write(msg[a:b])
+                        await writer.drain()
+                        await asyncio.sleep(0)
+                else:
+                    writer.write(msg)
+                    await writer.drain()
+                self.stats["thermal_messages"] += 1
+                interval = 1.0 / cfg.rate
+                await asyncio.sleep(interval * (1 + rng.uniform(-cfg.jitter, cfg.jitter)))
+            self.stats["disconnects"] += 1
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    def _disconnect_deadline(self, loop):
+        if not self.config.disconnect_every:
+            return None
+        return loop.time() + self.rng.expovariate(1.0 / self.config.disconnect_every)
+
+    async def _refresh_loop(self):
+        while True:
+            await asyncio.sleep(self.config.refresh_every)
+            i = self.rng.randrange(self.config.rois or 1)
+            self.roi_config[i] = self._make_roi(i)
+            self._refresh_flag = True
+
+
+class SimulatorFarm:
+    # 여러 시뮬레이터를 한 프로세스, 하나의 이벤트 루프 스레드에서 실행
+    def __init__(self, count, config=None, base_ip="127.0.1.1"):
+        self.config = config or SimConfig()
+        base = int(ipaddress.IPv4Address(base_ip))
+        self.hosts = [str(ipaddress.IPv4Address(base + i)) for i in range(count)]
+        self.simulators = []
+        self.loop = asyncio.new_event_loop()
+        self._thread = None
+
+    def start(self):
+        frames = load_video_frames(self.config)
+        self.simulators = [CameraSimulator(h, self.config, frames, seed=i) for i, h in enumerate(self.hosts)]
+        self._thread = threading.Thread(target=self.loop.run_forever, name="SimulatorFarm", daemon=True)
+        self._thread.start()
+        self._call(lambda: asyncio.gather(*(s.start() for s in self.simulators)))
+        return self
+
+    def stop(self):
+        self._call(lambda: asyncio.gather(*(s.stop() for s in self.simulators)))
+        self._call(self._cancel_connections)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+
+    @staticmethod
+    async def _cancel_connections():
+        # 열려 있는 연결 핸들러 정리
+        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _call(self, make_awaitable):
+        async def run():
+            return await make_awaitable()
+        return asyncio.run_coroutine_threadsafe(run(), self.loop).result()
+
+    def totals(self):
+        totals = {}
+        for sim in self.simulators:
+            for k, v in sim.stats.items():
+                totals[k] = totals.get(k, 0) + v
+        return totals
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=1)
+    parser.add_argument("--base-ip", default="127.0.1.1")
+    parser.add_argument("--rois", type=int, default=10)
+    parser.add_argument("--rate", type=float, default=10.0)
+    parser.add_argument("--jitter", type=float, default=0.2)
+    parser.add_argument("--payload-jitter", type=float, default=0.0)
+    parser.add_argument("--fragment", action="store_true")
+    parser.add_argument("--disconnect-every", type=float, default=0.0)
+    parser.add_argument("--refresh-every", type=float, default=0.0)
+    parser.add_argument("--size", default="640x480")
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--video-file")
+    parser.add_argument("--timestamp", action="store_true", help="프레임에 보낸 시각을 찍음 (latency_probe.py)")
+    parser.add_argument("--http-port", type=int, default=80)
+    parser.add_argument("--video-port", type=int, default=554)
+    parser.add_argument("--thermal-port", type=int, default=THERMAL_PORT)
+    args = parser.parse_args()
+
+    width, height = (int(v) for v in args.size.lower().split("x"))
+    config = SimConfig(
+        rois=args.rois, rate=args.rate, jitter=args.jitter, payload_jitter=args.payload_jitter,
+        fragment=args.fragment, disconnect_every=args.disconnect_every, refresh_every=args.refresh_every,
+        width=width, height=height, fps=args.fps, video_file=args.video_file, timestamp=args.timestamp,
+        http_port=args.http_port, video_port=args.video_port, thermal_port=args.thermal_port,
+    )
+    farm = SimulatorFarm(args.count, config, args.base_ip).start()
+    print(f"[CameraSimulator] {args.count}대 실행 중: {farm.hosts[0]} ~ {farm.hosts[-1]}")
+    print(f"  영상 URL: http://{{ip}}:{args.video_port}/stream1")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        print(f"[CameraSimulator] {farm.totals()}")
+        farm.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+# frame_reader.py
+# RTSP 영상 수신 스레드. 패킷은 항상 grab() 으로 소비하고, 표시 주기에 맞는 프레임만
+# retrieve() 로 FrameRing 슬롯에 바로 꺼내 둔다. 단일 뷰어와 영상 월(video_wall.py)이 함께 쓴다.
+#
+# 캡처 프로필: FFmpeg 캡처 옵션(전송 방식, 버퍼링, 스트림 분석 크기)과 표시 지연의 묶음.
+# OpenCV 는 FFmpeg 옵션을 OPENCV_FFMPEG_CAPTURE_OPTIONS 환경변수로만 받고 VideoCapture 를 열 때마다 읽으므로,
+# 여는 동안만 프로필 옵션으로 바꿔 둔다 (같은 옵션끼리는 동시에 열고, 다른 옵션은 앞의 열기가 끝날 때까지 대기).
+# 실제 지연은 latency_probe.py 로 카메라 시뮬레이터에 대고 잰다.
+import os
+import time
+from collections import namedtuple
+from threading import Condition, Thread
+
+import cv2
+import numpy as np
+
+import perf_stats
+from frame_ring import FrameRing
+from link_supervisor import LinkSupervisor, CONNECTED
+
+DELAY_SEC = 1
+DISPLAY_FPS = 30       # 화면 갱신 주기, 이보다 촘촘한 프레임은 디코딩(retrieve)하지 않음
+DECODE_SLACK = 0.8     # 프레임 간격 흔들림 허용 (목표 간격의 80% 가 지나면 retrieve)
+READ_FAIL_LIMIT = 100  # 연속 read 실패가 이만큼 쌓이면 끊긴 것으로 판단
+
+# 영상 주소 형식 (카메라 시뮬레이터 사용 시 VIDEO_URL="http://{ip}:554/stream1")
+VIDEO_URL = os.environ.get("VIDEO_URL", "rtsp://{user}:{pw}@{ip}:{port}/stream1")
+
+# options: FFmpeg 옵션 {이름: 값} (None 이면 환경변수 그대로 = FFmpeg 기본 RTSP 버퍼링)
+# decode_threads: FFmpeg 디코더 스레드 수 기본값 (프레임 스레딩은 스레드 수만큼 프레임을 붙잡아 지연이 늘어남)
+CaptureProfile = namedtuple("CaptureProfile", ["delay_sec", "options", "decode_threads"])
+
+CAPTURE_PROFILES = {
+    # 기존 동작: 열화상 측정값이 영상보다 늦게 오는 것을 기다려 overlay 를 맞추는 1초 지연
+    "monitoring": CaptureProfile(DELAY_SEC, None, None),
+    # 같은 LAN 의 카메라: 버퍼링/스트림 분석 최소화, 지연 없이 표시 (overlay 는 직전 측정값)
+    "low-latency": CaptureProfile(0.0, {
+        "rtsp_transport": "udp",
+        "fflags": "nobuffer",
+        "flags": "low_delay",
+        "probesize": "32",
+        "analyzeduration": "0",
+        "max_delay": "0",
+        "reorder_queue_size": "0",
+    }, 1),
+    # 손실/지터가 있는 망: TCP 로 재전송, 순서 바뀐 패킷을 기다리는 여유와 더 긴 지연
+    "lossy-network": CaptureProfile(1.5, {
+        "rtsp_transport": "tcp",
+        "max_delay": "500000",
+        "reorder_queue_size": "64",
+        "buffer_size": "4194304",
+        "timeout": "5000000",
+    }, None),
+}
+CAPTURE_PROFILE = os.environ.get("CAPTURE_PROFILE", "monitoring")
+
+_OPTIONS_ENV = "OPENCV_FFMPEG_CAPTURE_OPTIONS"
+_options_default = os.environ.get(_OPTIONS_ENV)
+_options_cond = Condition()
+_options_state = [_options_default, 0]  # 지금 환경변수 값, 그 값으로 여는 중인 수
+
+
+def capture_profile(name=None):
+    return CAPTURE_PROFILES[name or CAPTURE_PROFILE]
+
+
+def format_options(options):
+    # {"rtsp_transport": "tcp", ...} -> "rtsp_transport;tcp|..." (OPENCV_FFMPEG_CAPTURE_OPTIONS 형식)
+    if options is None:
+        return _options_default
+    return "|".join(f"{k};{v}" for k, v in options.items())
+
+
+def open_with_options(url, options=None, params=()):
+    value = format_options(options)
+    with _options_cond:
+        while _options_state[1] and _options_state[0] != value:
+            _options_cond.wait()
+        if _options_state[0] != value:
+            if value is None:
+                os.environ.pop(_OPTIONS_ENV, None)
+            else:
+                os.environ[_OPTIONS_ENV] = value
+            _options_state[0] = value
+        _options_state[1] += 1
+    try:
+        return cv2.VideoCapture(url, cv2.CAP_FFMPEG, list(params))
+    finally:
+        with _options_cond:
+            _options_state[1] -= 1
+            _options_cond.notify_all()
+
+
+class FrameReader(Thread):
+    # target_fps: 실제로 retrieve 할 최대 프레임 속도 (None 이면 모든 프레임, 녹화용)
+    # decode_threads: FFmpeg 디코더 스레드 수 (None 이면 FFmpeg 기본값 = CPU 코어 수)
+    # open_async: 연결을 생성자가 아닌 수신 스레드에서 (여러 카메라를 열 때 GUI 를 막지 않음)
+    # profile: CaptureProfile (None 이면 CAPTURE_PROFILE). 지연은 delay_sec 로 따로 받는다 (set_delay 로 변경)
+    def __init__(self, url, delay_sec, target_fps=DISPLAY_FPS, decode_threads=None, open_async=False, profile=None):
+        super().__init__(daemon=True)
+        self.url = url
+        self.target_fps = target_fps
+        self.profile = profile or capture_profile()
+        self.decode_threads = decode_threads or self.profile.decode_threads
+        self.open_sec = None  # 마지막 연결에 걸린 시간 (스트림 분석 포함)
+        self.grabbed = 0
+        self.decoded = 0
+        self.paused = False  # True 면 grab 만 하고 retrieve 안 함 (화면에 안 보이는 타일)
+        self.link = LinkSupervisor("Video", byte_rate=False)  # FFmpeg 는 수신 바이트 수를 알려주지 않음
+        self.cap = None if open_async else self.open_capture()
+        # RTSP 는 FPS 를 0 이나 엉뚱한 값으로 알려주는 경우가 많아 초기 슬롯 수 추정에만 사용
+        fps = (self.cap.get(cv2.CAP_PROP_FPS) if self.cap else target_fps) or 30
+        self.frames = FrameRing(delay_sec, min(fps, target_fps or fps))
+        self.frame_time = None  # 마지막으로 꺼낸 프레임의 캡처 시각 (time.time)
+        self.running = True
+
+    def open_capture(self):
+        params = []
+        if self.decode_threads:
+            params = [cv2.CAP_PROP_N_THREADS, self.decode_threads]
+        t0 = time.perf_counter()
+        cap = open_with_options(self.url, self.profile.options, params)
+        self.open_sec = time.perf_counter() - t0
+        if cap.isOpened():
+            self.link.connected()
+        return cap
+
+    def run(self):
+        read_failures = 0
+        shape = None
+        last_decode = 0.0
+        was_paused = False
+        if self.cap is None:
+            self.cap = self.open_capture()
+        while self.running:
+            if not self.cap.isOpened() or read_failures >= READ_FAIL_LIMIT:
+                # 스트림 끊김: 백오프 후 다시 연결
+                self.cap.release()
+                self.frames.clear()
+                read_failures = 0
+                if not self.link.wait_retry():
+                    break
+                self.cap = self.open_capture()
+                continue
+            # grab() 으로 패킷은 항상 소비해서 스트림이 밀리지 않게 하고,
+            # 표시 주기에 맞는 프레임만 retrieve() 로 BGR 변환/복사한다
+            t0 = perf_stats.begin()
+            if not self.cap.grab():
+                read_failures += 1
+                perf_stats.count("video.read_failures")
+                time.sleep(0.01)
+                continue
+            perf_stats.end("video.grab", t0)  # FFmpeg 는 grab 안에서 디코딩 (수신 대기 포함)
+            if not self.running:
+                break
+            now = time.time()
+            read_failures = 0
+            self.grabbed += 1
+            perf_stats.count("video.grabbed")
+            self.link.stats.add(0)
+            if self.paused:
+                # 다시 보일 때 오래된 프레임이 지연 표시되지 않도록 비워 둠
+                if not was_paused:
+                    self.frames.clear()
+                    was_paused = True
+                continue
+            was_paused = False
+            if self.target_fps and now - last_decode < DECODE_SLACK / self.target_fps:
+                continue
+            t0 = perf_stats.begin()
+            if shape is None:
+                slot = buf = None
+                ret, frame = self.cap.retrieve()
+            else:
+                # 풀의 슬롯에 바로 디코딩 (프레임마다 새 배열을 만들지 않음)
+                slot, buf = self.frames.acquire(shape)
+                ret, frame = self.cap.retrieve(buf)
+            perf_stats.end("video.retrieve", t0)
+            if not ret:
+                continue
+            if buf is None or frame.ctypes.data != buf.ctypes.data:
+                # 첫 프레임이거나 해상도가 바뀌어 OpenCV 가 새 배열을 돌려준 경우
+                shape = frame.shape
+                slot, buf = self.frames.acquire(shape)
+                np.copyto(buf, frame)
+            self.frames.commit(slot, now)
+            self.decoded += 1
+            perf_stats.count("video.decoded")
+            last_decode = now
+
+        if self.cap.isOpened():
+            self.cap.release()
+
+    def get_delayed(self):
+        # 지연 시간 이전에 캡처된 프레임 중 가장 최신 것 (풀 버퍼이므로 수정하지 말 것)
+        if not self.running or self.link.state != CONNECTED:
+            return None
+        frame, self.frame_time = self.frames.get_delayed(time.time())
+        return frame
+
+    @property
+    def delay_sec(self):
+        return self.frames.delay_sec
+
+    def set_delay(self, delay_sec):
+        # 표시 지연 변경 (0 이면 가장 최신 프레임). 다른 스레드에서 호출해도 됨
+        self.frames.set_delay(delay_sec)
+
+    def stop(self):
+        self.running = False
+        self.link.stop()
@@ -0,0 +1,241 @@
+# frame_renderer.py
+# 영상 합성(리사이즈, 열화상/알람 상태 시각 맞춤, ROI overlay, QImage 생성)을
+# GUI 스레드 밖에서 처리하는 렌더 스레드.
+# 완성된 프레임은 latest 슬롯의 참조 하나를 통째로 바꿔 넣어 넘긴다.
+# frame_ready 시그널은 "새 프레임 있음" 알림일 뿐이라 GUI 가 밀려도 큐에 쌓이지 않고,
+# GUI 스레드는 latest 를 읽어 그리기만 한다.
+# 표시 경로: 라벨 크기의 재사용 버퍼에 바로 리사이즈/합성하고 QImage 로 감싼다
+# (프레임마다 리사이즈 결과/RGB 복사본을 새로 할당하지 않음, 형식은 DISPLAY_FORMAT 참고).
+# rgb32 형식에서는 QLabel 의 픽스맵이 버퍼를 공유하므로, GUI 가 가져간 프레임의 버퍼는
+# 다음 take() 까지 덮어쓰지 않는다 (DisplayBuffers).
+import threading
+import time
+from collections import namedtuple
+
+import cv2
+import numpy as np
+from PyQt5.QtCore import QThread, pyqtSignal
+from PyQt5.QtGui import QImage
+
+import perf_stats
+from roi_utils import RoiOverlay, draw_rois
+
+DISPLAY_SIZE = (640, 480)
+DISPLAY_BUFFERS = 3  # GUI 가 들고 있는 것 + 아직 안 가져간 최신 + 지금 그리는 것
+# 표시 버퍼 형식
+#   "rgb32" : BGR 작업 버퍼 → cvtColor BGR2BGRA → Format_RGB32 (메모리 순서 B,G,R,X, little-endian)
+#             raster 픽스맵의 기본 형식이라 QPixmap.fromImage 가 복사 없이 버퍼를 공유 (GUI 스레드 ~0 ms)
+#   "bgr888": BGR 버퍼를 Format_BGR888 로 바로 감쌈. 색 변환은 없지만 Qt 5.15 의 BGR888 → 픽스맵 변환이
+#             RGB888 보다 4~5배 느리고 GUI 스레드에서 돌아서 기본값으로 쓰지 않음
+#   "legacy": 새 배열에 리사이즈 + cvtColor RGB 복사 + Format_RGB888 (비교용)
+DISPLAY_FORMAT = "rgb32"
+
+# buffer 는 image 가 가리키는 NumPy 배열 (QImage 가 데이터를 소유하지 않으므로 함께 보관)
+# alarms 는 {roi_idx: ["max"|"min"|"avr"]} 프레임 시각에 켜져 있던 알람
+RenderedFrame = namedtuple("RenderedFrame", [
+    "seq", "image", "buffer", "frame_time", "thermal", "alarms", "render_sec",
+])
+
+
+def fit_size(frame_w, frame_h, box_w, box_h):
+    # 종횡비를 유지하면서 box 안에 들어가는 가장 큰 크기
+    scale = min(box_w / frame_w, box_h / frame_h)
+    return max(1, int(frame_w * scale)), max(1, int(frame_h * scale))
+
+
+def resize_interpolation(src_w, src_h, dst_w, dst_h):
+    # 정확히 1/2 축소만 INTER_AREA (박스 평균, 전용 고속 경로), 나머지는 INTER_LINEAR
+    # (그 외 INTER_AREA 는 1080p → 640x360 에서 LINEAR 의 약 5배 느림)
+    if dst_w * 2 == src_w and dst_h * 2 == src_h:
+        return cv2.INTER_AREA
+    return cv2.INTER_LINEAR
+
+
+class DisplayBuffers:
+    # 표시용 BGR 버퍼 재사용 풀 + 최신 프레임 슬롯.
+    # QImage 는 버퍼를 참조만 하므로 GUI 가 들고 있는 프레임(taken)과 아직 안 가져간 최신 프레임(latest)
+    # 의 버퍼는 건너뛰고 나머지에 그린다. 크기가 바뀔 때만 새로 할당하며, 예전 버퍼는 그것을 가리키는
+    # RenderedFrame 이 사라질 때까지 살아 있다.
+    def __init__(self, count=DISPLAY_BUFFERS):
+        self.count = count
+        self.allocations = 0
+        self.latest = None   # 렌더 스레드가 참조를 통째로 교체
+        self.taken = None    # GUI 스레드가 마지막으로 가져간 프레임 (다음 take 까지 사용 중)
+        self._buffers = []
+        self._work = None    # rgb32 형식의 BGR 작업 버퍼 (렌더 스레드 안에서만 쓰므로 1개)
+        self._lock = threading.Lock()
+
+    def work(self, shape):
+        if self._work is None or self._work.shape != shape:
+            self._work = np.empty(shape, np.uint8)
+            self.allocations += 1
+        return self._work
+
+    def acquire(self, shape):
+        # 렌더 스레드
+        if not self._buffers or self._buffers[0].shape != shape:
+            self._buffers = [np.empty(shape, np.uint8) for _ in range(self.count)]
+            self.allocations += self.count
+        with self._lock:
+            in_use = [f.buffer for f in (self.latest, self.taken) if f is not None]
+            for buf in self._buffers:
+                if not any(buf is other for other in in_use):
+                    return buf
+        raise RuntimeError("[DisplayBuffers] 사용 가능한 버퍼 없음")
+
+    def take(self):
+        # GUI 스레드: 최신 프레임을 가져감 (이전에 가져간 프레임의 버퍼는 이제 재사용 가능)
+        # 새 프레임이 없으면 (clear() 직후 포함) taken 을 유지: 화면의 픽스맵이 아직 그 버퍼를 쓰고 있다
+        with self._lock:
+            if self.latest is None:
+                return None
+            self.taken = self.latest
+            return self.taken
+
+    def clear(self):
+        # 아직 안 가져간 프레임만 버림 (taken 은 GUI 가 화면에 띄운 픽스맵이 버퍼를 공유할 수 있어 유지)
+        self.latest = None
+
+
+def compose_frame(frame, size, rois=(), thermal=None, alarms=(), overlay=None, out=None, work=None):
+    # BGR 프레임 → 표시용 배열 + 그 배열을 가리키는 QImage (ROI/알람/온도 overlay 포함)
+    # out 이 (h, w, 3) 버퍼면 그 자리에 리사이즈하고 Format_BGR888 로 감싼다.
+    # out 이 (h, w, 4) 버퍼면 work (h, w, 3) 에 리사이즈/overlay 후 BGRX 로 변환해 Format_RGB32.
+    # out 이 없으면 예전 경로: 새 배열에 리사이즈 + cvtColor 로 RGB 복사 + Format_RGB888.
+    original_h, original_w = frame.shape[:2]
+    size = tuple(size)
+    if (original_w, original_h) != size:
+        scale_x = size[0] / original_w
+        scale_y = size[1] / original_h
+    else:
+        scale_x = scale_y = 1.0
+    if out is not None:
+        bgr = out if out.shape[2] == 3 else work
+        t0 = perf_stats.begin()
+        if scale_x == 1.0 and scale_y == 1.0:
+            np.copyto(bgr, frame)
+        else:
+            cv2.resize(frame, size, dst=bgr,
+                       interpolation=resize_interpolation(original_w, original_h, *size))
+        perf_stats.end("render.resize", t0)
+        if rois:
+            t0 = perf_stats.begin()
+            draw_rois(bgr, rois, thermal, scale_x, scale_y, overlay, alarms, bgr=True)
+            perf_stats.end("render.rois", t0)
+        h, w, ch = out.shape
+        if ch == 3:
+            return out, QImage(out.data, w, h, ch * w, QImage.Format_BGR888)
+        t0 = perf_stats.begin()
+        cv2.cvtColor(bgr, cv2.COLOR_BGR2BGRA, dst=out)
+        perf_stats.end("render.convert", t0)
+        return out, QImage(out.data, w, h, ch * w, QImage.Format_RGB32)
+
+    t0 = perf_stats.begin()
+    if (scale_x, scale_y) != (1.0, 1.0):
+        frame = cv2.resize(frame, size)
+    perf_stats.end("render.resize", t0)
+    t0 = perf_stats.begin()
+    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    perf_stats.end("render.convert", t0)
+    if rois:
+        t0 = perf_stats.begin()
+        draw_rois(rgb, rois, thermal, scale_x, scale_y, overlay, alarms)
+        perf_stats.end("render.rois", t0)
+
+    h, w, ch = rgb.shape
+    image = QImage(rgb.data, w, h, ch * w, QImage.Format_RGB888)
+    return rgb, image
+
+
+def render_into(buffers, frame, size, display_format, rois, thermal, alarms, overlay):
+    # display_format 에 맞는 버퍼를 buffers 에서 골라 compose_frame
+    w, h = size
+    if display_format == "legacy":
+        return compose_frame(frame, size, rois, thermal, alarms, overlay)
+    if display_format == "bgr888":
+        return compose_frame(frame, size, rois, thermal, alarms, overlay, buffers.acquire((h, w, 3)))
+    return compose_frame(frame, size, rois, thermal, alarms, overlay,
+                         buffers.acquire((h, w, 4)), buffers.work((h, w, 3)))
+
+
+def next_frame_wait(ring, last_time, interval):
+    # 다음 프레임이 지연 시간을 채우는 순간까지 대기 (고정 주기로 돌면 표시 타이머와 맞물려 프레임이 빠짐)
+    next_time = ring.next_time(last_time)
+    if next_time is None:
+        # 아직 캡처되지 않음: 고정 주기로 기다리면 지연 0 일 때 평균 반 주기가 더해지므로 commit 에 맞춰 깨어남
+        ring.wait_newer(last_time, interval)
+        return 0.0 if ring.delay_sec <= 0 else 0.001
+    return min(interval, max(0.001, next_time + ring.delay_sec - time.time()))
+
+
+class FrameRenderer(QThread):
+    frame_ready = pyqtSignal()
+
+    def __init__(self, reader, fps, size=DISPLAY_SIZE, parent=None):
+        super().__init__(parent)
+        self.reader = reader
+        self.interval = 1.0 / fps
+        self.size = size             # 표시 영역 크기 (GUI 가 라벨 크기로 갱신, 종횡비는 유지)
+        self.display_format = DISPLAY_FORMAT
+        self.buffers = DisplayBuffers()
+        self.rois = []               # GUI 스레드가 참조를 통째로 교체
+        self.thermal_store = None    # ThermalStore (없으면 overlay 없이 영상만)
+        self.overlay = RoiOverlay()  # rois 참조나 출력 크기가 바뀔 때만 다시 그려짐
+        self.alarm_engine = None     # alarm_utils.AlarmEngine (프레임 시각의 알람 상태 조회)
+        self.rendered = 0
+        self.running = True
+        self._pending = False        # frame_ready 를 보냈고 GUI 가 아직 안 가져감
+        self._stop_event = threading.Event()
+
+    @property
+    def latest(self):
+        # 가장 최근 RenderedFrame
+        return self.buffers.latest
+
+    def run(self):
+        last_time = None
+        while self.running:
+            frame = self.reader.get_delayed()
+            frame_time = self.reader.frame_time
+            if frame is not None and frame_time != last_time:
+                if perf_stats.STATS.enabled and last_time is not None:
+                    # 디코딩했지만 한 번도 합성하지 않고 지나간 프레임
+                    skipped = self.reader.frames.count_between(last_time, frame_time)
+                    if skipped:
+                        perf_stats.STATS.add("video.dropped", skipped)
+                last_time = frame_time
+                self.buffers.latest = self.render(frame, frame_time)
+                if not self._pending:
+                    self._pending = True
+                    self.frame_ready.emit()
+                else:
+                    perf_stats.count("video.dropped")  # GUI 가 가져가기 전에 다음 프레임으로 덮임
+            self._stop_event.wait(next_frame_wait(self.reader.frames, last_time, self.interval))
+
+    def take(self):
+        # GUI 스레드: 최신 프레임을 가져가고 다음 알림을 허용
+        self._pending = False
+        return self.buffers.take()
+
+    def render(self, frame, frame_time):
+        t0 = time.perf_counter()
+        # 영상은 지연 표시되므로 프레임 캡처 시각에 가장 가까운 열화상 샘플 사용
+        store = self.thermal_store
+        thermal = store.at(frame_time) if store is not None else {}
+        engine = self.alarm_engine
+        alarms = engine.active_fields(frame_time) if engine is not None else {}
+        h, w = frame.shape[:2]
+        size = fit_size(w, h, *self.size)
+        buffer, image = render_into(self.buffers, frame, size, self.display_format,
+                                    self.rois, thermal, alarms, self.overlay)
+        self.rendered += 1
+        elapsed = time.perf_counter() - t0
+        if perf_stats.STATS.enabled:
+            perf_stats.STATS.record("render.frame", elapsed)
+            perf_stats.STATS.add("video.rendered")
+        return RenderedFrame(self.rendered, image, buffer, frame_time, thermal, alarms, elapsed)
+
+    def stop(self):
+        self.running = False
+        self._stop_event.set()
+        self.wait(3000)
@@ -0,0 +1,177 @@
+# frame_ring.py
+# FrameReader 용 재사용 프레임 버퍼 풀.
+# 슬롯마다 캡처 시각을 기록하고, 지연 표시는 "now - delay 보다 오래된 것 중 가장 최신 프레임"
+# 으로 고른다 (카메라가 알려주는 FPS 와 실제 FPS 가 달라도 지연 시간이 유지됨).
+# 읽는 쪽(표시, 녹화)마다 마지막으로 읽어 간 슬롯은 그쪽의 다음 읽기 전까지 덮어쓰지 않는다.
+import math
+import threading
+
+import numpy as np
+
+RING_MARGIN = 1.25       # 지연 구간 대비 여유 슬롯 비율
+MIN_SLOTS = 8            # 지연 0 이어도 읽는 쪽(표시, 녹화, 프리롤) 핀 + 녹화가 밀릴 여유
+MAX_SLOTS = 120          # 1080p 기준 약 750 MB 상한
+
+
+class FrameRing:
+    def __init__(self, delay_sec, fps=30):
+        self.delay_sec = min(delay_sec, max_delay(fps))
+        self.fps = fps                        # 슬롯 수 추정용 예상 FPS
+        self.capacity = slots_for(self.delay_sec, fps)
+        self.pool = None                      # (capacity, h, w, c) uint8
+        self.timestamps = np.full(self.capacity, -np.inf)
+        self.count = 0                        # 누적 기록 프레임 수
+        self.reallocations = 0
+        self._resize_to = None                # set_delay 가 요청한 슬롯 수 (캡처 스레드가 반영)
+        self._next = 0
+        self._pins = {}                       # 읽는 쪽 이름 -> 읽어 간 슬롯
+        self._lock = threading.Lock()
+        self._committed = threading.Condition(self._lock)
+
+    # --- 쓰기 (캡처 스레드) ---
+
+    def acquire(self, shape):
+        # 다음에 채울 슬롯 번호와 버퍼 (필요하면 풀을 새로 할당)
+        if self.pool is None or self.pool.shape[1:] != shape:
+            self._allocate(self.capacity, shape)
+        with self._lock:
+            i = self._next
+            pinned = self._pins.values()
+            while i in pinned:
+                i = (i + 1) % self.capacity
+            self.timestamps[i] = -np.inf     # 채우는 동안은 읽히지 않도록
+        return i, self.pool[i]
+
+    def commit(self, i, timestamp):
+        with self._lock:
+            self.timestamps[i] = timestamp
+            self.count += 1
+            self._next = (i + 1) % self.capacity
+            self._committed.notify_all()
+        self._check_capacity(timestamp)
+
+    def _allocate(self, capacity, shape):
+        with self._lock:
+            self.pool = np.empty((capacity,) + tuple(shape), np.uint8)
+            self.capacity = capacity
+            self.timestamps = np.full(capacity, -np.inf)
+            self._next = 0
+            self._pins = {}
+            self.reallocations += 1
+
+    def set_delay(self, delay_sec):
+        # 지연을 늘리면 필요한 슬롯 수만 기록해 두고, 풀 재할당은 캡처 스레드의 다음 commit 에서
+        # (채우는 중인 슬롯이 있을 수 있어 다른 스레드에서 바꾸지 않음). 줄이면 슬롯은 그대로 둔다.
+        # MAX_SLOTS 로 담을 수 없는 지연은 max_delay 로 줄인다 (그보다 오래된 프레임이 없어 화면이 비므로)
+        with self._lock:
+            valid = self.timestamps[np.isfinite(self.timestamps)]
+            span = valid.max() - valid.min() if len(valid) > 1 else 0
+            fps = (len(valid) - 1) / span if span > 0 else self.fps
+            self.delay_sec = min(delay_sec, max_delay(fps))
+            if self.delay_sec < delay_sec:
+                print(f"[FrameRing] 지연 {delay_sec}s 는 {fps:.1f} fps 에서 담을 수 없어 {self.delay_sec:.2f}s 로 제한")
+            delay_sec = self.delay_sec
+            needed = min(MAX_SLOTS, slots_for(delay_sec, fps))
+            if needed > self.capacity:
+                self._resize_to = needed
+
+    def _check_capacity(self, now):
+        if self._resize_to is not None:
+            capacity, self._resize_to = self._resize_to, None
+            if capacity > self.capacity:
+                print(f"[FrameRing] 지연 {self.delay_sec}s, 슬롯 {self.capacity} -> {capacity}")
+                self._allocate(capacity, self.pool.shape[1:])
+            return
+        # 실제 FPS 가 예상보다 높아 풀 전체가 지연 시간보다 짧은 구간만 담고 있으면 한 번 늘린다
+        if self.count < 2 * self.capacity or self.capacity >= MAX_SLOTS:
+            return
+        # clear() 뒤에는 count 가 그대로라 링이 다시 찰 때까지 (유효 슬롯 capacity 개) 판단하지 않는다
+        valid = self.timestamps[np.isfinite(self.timestamps)]
+        if len(valid) < self.capacity:
+            return
+        span = now - valid.min()
+        if span <= 0 or span >= self.delay_sec:
+            return
+        fps = (len(valid) - 1) / span  # set_delay 와 같이 프레임 간격 수 / 구간
+        if self.delay_sec > max_delay(fps):
+            self.delay_sec = max_delay(fps)
+            print(f"[FrameRing] 실제 {fps:.1f} fps 에서는 지연을 {self.delay_sec:.2f}s 로 제한")
+        needed = min(MAX_SLOTS, slots_for(self.delay_sec, fps))
+        if needed > self.capacity:
+            print(f"[FrameRing] 실제 {fps:.1f} fps, 슬롯 {self.capacity} -> {needed}")
+            self._allocate(needed, self.pool.shape[1:])
+
+    # --- 읽기 (GUI 스레드) ---
+
+    def get_delayed(self, now, owner="display"):
+        # now - delay 시점 이전의 가장 최신 프레임. 반환한 버퍼는 같은 owner 의 다음 호출 전까지 유지된다.
+        with self._lock:
+            ts = self.timestamps
+            cutoff = now - self.delay_sec
+            eligible = np.where(ts <= cutoff, ts, -np.inf)
+            i = int(eligible.argmax())
+            if not np.isfinite(eligible[i]):
+                return None, None
+            self._pins[owner] = i
+            return self.pool[i], float(ts[i])
+
+    def next_after(self, after, owner):
+        # after 이후에 캡처된 프레임 중 가장 오래된 것 (녹화처럼 모든 프레임을 차례로 읽는 쪽).
+        # 읽는 쪽이 늦어 그 사이 덮어쓰인 프레임은 건너뛴다.
+        with self._lock:
+            ts = self.timestamps
+            newer = np.where(ts > (-np.inf if after is None else after), ts, np.inf)
+            i = int(newer.argmin())
+            if not np.isfinite(newer[i]):
+                return None, None
+            self._pins[owner] = i
+            return self.pool[i], float(ts[i])
+
+    def release(self, owner):
+        with self._lock:
+            self._pins.pop(owner, None)
+
+    def next_time(self, after):
+        # after 이후에 캡처된 프레임 중 가장 오래된 것의 시각 (렌더 스레드의 대기 시간 계산용)
+        with self._lock:
+            ts = self.timestamps
+            newer = ts[ts > after] if after is not None else ts[np.isfinite(ts)]
+            return float(newer.min()) if len(newer) else None
+
+    def count_between(self, after, before):
+        # 캡처 시각이 (after, before) 사이인 프레임 수 (링에 남아 있는 것만)
+        with self._lock:
+            ts = self.timestamps
+            return int(np.count_nonzero((ts > after) & (ts < before)))
+
+    def wait_newer(self, after, timeout):
+        # after 이후 프레임이 아직 없으면 다음 commit 까지 (최대 timeout) 대기. 지연 0 표시용
+        with self._committed:
+            ts = self.timestamps
+            if not (ts > (-np.inf if after is None else after)).any():
+                self._committed.wait(timeout)
+
+    def newest(self, owner="display"):
+        with self._lock:
+            i = int(self.timestamps.argmax())
+            if not np.isfinite(self.timestamps[i]):
+                return None, None
+            self._pins[owner] = i
+            return self.pool[i], float(self.timestamps[i])
+
+    def clear(self):
+        with self._lock:
+            # 핀은 그대로 둠 (읽는 쪽이 아직 그 버퍼를 쓰고 있을 수 있음)
+            self.timestamps[:] = -np.inf
+
+    def nbytes(self):
+        return 0 if self.pool is None else self.pool.nbytes
+
+
+def slots_for(delay_sec, fps):
+    return max(MIN_SLOTS, int(math.ceil(delay_sec * fps * RING_MARGIN)) + 2)
+
+
+def max_delay(fps):
+    # MAX_SLOTS 슬롯으로 여유(RING_MARGIN)까지 담을 수 있는 가장 긴 지연 (slots_for 의 역)
+    return (MAX_SLOTS - 2) / (fps * RING_MARGIN)
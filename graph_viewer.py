@@ -1,9 +1,12 @@
 import sys
 import json
+import math
+import os
 import socket
 import threading
 import time
-from collections import deque, defaultdict
+
+import numpy as np
 
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QVBoxLayout, QWidget, QMessageBox, QScrollBar
@@ -11,7 +14,9 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import QTimer, Qt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
-from thermal_receiver import ThermalReceiver
+from thermal_bus import acquire_bus, release_bus
+from link_supervisor import LinkEventBridge, FAILED, MAX_RETRIES
+import perf_stats
 
 TARGET_PORT = 60110
 MAX_SECONDS = 1800
@@ -19,6 +24,47 @@ TEMP_MIN = -30
 TEMP_MAX = 130
 SAMPLING_INTERVAL = 1.0  # seconds
 WINDOW_DURATION = 60  # seconds
+AREA_COUNT = 10
+# 1 이면 선/드래그 영역만 저장해 둔 배경 위에 다시 그림 (blit). 축 범위나 창 크기가 바뀔 때만 전체 그리기
+GRAPH_BLIT = os.environ.get("GRAPH_BLIT", "1") == "1"
+
+
+class GraphHistory:
+    # 그래프 이력: 시각 1줄 + ROI 별 최고 온도 AREA_COUNT 줄을 미리 할당한 float64 링 버퍼에 저장.
+    # thermal_store 와 같은 미러 구조(i, i + capacity 두 곳에 기록)라 길이 capacity 이하 구간은
+    # 복사 없는 view 로 꺼낼 수 있어서, 갱신 비용이 이력 길이가 아니라 창 길이에 비례한다.
+    # 값이 없는 초는 None 대신 NaN (matplotlib 이 끊어서 그림)
+    def __init__(self, capacity=int(MAX_SECONDS / SAMPLING_INTERVAL), areas=AREA_COUNT):
+        self.capacity = capacity
+        self.areas = areas
+        self._time = np.zeros(2 * capacity)
+        self._values = np.full((areas, 2 * capacity), np.nan)
+        self._count = 0  # 누적 기록 수
+
+    def __len__(self):
+        return min(self._count, self.capacity)
+
+    def append(self, t, values):
+        # values: ROI 순서대로 온도 (None = 값 없음), 모자라면 NaN
+        row = [math.nan if v is None else v for v in values]
+        row += [math.nan] * (self.areas - len(row))
+        i = self._count % self.capacity
+        self._time[i] = self._time[i + self.capacity] = t
+        self._values[:, i] = self._values[:, i + self.capacity] = row
+        self._count += 1
+
+    def window(self, start, end):
+        # 보관 중인 이력 (오래된 것부터 0) 의 [start, end) 구간 → (시각 view, (areas, n) 온도 view)
+        n = len(self)
+        start = max(0, min(start, n))
+        end = max(start, min(end, n))
+        base = (self._count - n + start) % self.capacity
+        stop = base + end - start
+        return self._time[base:stop], self._values[:, base:stop]
+
+    def clear(self):
+        self._values.fill(np.nan)
+        self._count = 0
 
 
 class GraphCanvas(FigureCanvas):
@@ -35,15 +81,23 @@ class GraphCanvas(FigureCanvas):
         self.ax.set_title("Real-time Max Temperature per ROI")
 
         self.lines = {}
-        for i in range(10):
+        for i in range(AREA_COUNT):
             line, = self.ax.plot([], [], label=f"area{i}")
             self.lines[i] = line
 
-        self.ax.legend(loc="upper left", bbox_to_anchor=(0, 1))
+        # 범례 틀은 불투명 (blit 때 범례를 저장해 둔 이미지로 덮어쓰므로 뒤의 선이 비치면 안 됨)
+        self.legend = self.ax.legend(loc="upper left", bbox_to_anchor=(0, 1), framealpha=1.0)
         self.ax.grid(True)
 
-        self.data = defaultdict(lambda: deque(maxlen=int(MAX_SECONDS / SAMPLING_INTERVAL)))
-        self.time = deque(maxlen=int(MAX_SECONDS / SAMPLING_INTERVAL))
+        # blit: 마지막 전체 그리기에서 선/범례/드래그 영역을 뺀 축 배경, 그때의 (xlim, ylim, 크기),
+        # 범례 이미지 (범례는 글자 배치 때문에 다시 그리면 선 10개보다 훨씬 느림)
+        self.use_blit = False
+        self._background = None
+        self._background_key = None
+        self._legend_image = None
+        self.set_blit(GRAPH_BLIT)
+
+        self.history = GraphHistory()
 
         self.view_start = 0
         self.auto_follow = True
@@ -58,6 +112,48 @@ class GraphCanvas(FigureCanvas):
         self.mpl_connect("button_press_event", self.on_press)
         self.mpl_connect("motion_notify_event", self.on_motion)
         self.mpl_connect("button_release_event", self.on_release)
+        self.mpl_connect("draw_event", self.on_draw)
+
+    def set_blit(self, on):
+        self.use_blit = on and self.supports_blit
+        for line in self.lines.values():
+            line.set_animated(self.use_blit)
+        self.legend.set_animated(self.use_blit)
+        self._background = None
+        self.draw_idle()
+
+    def _view_key(self):
+        return self.ax.get_xlim(), self.ax.get_ylim(), self.get_width_height()
+
+    def _draw_animated(self):
+        # 전체 그리기와 같은 순서 (드래그 영역 zorder 1 < 선 2)
+        if self._highlight is not None:
+            self.ax.draw_artist(self._highlight)
+        for line in self.lines.values():
+            self.ax.draw_artist(line)
+
+    def on_draw(self, event):
+        # 전체 그리기 직후: 배경을 저장하고 animated artist 를 그 위에 그린 뒤 범례 이미지를 저장
+        if not self.use_blit:
+            return
+        self._background = self.copy_from_bbox(self.ax.bbox)
+        self._background_key = self._view_key()
+        self._draw_animated()
+        self.ax.draw_artist(self.legend)
+        self._legend_image = self.copy_from_bbox(self.legend.get_window_extent())
+
+    def refresh(self):
+        # 배경이 있고 축 범위/크기가 그대로면 배경 복원 + 선/드래그 영역만 그려서 축 영역만 갱신
+        t0 = perf_stats.begin()
+        if not self.use_blit or self._background is None or self._background_key != self._view_key():
+            self.draw()
+            perf_stats.end("graph.draw", t0)
+            return
+        self.restore_region(self._background)
+        self._draw_animated()
+        self.restore_region(self._legend_image)
+        self.blit(self.ax.bbox)
+        perf_stats.end("graph.blit", t0)
 
     def set_view_start(self, value):
         if self.scrollbar and value == self.scrollbar.maximum():
@@ -67,7 +163,7 @@ class GraphCanvas(FigureCanvas):
         self.view_start = value
 
     def update_plot(self):
-        current_time = len(self.time)
+        current_time = len(self.history)
         points_per_window = int(WINDOW_DURATION / SAMPLING_INTERVAL)
         if current_time <= points_per_window:
             window_start = 0
@@ -78,18 +174,15 @@ class GraphCanvas(FigureCanvas):
             window_start = self.view_start
             window_end = min(self.view_start + points_per_window, current_time)
 
-        for i in range(10):
-            full_y_data = list(self.data[i])
-            full_x_data = list(self.time)
-            y_data = full_y_data[window_start:window_end]
-            x_data = full_x_data[window_start:window_end]
-            self.lines[i].set_data(x_data, y_data)
+        x_data, y_data = self.history.window(window_start, window_end)
+        for i in range(AREA_COUNT):
+            self.lines[i].set_data(x_data, y_data[i])
 
-        if x_data:
+        if len(x_data):
             self.ax.set_xlim(x_data[0], x_data[-1])
         else:
             self.ax.set_xlim(0, WINDOW_DURATION)
-        self.draw()
+        self.refresh()
 
     def on_press(self, event):
         if event.dblclick and event.inaxes == self.ax:
@@ -105,19 +198,23 @@ class GraphCanvas(FigureCanvas):
             x1, x2 = sorted([self._drag_start, self._drag_end])
             if self._highlight:
                 self._highlight.remove()
-            self._highlight = self.ax.axvspan(x1, x2, color='gray', alpha=0.3)
-            self.draw()
+            self._highlight = self.ax.axvspan(x1, x2, color='gray', alpha=0.3, animated=self.use_blit)
+            self.refresh()
 
     def on_release(self, event):
+        redraw = False
         if self._highlight:
             self._highlight.remove()
             self._highlight = None
+            redraw = True  # 확대하지 않아도 드래그 영역은 지움
         if self._dragging and self._drag_start is not None and self._drag_end is not None:
             x1, x2 = sorted([self._drag_start, self._drag_end])
             if abs(x2 - x1) >= 1:
                 self.ax.set_xlim(x1, x2)
                 self.auto_follow = False
-                self.draw()
+                redraw = True
+        if redraw:
+            self.refresh()
         self._dragging = False
         self._drag_start = None
         self._drag_end = None
@@ -145,9 +242,12 @@ class GraphWindow(QMainWindow):
         container.setLayout(layout)
         self.setCentralWidget(container)
 
-        self.thermal_data = {}
-        self.receiver = ThermalReceiver(ip_address, TARGET_PORT, self.thermal_data)
-        self.receiver.start()
+        # 뷰어가 이미 연결 중이면 같은 열화상 연결을 공유
+        self.bus = acquire_bus(ip_address, TARGET_PORT)
+        self.thermal_data = self.bus.data_store
+        self.link_events = LinkEventBridge()
+        self.link_events.state_changed.connect(self.on_link_state)
+        self.link_events.attach(self.bus.link)
 
         self.start_time = time.time()
         self.timer = QTimer()
@@ -159,12 +259,10 @@ class GraphWindow(QMainWindow):
 
     def refresh_graph(self):
         t = round(time.time() - self.start_time, 1)
-        self.canvas.time.append(t)
-        for i in range(10):
-            max_temp = self.thermal_data.get(i, {}).get("max")
-            self.canvas.data[i].append(max_temp if max_temp is not None else None)
+        samples = [self.thermal_data.get(i) for i in range(AREA_COUNT)]
+        self.canvas.history.append(t, [sample.max if sample else None for sample in samples])
 
-        current_point = len(self.canvas.time)
+        current_point = len(self.canvas.history)
         points_per_window = int(WINDOW_DURATION / SAMPLING_INTERVAL)
         if current_point > points_per_window:
             self.scrollbar.setMaximum(max(0, current_point - points_per_window))
@@ -176,12 +274,19 @@ class GraphWindow(QMainWindow):
 
         self.canvas.update_plot()
 
+    def on_link_state(self, name, state):
+        if state == FAILED and self.bus and self.bus.link.state == FAILED:
+            self.show_disconnected_alert()
+
     def show_disconnected_alert(self):
-        QMessageBox.critical(self, "연결 끊기면", "장비와의 연결이 끊기였습니다. 3회 재시도 실패")
+        QMessageBox.critical(self, "연결 끊기면", f"장비와의 연결이 끊기였습니다. {MAX_RETRIES}회 재시도 실패")
 
     def closeEvent(self, event):
-        if self.receiver:
-            self.receiver.stop()
+        if self.bus:
+            self.timer.stop()
+            self.link_events.detach(self.bus.link)
+            release_bus(self.bus)
+            self.bus = None
         super().closeEvent(event)
 
 
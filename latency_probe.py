@@ -0,0 +1,146 @@
+# latency_probe.py
+# 캡처 프로필별 실제 영상 지연 측정.
+# 카메라 시뮬레이터(SimConfig(timestamp=True))가 프레임을 보내는 순간의 time.time() 을 화면 위쪽에
+# 흑백 블록 바코드로 찍어 보내고, 수신 쪽에서 표시 직전 프레임의 바코드를 읽어 구간별 지연을 잰다.
+#   capture: 보낸 시각 → FrameReader 가 grab 한 시각 (네트워크 + FFmpeg 버퍼링/디코딩)
+#   display: 보낸 시각 → 표시용 합성이 끝난 시각 (capture + 표시 지연 + 렌더 대기/합성)
+# GUI 가 픽스맵을 그리는 시간(bench_gui_frame.py 기준 0.1 ms 미만)은 빠져 있다.
+#
+#   python latency_probe.py [--profiles monitoring low-latency lossy-network] [--seconds 10] [--delay 0.2]
+import argparse
+import os
+import time
+from threading import Event, Thread
+
+import numpy as np
+
+from frame_renderer import DISPLAY_FORMAT, DISPLAY_SIZE, DisplayBuffers, fit_size, next_frame_wait, render_into
+
+STAMP_BITS = 48          # time.time() 밀리초 (2^48 ms = 약 8900년)
+STAMP_BLOCK = 8          # 블록 한 변 (JPEG 8x8 블록에 맞춰 압축에도 깨지지 않게)
+STAMP_MAX_SKEW = 60.0    # 읽은 시각이 지금과 이보다 멀면 바코드가 없거나 깨진 것으로 봄
+
+
+def stamp_frame(frame, t):
+    # 맨 위 STAMP_BLOCK 줄에 t (초) 를 밀리초 단위 비트열로 그림 (흰색 = 1, 왼쪽이 최상위 비트)
+    value = int(t * 1000)
+    row = frame[:STAMP_BLOCK, :STAMP_BITS * STAMP_BLOCK]
+    for bit in range(STAMP_BITS):
+        on = (value >> (STAMP_BITS - 1 - bit)) & 1
+        row[:, bit * STAMP_BLOCK:(bit + 1) * STAMP_BLOCK] = 255 if on else 0
+    return frame
+
+
+def read_stamp(frame, now=None):
+    # stamp_frame 으로 찍은 시각 (초), 없으면 None. 블록 가운데 픽셀만 읽는다
+    if frame.shape[0] < STAMP_BLOCK or frame.shape[1] < STAMP_BITS * STAMP_BLOCK:
+        return None
+    centers = frame[STAMP_BLOCK // 2, STAMP_BLOCK // 2:STAMP_BITS * STAMP_BLOCK:STAMP_BLOCK]
+    bits = (centers.reshape(STAMP_BITS, -1).mean(axis=1) >= 128).astype(np.int64)
+    t = int(bits @ (1 << np.arange(STAMP_BITS - 1, -1, -1, dtype=np.int64))) / 1000
+    if abs((time.time() if now is None else now) - t) > STAMP_MAX_SKEW:
+        return None
+    return t
+
+
+class LatencyProbe(Thread):
+    # FrameRenderer 와 같은 방식(지연 프레임이 준비되는 순간 깨어나 합성)으로 표시 경로를 흉내내며 지연을 기록
+    def __init__(self, reader, fps=30, size=DISPLAY_SIZE):
+        super().__init__(name="LatencyProbe", daemon=True)
+        self.reader = reader
+        self.interval = 1.0 / fps
+        self.size = size
+        self.buffers = DisplayBuffers()
+        self.capture = []        # grab 시각 - 보낸 시각
+        self.display = []        # 합성 완료 시각 - 보낸 시각
+        self.missing = 0         # 바코드를 읽지 못한 프레임 수
+        self._stop_event = Event()
+
+    def run(self):
+        last_time = None
+        while not self._stop_event.is_set():
+            frame = self.reader.get_delayed()
+            frame_time = self.reader.frame_time
+            if frame is not None and frame_time != last_time:
+                last_time = frame_time
+                sent = read_stamp(frame)
+                size = fit_size(frame.shape[1], frame.shape[0], *self.size)
+                render_into(self.buffers, frame, size, DISPLAY_FORMAT, (), None, (), None)
+                shown = time.time()
+                if sent is None:
+                    self.missing += 1
+                else:
+                    self.capture.append(frame_time - sent)
+                    self.display.append(shown - sent)
+            self._stop_event.wait(next_frame_wait(self.reader.frames, last_time, self.interval))
+
+    def reset(self):
+        self.capture, self.display, self.missing = [], [], 0
+
+    def summary(self):
+        # {"capture": (p50, p95, p99, jitter), "display": ...} 밀리초. jitter 는 표준편차
+        result = {}
+        for name in ("capture", "display"):
+            v = np.array(getattr(self, name)) * 1000
+            if len(v):
+                result[name] = (*np.percentile(v, [50, 95, 99]), float(v.std()))
+            else:
+                result[name] = (float("nan"),) * 4
+        return result
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def run_profile(url, name, delay_sec, seconds, warmup):
+    from frame_reader import FrameReader, capture_profile
+
+    profile = capture_profile(name)
+    reader = FrameReader(url, profile.delay_sec if delay_sec is None else delay_sec, profile=profile)
+    reader.start()
+    probe = LatencyProbe(reader)
+    probe.start()
+    time.sleep(warmup + reader.delay_sec)
+    probe.reset()
+    decoded0, t0 = reader.decoded, time.perf_counter()
+    time.sleep(seconds)
+    fps = (reader.decoded - decoded0) / (time.perf_counter() - t0)
+    probe.stop()
+    reader.stop()
+    reader.join()
+    return reader, probe, fps
+
+
+def main():
+    from camera_simulator import SimConfig, SimulatorFarm
+    from frame_reader import CAPTURE_PROFILES
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--profiles", nargs="+", default=list(CAPTURE_PROFILES), choices=list(CAPTURE_PROFILES))
+    parser.add_argument("--delay", type=float, default=None, help="프로필 지연 대신 사용할 표시 지연 (초)")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--warmup", type=float, default=2)
+    parser.add_argument("--size", default="1280x720")
+    parser.add_argument("--fps", type=float, default=30)
+    args = parser.parse_args()
+    width, height = (int(v) for v in args.size.split("x"))
+
+    # 시뮬레이터는 HTTP MJPEG 이라 RTSP 전용 옵션(rtsp_transport, reorder_queue_size)은 영향이 없다
+    farm = SimulatorFarm(1, SimConfig(width=width, height=height, fps=args.fps, timestamp=True)).start()
+    url = os.environ.get("VIDEO_URL", "http://{ip}:554/stream1").format(
+        user="admin", pw="admin", ip=farm.hosts[0], port=554)
+    print(f"[LatencyProbe] {url} {width}x{height} @ {args.fps:g} fps, {args.seconds:g}s/profile, ms")
+    print(f"{'profile':<14} {'delay':>5} {'open':>6} {'fps':>5}  "
+          f"{'capture p50/p95/p99 (jitter)':>30}  {'display p50/p95/p99 (jitter)':>32}  miss")
+    for name in args.profiles:
+        reader, probe, fps = run_profile(url, name, args.delay, args.seconds, args.warmup)
+        s = probe.summary()
+        cells = ["{:6.1f}/{:6.1f}/{:6.1f} ({:5.1f})".format(*s[k]) for k in ("capture", "display")]
+        print(f"{name:<14} {reader.delay_sec:5.2f} {reader.open_sec * 1000:6.0f} {fps:5.1f}  "
+              f"{cells[0]:>30}  {cells[1]:>32}  {probe.missing}")
+    farm.stop()
+
+
+if __name__ == "__main__":
+    main()
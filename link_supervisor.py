@@ -0,0 +1,163 @@
+# link_supervisor.py
+# 열화상 TCP / RTSP 링크 공용 재연결 정책(지터 지수 백오프 + 재시도 한도)과 상태/통계
+import random
+import threading
+import time
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+# 링크 상태
+CONNECTING = "connecting"
+CONNECTED = "connected"
+RECONNECTING = "reconnecting"
+FAILED = "failed"
+STOPPED = "stopped"
+
+MAX_RETRIES = 3          # 한 번의 끊김에 대해 허용하는 재연결 시도 횟수
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 30.0
+
+
+class Backoff:
+    def __init__(self, base=BACKOFF_BASE, factor=2.0, max_delay=BACKOFF_MAX, jitter=0.5):
+        self.base = base
+        self.factor = factor
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.attempt = 0
+
+    def next_delay(self):
+        delay = min(self.max_delay, self.base * (self.factor ** self.attempt))
+        self.attempt += 1
+        # 여러 카메라가 동시에 재부팅돼도 재연결이 몰리지 않도록 ±jitter 비율로 흔든다
+        return delay * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def reset(self):
+        self.attempt = 0
+
+
+class LinkStats:
+    def __init__(self):
+        self.connects = 0
+        self.reconnects = 0
+        self.bytes_total = 0
+        self.messages_total = 0
+        self.last_sample_time = None
+        self._window = (time.monotonic(), 0, 0)   # 속도 구간 시작 (시각, 바이트, 메시지)
+        self._rates = (0.0, 0.0)                   # 마지막으로 끝난 구간의 (bytes/s, messages/s)
+
+    def add(self, nbytes, messages=1):
+        self.bytes_total += nbytes
+        if messages:
+            self.messages_total += messages
+            self.last_sample_time = time.monotonic()
+
+    def advance(self):
+        # 속도 구간을 끝내고 새로 시작 (UI 의 주기 타이머에서만 호출해 구간 길이를 일정하게)
+        now = time.monotonic()
+        t0, b0, m0 = self._window
+        b, m = self.bytes_total, self.messages_total
+        dt = max(now - t0, 1e-6)
+        self._window = (now, b, m)
+        self._rates = ((b - b0) / dt, (m - m0) / dt)
+
+    def snapshot(self):
+        # 마지막으로 끝난 구간의 평균 속도 (부작용 없음, 상태 변경 때 불려도 구간에 영향 없음)
+        now = time.monotonic()
+        since = None if self.last_sample_time is None else now - self.last_sample_time
+        bytes_per_sec, messages_per_sec = self._rates
+        return {
+            "reconnects": self.reconnects,
+            "bytes_per_sec": bytes_per_sec,
+            "messages_per_sec": messages_per_sec,
+            "since_last_sample": since,
+        }
+
+
+class LinkSupervisor:
+    def __init__(self, name, max_retries=MAX_RETRIES, backoff=None, byte_rate=True):
+        self.name = name
+        self.byte_rate = byte_rate  # False 면 수신 바이트를 셀 수 없는 링크 (표시에서 KB/s 생략)
+        self.max_retries = max_retries
+        self.backoff = backoff or Backoff()
+        self.stats = LinkStats()
+        self.state = CONNECTING
+        self.retries = 0
+        self._listeners = ()
+        self._stop_event = threading.Event()
+
+    def add_state_listener(self, fn):
+        # fn(name, state) 는 링크 스레드에서 호출된다
+        self._listeners = self._listeners + (fn,)
+
+    def remove_state_listener(self, fn):
+        self._listeners = tuple(f for f in self._listeners if f != fn)
+
+    def set_state(self, state):
+        if state == self.state:
+            return
+        self.state = state
+        for fn in self._listeners:
+            try:
+                fn(self.name, state)
+            except Exception as e:
+                print(f"[LinkSupervisor] {self.name} 상태 리스너 오류: {e}")
+
+    def connected(self):
+        if self.stats.connects:
+            self.stats.reconnects += 1
+        self.stats.connects += 1
+        self.retries = 0
+        self.backoff.reset()
+        self.set_state(CONNECTED)
+
+    def next_retry_delay(self):
+        # 재시도 한도 안이면 대기 시간을, 소진했으면 None 을 반환
+        if self._stop_event.is_set():
+            return None
+        if self.retries >= self.max_retries:
+            self.set_state(FAILED)
+            return None
+        self.retries += 1
+        self.set_state(RECONNECTING)
+        return self.backoff.next_delay()
+
+    def wait_retry(self):
+        # 블로킹 수신 스레드용. 재시도해야 하면 True
+        delay = self.next_retry_delay()
+        if delay is None:
+            return False
+        print(f"[{self.name}] {delay:.1f}초 후 재연결 ({self.retries}/{self.max_retries})")
+        return not self._stop_event.wait(delay)
+
+    def stop(self):
+        self._stop_event.set()
+        self.set_state(STOPPED)
+
+    @property
+    def stopped(self):
+        return self._stop_event.is_set()
+
+
+# 링크 스레드의 상태 이벤트를 Qt GUI 스레드로 넘기는 브리지
+class LinkEventBridge(QObject):
+    state_changed = pyqtSignal(str, str)
+
+    def attach(self, link):
+        link.add_state_listener(self._on_state)
+
+    def detach(self, link):
+        link.remove_state_listener(self._on_state)
+
+    def _on_state(self, name, state):
+        self.state_changed.emit(name, state)
+
+
+def format_link(link):
+    s = link.stats.snapshot()
+    since = s["since_last_sample"]
+    since_text = "-" if since is None else f"{since:.1f}s"
+    rate = f"{s['messages_per_sec']:.1f}/s"
+    if link.byte_rate:
+        rate += f" {s['bytes_per_sec'] / 1024:.1f}KB/s"
+    return f"{link.name}: {link.state} | {rate} | last {since_text} | reconnects {s['reconnects']}"
@@ -1,18 +1,25 @@
 from PyQt5.QtWidgets import (
     QMainWindow, QLabel, QLineEdit, QPushButton,
-    QVBoxLayout, QHBoxLayout, QWidget, QGridLayout, QMessageBox
+    QVBoxLayout, QHBoxLayout, QWidget, QGridLayout, QMessageBox, QSizePolicy,
+    QComboBox, QDoubleSpinBox
 )
-from PyQt5.QtGui import QImage, QPixmap, QColor
+from PyQt5.QtGui import QPixmap, QColor
 from PyQt5.QtCore import QTimer
-import cv2
-from collections import deque
-from threading import Thread
 import time
 import os
 import sys
-from roi_utils import fetch_all_rois, draw_rois
-from thermal_receiver import ThermalReceiver
-from alarm_utils import fetch_alarm_conditions  # 🔔 알람 조건 가져오기
+import perf_stats
+from roi_utils import fetch_all_rois
+from thermal_bus import acquire_bus, release_bus
+from link_supervisor import LinkEventBridge, FAILED, MAX_RETRIES, format_link
+from alarm_utils import AlarmEngine
+from roi_refresh import RoiRefreshWorker
+from roi_table import RoiTableModel, format_temp, make_roi_table
+from frame_reader import FrameReader, CAPTURE_PROFILE, CAPTURE_PROFILES, DISPLAY_FPS, VIDEO_URL
+from frame_renderer import FrameRenderer
+from frame_ring import max_delay
+from segment_recorder import SegmentRecorder
+from alarm_clips import ALARM_CLIPS, ClipCapture
 from PyQt5 import uic
 from ip_selector_popup import IPSelectorPopup
 from graph_viewer import GraphWindow
@@ -24,7 +31,6 @@ from Camera_Control.nuc import NUCControlPopup
 from Camera_Control.nuc import NUCControlPopup
 
 
-DELAY_SEC = 1
 DEFAULT_IP   = "192.168.0.56"
 DEFAULT_PORT = "554"
 THERMAL_PORT = 60110
@@ -36,41 +42,6 @@ def resource_path(relative_path):
         base_path = os.path.abspath(".")
     return os.path.join(base_path, relative_path)
 
-class FrameReader(Thread):
-    def __init__(self, url, delay_sec):
-        super().__init__(daemon=True)
-        self.url = url
-        self.cap = cv2.VideoCapture(url, cv2.CAP_FFMPEG)
-        fps = self.cap.get(cv2.CAP_PROP_FPS) or 30
-        self.delay_frames = int(delay_sec * fps)
-        self.frames = deque(maxlen=self.delay_frames + 1)
-        self.running = True
-
-    def run(self):
-        while self.running:
-            if not self.cap.isOpened():
-                break
-            ret, frame = self.cap.read()
-            if not self.running:
-                break
-            if ret:
-                self.frames.append(frame)
-            else:
-                time.sleep(0.01)
-
-        if self.cap.isOpened():
-            self.cap.release()
-
-    def get_delayed(self):
-        if not self.running or not self.cap.isOpened():
-            return None
-        if len(self.frames) == self.frames.maxlen:
-            return self.frames[0]
-        return None
-
-    def stop(self):
-        self.running = False
-
 
 class OpenCVViewer(QMainWindow):
     def __init__(self):
@@ -78,14 +49,45 @@ class OpenCVViewer(QMainWindow):
         uic.loadUi(resource_path("viewer.ui"), self)
 
         self.reader = None
-        self.receiver = None
+        self.renderer = None
+        self.shown_seq = 0
+        self.bus = None
+        self.alarm_sub = None
         self.thermal_data = {}
         self.rois = []
         self.roi_alarm_config = []  # 🔔 알람 조건 저장용
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_frame)
-        self.roi_label_matrix = []
+        self.alarm_engine = AlarmEngine()
+        self.alarm_engine.add_listener(self.on_alarm_transitions)
+        self.roi_refresher = None
         self.graph_window = None
+        self.recorder = None
+        self.clip_capture = None
+
+        # 링크 상태/통계 (상태바)
+        self.link_events = LinkEventBridge()
+        self.link_events.state_changed.connect(self.on_link_state)
+        self.link_label = QLabel()
+        self.statusbar.addPermanentWidget(self.link_label)
+
+        # 단계별 성능 계측 overlay (perf_stats, 끄면 계측 비용 거의 없음) / 누적 통계 파일로 저장
+        self.perf_label = QLabel()
+        self.perf_button = QPushButton("Perf")
+        self.perf_button.setCheckable(True)
+        self.perf_button.setFlat(True)
+        self.perf_button.toggled.connect(self.toggle_perf)
+        self.perf_save_button = QPushButton("Save")
+        self.perf_save_button.setFlat(True)
+        self.perf_save_button.setToolTip(f"성능 통계를 {perf_stats.PERF_DIR} 에 JSON 으로 저장")
+        self.perf_save_button.clicked.connect(self.save_perf)
+        self.statusbar.addPermanentWidget(self.perf_label)
+        self.statusbar.addPermanentWidget(self.perf_button)
+        self.statusbar.addPermanentWidget(self.perf_save_button)
+        self.perf_counters = {}
+        self.perf_time = time.monotonic()
+        self.toggle_perf(perf_stats.STATS.enabled)
+        self.perf_button.setChecked(perf_stats.STATS.enabled)
+        self.stats_timer = QTimer()
+        self.stats_timer.timeout.connect(self.on_stats_timer)
 
         self.start_button.clicked.connect(self.start_stream)
         self.stop_button.clicked.connect(self.stop_stream)
@@ -98,23 +100,37 @@ class OpenCVViewer(QMainWindow):
         self.actionNUC.triggered.connect(self.open_nuc_control_popup)
         self.nuc_button.clicked.connect(self.handle_nuc_once)
 
+        # 연속 녹화 (영상 세그먼트 + 열화상 측정값, segment_recorder.RECORD_DIR)
+        self.record_button = QPushButton("Record")
+        self.record_button.setCheckable(True)
+        self.record_button.toggled.connect(self.toggle_recording)
+        self.widget_2.layout().addWidget(self.record_button)
+
+        # 캡처 프로필 (연결 전에 선택) / 표시 지연 (스트리밍 중에도 바로 반영)
+        self.profile_combo = QComboBox()
+        self.profile_combo.addItems(list(CAPTURE_PROFILES))
+        self.profile_combo.setToolTip("캡처 프로필 (FFmpeg 캡처 옵션, 기본 표시 지연)")
+        self.delay_spin = QDoubleSpinBox()
+        self.delay_spin.setRange(0.0, int(max_delay(DISPLAY_FPS) * 10) / 10)  # 프레임 링이 담을 수 있는 지연까지
+        self.delay_spin.setSingleStep(0.1)
+        self.delay_spin.setSuffix(" s")
+        self.delay_spin.setToolTip("표시 지연 (0 이면 최신 프레임, overlay 는 직전 열화상 측정값)")
+        self.profile_combo.currentTextChanged.connect(self.on_profile_changed)
+        self.delay_spin.valueChanged.connect(self.on_delay_changed)
+        self.profile_combo.setCurrentText(CAPTURE_PROFILE)
+        self.on_profile_changed(self.profile_combo.currentText())
+        self.widget_2.layout().addWidget(self.profile_combo)
+        self.widget_2.layout().addWidget(self.delay_spin)
+
         self.update_button_states(False)
 
-        grid_layout = self.roi_grid.layout()
-        grid_layout.addWidget(QLabel("영역"), 0, 0)
-        grid_layout.addWidget(QLabel("Max"), 0, 1)
-        grid_layout.addWidget(QLabel("Min"), 0, 2)
-        grid_layout.addWidget(QLabel("Avg"), 0, 3)
-
-        for i in range(10):
-            max_lbl = QLabel("-")
-            min_lbl = QLabel("-")
-            avr_lbl = QLabel("-")
-            grid_layout.addWidget(QLabel(f"ROI{i}"), i + 1, 0)
-            grid_layout.addWidget(max_lbl, i + 1, 1)
-            grid_layout.addWidget(min_lbl, i + 1, 2)
-            grid_layout.addWidget(avr_lbl, i + 1, 3)
-            self.roi_label_matrix.append({"max": max_lbl, "min": min_lbl, "avr": avr_lbl})
+        # 영상은 라벨 크기에 맞춰 합성하므로 픽스맵 크기가 라벨(창)을 키우지 않게 함
+        self.video_label.setSizePolicy(QSizePolicy.Ignored, QSizePolicy.Ignored)
+
+        # ROI 온도 표 (바뀐 셀만 주기적으로 다시 그림)
+        self.roi_model = RoiTableModel(parent=self)
+        self.roi_table = make_roi_table(self.roi_model, self.roi_grid)
+        self.roi_grid.layout().addWidget(self.roi_table, 0, 0)
 
     def handle_nuc_once(self):
         pass # TODO: NUC 즉시 실행 기능 추후 구현
@@ -185,17 +201,19 @@ class OpenCVViewer(QMainWindow):
         self.ip_input.setEnabled(not connected)
         self.id_input.setEnabled(not connected)
         self.pw_input.setEnabled(not connected)
+        self.profile_combo.setEnabled(not connected)
 
         self.stop_button.setEnabled(connected)
         self.time_plot_button.setEnabled(connected)
         self.nuc_button.setEnabled(connected)
+        self.record_button.setEnabled(connected)
 
         disabled_style = "background-color: lightgray; color: gray;"
         enabled_style = ""
 
         for widget in [self.start_button, self.search_button, self.ip_input, self.id_input, self.pw_input]:
             widget.setStyleSheet(enabled_style if widget.isEnabled() else disabled_style)
-        for widget in [self.stop_button, self.time_plot_button, self.nuc_button]:
+        for widget in [self.stop_button, self.time_plot_button, self.nuc_button, self.record_button]:
             widget.setStyleSheet(enabled_style if widget.isEnabled() else disabled_style)
 
     def open_ip_selector(self):
@@ -206,11 +224,19 @@ class OpenCVViewer(QMainWindow):
                 self.ip_input.setText(selected_ip)
 
     def refresh_rois(self):
-        ip = self.ip_input.text().strip()
-        user_id = self.id_input.text().strip()
-        user_pw = self.pw_input.text().strip()
-        self.rois = fetch_all_rois(ip, user_id, user_pw)
-        self.roi_alarm_config = fetch_alarm_conditions(ip, user_id, user_pw)  # 🔔 ROI 갱신 시 알람 조건도 다시 가져옴
+        # 열화상 수신 스레드에서 호출됨: 요청만 넘기고 바로 반환
+        if self.roi_refresher:
+            self.roi_refresher.request()
+
+    def on_rois_refreshed(self, rois):
+        # GUI 스레드에서 새 설정으로 참조를 한 번에 교체
+        self.rois = rois
+        self.roi_alarm_config = rois  # 🔔 알람 조건은 ROI 설정에 포함되어 있음
+        self.alarm_engine.configure(rois, time.time())
+        if self.renderer:
+            self.renderer.rois = rois
+        if self.clip_capture:
+            self.clip_capture.rois = rois
         print("[OpenCVViewer] ROI 갱신됨")
 
     def start_stream(self):
@@ -220,111 +246,201 @@ class OpenCVViewer(QMainWindow):
         user_id = self.id_input.text().strip()
         user_pw = self.pw_input.text().strip()
 
-        self.rois = fetch_all_rois(ip, user_id, user_pw)
-        self.roi_alarm_config = fetch_alarm_conditions(ip, user_id, user_pw)
-        if self.rois is None:
+        rois = fetch_all_rois(ip, user_id, user_pw)
+        if rois is None:
             QMessageBox.warning(self, "로그인 실패", "ID 또는 비밀번호가 올바르지 않습니다.")
             return
 
-        rtsp_url = f"rtsp://{user_id}:{user_pw}@{ip}:{port}/stream1"
+        rtsp_url = VIDEO_URL.format(user=user_id, pw=user_pw, ip=ip, port=port)
 
         self.stop_stream()
+        self.on_rois_refreshed(rois)
+
+        self.roi_refresher = RoiRefreshWorker(ip, user_id, user_pw, self)
+        self.roi_refresher.rois_ready.connect(self.on_rois_refreshed)
+        self.roi_refresher.start()
 
         self.video_label.setText("연결중...")
         self.video_label.repaint()
 
-        self.reader = FrameReader(rtsp_url, DELAY_SEC)
+        profile = CAPTURE_PROFILES[self.profile_combo.currentText()]
+        self.reader = FrameReader(rtsp_url, self.delay_spin.value(), profile=profile)
         self.reader.start()
-        self.timer.start(33)
-
-        self.receiver = ThermalReceiver(ip, THERMAL_PORT, self.thermal_data, self.refresh_rois, self.roi_alarm_config)  # 🔔 알람 조건 전달
-        self.receiver.start()
+        self.renderer = FrameRenderer(self.reader, DISPLAY_FPS,
+                                      (self.video_label.width(), self.video_label.height()), parent=self)
+        self.renderer.rois = self.rois
+        self.renderer.alarm_engine = self.alarm_engine
+        self.renderer.frame_ready.connect(self.update_frame)
+
+        # 카메라당 하나의 열화상 연결을 그래프 창 등과 공유
+        self.bus = acquire_bus(ip, THERMAL_PORT)
+        self.bus.add_refresh_listener(self.refresh_rois)
+        self.thermal_data = self.bus.data_store  # 오버레이는 최신 값을 저장소에서 바로 읽음
+        self.renderer.thermal_store = self.thermal_data
+        self.renderer.start()
+        self.alarm_sub = self.bus.subscribe(callback=self.on_thermal_samples, name="alarm")  # 🔔 알람 평가
+
+        # 알람 이벤트 클립 (알람 전후 영상, alarm_clips.CLIP_DIR)
+        if ALARM_CLIPS:
+            self.clip_capture = ClipCapture(self.reader, self.thermal_data, self.alarm_engine, name=ip)
+            self.clip_capture.rois = self.rois
+            self.clip_capture.start()
+            self.alarm_engine.add_listener(self.clip_capture.on_alarm_transitions)
+
+        self.link_events.attach(self.reader.link)
+        self.link_events.attach(self.bus.link)
+        self.stats_timer.start(1000)
 
         self.update_button_states(True)
         QTimer.singleShot(5000, self.check_stream_timeout)
 
     def check_stream_timeout(self):
-        if self.reader and not self.reader.cap.isOpened():
+        # 처음부터 한 번도 연결되지 않은 경우만 중지 (끊긴 뒤에는 재연결에 맡긴다)
+        if self.reader and self.reader.link.stats.connects == 0:
             self.stop_stream()
 
+    def on_link_state(self, name, state):
+        self.update_link_status()
+        if state != FAILED:
+            return
+        if name == "Video" and self.reader and self.reader.link.state == FAILED:
+            self.stop_stream()
+            QMessageBox.critical(self, "연결 끊김", f"영상 연결이 끊겼습니다. {MAX_RETRIES}회 재시도 실패")
+        elif name == "Thermal":
+            self.statusbar.showMessage(f"열화상 데이터 연결이 끊겼습니다. {MAX_RETRIES}회 재시도 실패")
+
+    def update_link_status(self):
+        links = []
+        if self.reader:
+            links.append(format_link(self.reader.link))
+        if self.bus:
+            links.append(format_link(self.bus.link))
+        if self.recorder:
+            links.append(self.recorder.status())
+        if self.clip_capture and self.clip_capture.triggers:
+            links.append(self.clip_capture.status())
+        self.link_label.setText("   ".join(links))
+
+    def on_stats_timer(self):
+        # 속도/성능 구간은 이 주기 타이머에서만 넘김 (상태 변경 때의 update_link_status 는 표시만 갱신)
+        for link in (self.reader.link if self.reader else None, self.bus.link if self.bus else None):
+            if link is not None:
+                link.stats.advance()
+        self.check_recorder()
+        if self.perf_button.isChecked():
+            now = time.monotonic()
+            text, self.perf_counters = perf_stats.overlay_text(self.perf_counters, now - self.perf_time)
+            self.perf_time = now
+            self.perf_label.setText(text)
+        self.update_link_status()
+
+    def check_recorder(self):
+        # 녹화 스레드가 오류로 끝났으면 버튼을 풀어 정리하고 (toggle_recording) 실패를 알림
+        if self.recorder and self.recorder.error is not None:
+            error = self.recorder.error
+            self.record_button.setChecked(False)
+            self.statusbar.showMessage(f"녹화 실패: {error}")
+
+    def toggle_perf(self, checked):
+        perf_stats.enable(checked)
+        if checked:
+            perf_stats.STATS.reset()
+            self.perf_counters = {}
+            self.perf_time = time.monotonic()
+        self.perf_label.setVisible(checked)
+        self.perf_save_button.setVisible(checked)
+        self.perf_label.setText("Perf: 측정 중...")
+
+    def save_perf(self):
+        path = perf_stats.STATS.export()
+        self.statusbar.showMessage(f"성능 통계 저장: {path}", 5000)
+        print(f"[OpenCVViewer] 성능 통계 저장: {path}")
+
     def stop_stream(self):
+        self.stats_timer.stop()
+        self.link_label.clear()
+        self.video_label.clear()  # 픽스맵이 렌더러 버퍼를 공유할 수 있으므로 렌더러보다 먼저 내림
+        self.record_button.setChecked(False)  # 녹화 중이면 reader/bus 보다 먼저 정지
+        if self.renderer:
+            self.renderer.stop()
+            self.renderer = None
+        if self.clip_capture:
+            # 진행 중인 클립은 인코더 스레드가 마저 저장
+            self.alarm_engine.remove_listener(self.clip_capture.on_alarm_transitions)
+            self.clip_capture.stop()
+            self.clip_capture = None
         if self.reader:
-            self.timer.stop()
+            self.link_events.detach(self.reader.link)
             self.reader.stop()
             self.reader.join()
             self.reader = None
-        if self.receiver:
-            self.receiver.stop()
-            self.receiver = None
-        self.video_label.clear()
+        if self.bus:
+            self.link_events.detach(self.bus.link)
+            self.bus.remove_refresh_listener(self.refresh_rois)
+            self.alarm_sub.close()
+            release_bus(self.bus)
+            self.bus = None
+            self.alarm_sub = None
+        self.thermal_data = {}
+        self.alarm_engine.configure([], time.time())  # 켜져 있던 알람 해제
+        if self.roi_refresher:
+            self.roi_refresher.stop()
+            self.roi_refresher = None
         self.update_button_states(False)
 
-    def update_frame(self):
+    def on_profile_changed(self, name):
+        self.delay_spin.setValue(CAPTURE_PROFILES[name].delay_sec)
+
+    def on_delay_changed(self, value):
         if self.reader:
-            frame = self.reader.get_delayed()
-            if frame is not None:
-                original_h, original_w = frame.shape[:2]
-
-                if (original_w, original_h) != (640, 480):
-                    resized_w, resized_h = 640, 480
-                    scale_x = resized_w / original_w
-                    scale_y = resized_h / original_h
-                    frame = cv2.resize(frame, (resized_w, resized_h))
-                else:
-                    scale_x = scale_y = 1.0
-
-                rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-
-                # ✅ 알람이 발생한 ROI 목록 판단
-                alarming_map = {i: [] for i in range(10)}  # {roi_idx: ["max", "min", "avr"]}
-                mode_map = {
-                    "maximum": "max",
-                    "minimum": "min",
-                    "average": "avr"
-                }
-
-                for i in range(10):
-                    roi = self.rois[i] if i < len(self.rois) else None
-                    td = self.thermal_data.get(i)
-                    if not roi or not td:
-                        continue
-                    alarm = roi.get("alarm", {})
-                    if alarm.get("alarm_use") == "on" and alarm.get("condition") in ("above", "below") and alarm.get("temperature"):
-                        try:
-                            threshold = float(alarm["temperature"])
-                            mode = alarm.get("mode", "maximum")
-                            key = mode_map.get(mode)
-                            if key and key in td:
-                                temp = float(td[key])
-                                if (alarm["condition"] == "above" and temp > threshold) or \
-                                (alarm["condition"] == "below" and temp < threshold):
-                                    alarming_map[i].append(key)
-                        except:
-                            continue
-
-                if self.rois:
-                    draw_rois(rgb, self.rois, self.thermal_data, scale_x, scale_y)
-
-                # ROI 라벨 갱신 + 데이터 표시 강조
-                for i in range(10):
-                    temp = self.thermal_data.get(i)
-                    alerts = alarming_map.get(i, [])
-                    if temp:
-                        self.roi_label_matrix[i]["max"].setText(f"{temp['max']}℃")
-                        self.roi_label_matrix[i]["min"].setText(f"{temp['min']}℃")
-                        self.roi_label_matrix[i]["avr"].setText(f"{temp['avr']}℃")
-                    else:
-                        self.roi_label_matrix[i]["max"].setText("-")
-                        self.roi_label_matrix[i]["min"].setText("-")
-                        self.roi_label_matrix[i]["avr"].setText("-")
-
-                    self.roi_label_matrix[i]["max"].setStyleSheet("background-color: rgb(255, 128, 128);" if "max" in alerts else "")
-                    self.roi_label_matrix[i]["min"].setStyleSheet("background-color: rgb(255, 128, 128);" if "min" in alerts else "")
-                    self.roi_label_matrix[i]["avr"].setStyleSheet("background-color: rgb(255, 128, 128);" if "avr" in alerts else "")
-
-                h, w, ch = rgb.shape
-                qimg = QImage(rgb.data, w, h, ch * w, QImage.Format_RGB888)
-                self.video_label.setPixmap(QPixmap.fromImage(qimg))
+            self.reader.set_delay(value)
+
+    def toggle_recording(self, checked):
+        if checked and self.recorder is None and self.reader:
+            ip = self.ip_input.text().strip()
+            try:
+                self.recorder = SegmentRecorder(self.reader, self.bus, name=ip)
+            except OSError as e:
+                self.statusbar.showMessage(f"녹화 실패: {e}")
+                self.record_button.setChecked(False)
+                return
+            self.recorder.start()
+            print(f"[OpenCVViewer] 녹화 시작: {self.recorder.directory}")
+        elif not checked and self.recorder is not None:
+            recorder, self.recorder = self.recorder, None
+            recorder.stop()
+            print(f"[OpenCVViewer] 녹화 정지: {recorder.status()}")
+        self.update_link_status()
+
+    def on_thermal_samples(self, samples):
+        # 알람 구독 스레드에서 호출됨
+        self.alarm_engine.update(samples)
+
+    def on_alarm_transitions(self, transitions):
+        # 알람 구독 스레드에서 호출됨 (overlay/ROI 표는 렌더 스레드가 프레임 시각 기준으로 조회)
+        for t in transitions:
+            if t.active:
+                print(f"[OpenCVViewer] 알람 ON  ROI{t.roi}: {t.mode} {format_temp(t.temperature)} (기준 {t.threshold}℃)")
+            else:
+                print(f"[OpenCVViewer] 알람 OFF ROI{t.roi}")
+
+    def update_frame(self):
+        # 합성은 FrameRenderer 스레드에서 끝나 있으므로 GUI 스레드는 새 프레임을 그리기만 함
+        rendered = self.renderer.take() if self.renderer else None
+        if rendered is None or rendered.seq == self.shown_seq:
+            return
+        self.shown_seq = rendered.seq
+        t0 = perf_stats.begin()
+        self.video_label.setPixmap(QPixmap.fromImage(rendered.image))
+        perf_stats.end("gui.pixmap", t0)
+        perf_stats.count("video.displayed")
+        # 다음 프레임부터 라벨의 실제 크기로 합성 (창 크기 변경 반영)
+        size = (self.video_label.width(), self.video_label.height())
+        if size != self.renderer.size:
+            self.renderer.size = size
+
+        # ROI 표는 스냅샷만 넘기고, 바뀐 셀 반영은 모델이 TABLE_REFRESH_HZ 주기로 처리
+        self.roi_model.set_snapshot(rendered.thermal, rendered.alarms)
 
 
     def open_graph_viewer(self):
@@ -0,0 +1,188 @@
+# perf_stats.py
+# 파이프라인 단계별 계측: 구간 시간(span) 히스토그램과 카운터.
+# 계측 지점은
+#     t0 = perf_stats.begin()
+#     ...
+#     perf_stats.end("render.resize", t0)
+#     perf_stats.count("video.decoded")
+# 처럼 쓰고, 꺼져 있으면 (기본) begin/count 는 플래그 확인만 하고 end 는 t0 == 0 이라 바로 반환한다.
+# 켜기: PERF_STATS=1 환경변수 또는 enable(True) (뷰어 상태바의 Perf 버튼).
+#
+# 히스토그램은 1 µs ~ 약 16 s 를 옥타브당 HIST_STEPS 칸으로 나눈 고정 개수 칸이라 메모리가 늘지 않는다
+# (백분위 오차는 칸 폭, 약 ±9%). 같은 이름을 여러 스레드가 동시에 기록하면 드물게 한두 건이 빠질 수 있다
+# (락 없이 기록, 통계용).
+import json
+import math
+import os
+import threading
+import time
+
+PERF_STATS = os.environ.get("PERF_STATS", "0") == "1"
+PERF_DIR = os.environ.get("PERF_DIR", "perf")
+HIST_MIN_SEC = 1e-6
+HIST_OCTAVES = 24
+HIST_STEPS = 4           # 옥타브당 칸 수
+HIST_BUCKETS = HIST_OCTAVES * HIST_STEPS + 2  # + 최소값 미만, 최대값 초과
+
+
+def bucket_edges():
+    # 칸 i 의 상한 (초). 마지막 칸은 무한대
+    return [HIST_MIN_SEC * 2 ** (i / HIST_STEPS) for i in range(HIST_BUCKETS - 1)] + [math.inf]
+
+
+_EDGES = bucket_edges()
+
+
+class Histogram:
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self):
+        self.counts = [0] * HIST_BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def add(self, sec):
+        if sec > HIST_MIN_SEC:
+            i = min(int(math.log2(sec / HIST_MIN_SEC) * HIST_STEPS) + 1, HIST_BUCKETS - 1)
+        else:
+            i = 0
+        self.counts[i] += 1
+        self.count += 1
+        self.total += sec
+        if sec < self.min:
+            self.min = sec
+        if sec > self.max:
+            self.max = sec
+
+    def percentile(self, q):
+        # q (0~100) 백분위가 들어 있는 칸의 상한, 최대값을 넘지 않게
+        if not self.count:
+            return math.nan
+        rank = q / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return min(_EDGES[i], self.max)
+        return self.max
+
+    def snapshot(self):
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean": self.total / self.count,
+            "min": self.min,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+
+class PerfStats:
+    def __init__(self, enabled=PERF_STATS):
+        self.enabled = enabled
+        self.spans = {}          # 이름 -> Histogram
+        self.counters = {}       # 이름 -> 누적 값
+        self.since = time.time()
+        self._lock = threading.Lock()
+
+    def record(self, name, sec):
+        hist = self.spans.get(name)
+        if hist is None:
+            with self._lock:
+                hist = self.spans.setdefault(name, Histogram())
+        hist.add(sec)
+
+    def add(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def reset(self):
+        with self._lock:
+            self.spans = {}
+            self.counters = {}
+            self.since = time.time()
+
+    def snapshot(self, buckets=False):
+        # buckets=True 면 히스토그램 칸 값까지 (파일 내보내기용)
+        spans = {}
+        for name, hist in sorted(list(self.spans.items())):
+            spans[name] = hist.snapshot()
+            if buckets:
+                spans[name]["buckets"] = list(hist.counts)
+        return {
+            "time": time.time(),
+            "since": self.since,
+            "spans": spans,
+            "counters": dict(sorted(self.counters.items())),
+        }
+
+    def export(self, path=None):
+        # 누적 통계를 JSON 으로 저장하고 경로를 돌려줌 (칸 상한은 bucket_edges 와 같음)
+        if path is None:
+            os.makedirs(PERF_DIR, exist_ok=True)
+            path = os.path.join(PERF_DIR, time.strftime("perf_%Y%m%d_%H%M%S.json"))
+        data = self.snapshot(buckets=True)
+        data["bucket_edges"] = _EDGES[:-1]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1)
+        return path
+
+
+STATS = PerfStats()
+
+
+def enable(on=True):
+    STATS.enabled = on
+
+
+def begin():
+    return time.perf_counter() if STATS.enabled else 0.0
+
+
+def end(name, t0):
+    if t0:
+        STATS.record(name, time.perf_counter() - t0)
+
+
+def count(name, n=1):
+    if STATS.enabled:
+        STATS.add(name, n)
+
+
+def format_span(name, short=None):
+    # 상태바용 "이름 p50/p99 ms"
+    hist = STATS.spans.get(name)
+    if hist is None or not hist.count:
+        return None
+    return f"{short or name} {hist.percentile(50) * 1000:.2f}/{hist.percentile(99) * 1000:.2f}"
+
+
+# 상태바 overlay: (이름, 짧은 이름) 순서대로, 기록이 있는 것만
+OVERLAY_SPANS = (
+    ("video.grab", "grab"), ("video.retrieve", "retrieve"), ("render.resize", "resize"),
+    ("render.rois", "rois"), ("render.convert", "convert"), ("render.frame", "render"),
+    ("gui.pixmap", "pixmap"), ("thermal.parse", "parse"), ("alarm.update", "alarm"),
+    ("graph.draw", "graph"), ("graph.blit", "blit"),
+)
+OVERLAY_RATES = (
+    ("video.decoded", "dec"), ("video.displayed", "disp"), ("video.dropped", "drop"),
+    ("thermal.messages", "msg"),
+)
+OVERLAY_TOTALS = (
+    ("thermal.parse_errors", "err"), ("thermal.lost", "lost"), ("thermal.dropped_bytes", "junk B"),
+)
+
+
+def overlay_text(previous, elapsed):
+    # previous: 직전 호출의 카운터 dict, elapsed: 그 뒤 지난 초. 반환 (문자열, 이번 카운터)
+    counters = dict(STATS.counters)
+    spans = [text for text in (format_span(name, short) for name, short in OVERLAY_SPANS) if text]
+    rates = [f"{short} {(counters.get(name, 0) - previous.get(name, 0)) / max(elapsed, 1e-6):.1f}/s"
+             for name, short in OVERLAY_RATES]
+    totals = [f"{short} {counters[name]}" for name, short in OVERLAY_TOTALS if counters.get(name)]
+    text = "  ".join(spans) + " ms p50/p99 | " + "  ".join(rates + totals)
+    return text, counters
@@ -0,0 +1,67 @@
+# roi_refresh.py
+# 카메라가 area_id 100 (ROI 설정 변경) 을 알리면 ROI 설정을 백그라운드에서 다시 가져온다.
+# 짧은 시간에 여러 번 알림이 와도 한 번만 가져오고, 결과는 시그널로 GUI 스레드에 넘겨
+# 그쪽에서 참조를 통째로 교체한다.
+import threading
+import time
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from roi_utils import fetch_all_rois
+
+REFRESH_DEBOUNCE_SEC = 0.5   # 마지막 알림 후 이만큼 조용하면 가져오기 시작
+REFRESH_MAX_DELAY_SEC = 3.0  # 알림이 계속 와도 이 시간 안에는 한 번 가져온다
+
+
+class RoiRefreshWorker(QThread):
+    rois_ready = pyqtSignal(list)
+
+    def __init__(self, ip, user_id, user_pw, parent=None):
+        super().__init__(parent)
+        self.ip = ip
+        self.user_id = user_id
+        self.user_pw = user_pw
+        self.requests = 0
+        self.fetches = 0
+        self._pending = threading.Event()
+        self._stopped = False
+
+    def request(self):
+        # 어느 스레드에서 불러도 되며 즉시 반환
+        self.requests += 1
+        self._pending.set()
+
+    def run(self):
+        while not self._stopped:
+            self._pending.wait()
+            if self._stopped:
+                break
+            self._debounce()
+            if self._stopped:
+                break
+
+            rois = fetch_all_rois(self.ip, self.user_id, self.user_pw, cancelled=lambda: self._stopped)
+            self.fetches += 1
+            if self._stopped:
+                break
+            if rois is None:
+                print("[RoiRefreshWorker] ROI 갱신 실패")
+            else:
+                self.rois_ready.emit(rois)
+
+    def _debounce(self):
+        deadline = time.monotonic() + REFRESH_MAX_DELAY_SEC
+        while True:
+            self._pending.clear()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            if not self._pending.wait(min(REFRESH_DEBOUNCE_SEC, remaining)) or self._stopped:
+                return
+
+    def stop(self):
+        self._stopped = True
+        self._pending.set()
+        # 가져오기는 ROI 요청 사이마다 _stopped 를 확인하므로 진행 중인 요청 1개(timeout 2초)만 기다리면 된다.
+        # 시간 제한을 두면 실행 중인 QThread 가 파괴되어 프로세스가 죽을 수 있으므로 끝까지 기다림
+        self.wait()
@@ -0,0 +1,93 @@
+# roi_table.py
+# ROI 별 Max/Min/Avg 표. 렌더 스레드가 만든 스냅샷을 받아 두기만 하고, 일정 주기
+# (TABLE_REFRESH_HZ) 로 이전 값과 비교해 바뀐 셀만 dataChanged 로 알린다.
+# 라벨 30개에 매 프레임 setText/setStyleSheet 하던 방식은 값이 같아도 스타일을 다시 계산했다.
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt, QTimer
+from PyQt5.QtGui import QBrush, QColor
+from PyQt5.QtWidgets import QAbstractItemView, QHeaderView, QTableView
+
+TABLE_REFRESH_HZ = 10  # 열화상 메시지 주기와 같음
+ROI_ROWS = 10
+FIELDS = ("max", "min", "avr")
+HEADERS = ("Max", "Min", "Avg")
+ALARM_BRUSH = QBrush(QColor(255, 128, 128))
+
+
+def format_temp(value):
+    return "-" if value is None else f"{value:.1f}℃"
+
+
+class RoiTableModel(QAbstractTableModel):
+    def __init__(self, rows=ROI_ROWS, parent=None):
+        super().__init__(parent)
+        self._rows = rows
+        self._text = [["-"] * len(FIELDS) for _ in range(rows)]
+        self._alarm = [[False] * len(FIELDS) for _ in range(rows)]
+        self._pending = None
+        self.cell_updates = 0  # dataChanged 로 알린 셀 수 (프로파일용)
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.flush)
+        self._timer.start(int(1000 / TABLE_REFRESH_HZ))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._rows
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(FIELDS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        r, c = index.row(), index.column()
+        if role == Qt.DisplayRole:
+            return self._text[r][c]
+        if role == Qt.BackgroundRole and self._alarm[r][c]:
+            return ALARM_BRUSH
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return HEADERS[section]
+        return f"ROI{section}"
+
+    def set_snapshot(self, thermal, alarms):
+        # thermal: {roi: RoiSample}, alarms: {roi: ["max"|"min"|"avr"]}. 반영은 다음 flush 때.
+        self._pending = (thermal, alarms)
+
+    def flush(self):
+        pending = self._pending
+        if pending is None:
+            return
+        self._pending = None
+        thermal, alarms = pending
+        for r in range(self._rows):
+            td = thermal.get(r)
+            keys = alarms.get(r, ())
+            text_row, alarm_row = self._text[r], self._alarm[r]
+            first = last = None
+            for c, field in enumerate(FIELDS):
+                text = format_temp(getattr(td, field)) if td else "-"
+                alarm = field in keys
+                if text != text_row[c] or alarm != alarm_row[c]:
+                    text_row[c] = text
+                    alarm_row[c] = alarm
+                    if first is None:
+                        first = c
+                    last = c
+            if first is not None:
+                self.cell_updates += last - first + 1
+                self.dataChanged.emit(self.index(r, first), self.index(r, last))
+
+
+def make_roi_table(model, parent=None):
+    view = QTableView(parent)
+    view.setModel(model)
+    view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+    view.setSelectionMode(QAbstractItemView.NoSelection)
+    view.setFocusPolicy(Qt.NoFocus)
+    view.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+    view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+    view.verticalHeader().setDefaultSectionSize(22)
+    return view
@@ -4,153 +4,294 @@ import json
 import re
 import os
 import cv2
+import numpy as np
 
-def fetch_all_rois(ip, user_id, user_pw):
+def parse_cgi(text):
+    # 카메라 CGI 응답 ("key=value" 줄) -> dict
+    return {
+        k.strip(): v.strip()
+        for line in text.strip().splitlines() if "=" in line
+        for k, v in [line.split("=", 1)]
+    }
+
+
+def roi_from_cgi(data):
+    # getthermalroi{i} 응답 dict -> ROI 설정 (사용 안 하거나 좌표가 잘못된 ROI 는 None)
+    if data.get("roi_use") != "on":
+        return None
+    try:
+        sx = int(data["startx"])
+        sy = int(data["starty"])
+        ex = int(data["endx"])
+        ey = int(data["endy"])
+    except Exception:
+        return None
+
+    alarm_data = {
+        "alarm_use": data.get("alarm_use"),
+        "mode": data.get("mode"),
+        "condition": data.get("condition"),
+        "temperature": data.get("temperature"),
+        "start_delay": data.get("start_delay"),
+        "stop_delay": data.get("stop_delay")
+    }
+
+    return {
+        "coords": (sx, sy, ex, ey),
+        "alarm": alarm_data
+    }
+
+
+def fetch_all_rois(ip, user_id, user_pw, cancelled=None):
+    # cancelled: ROI 요청 사이마다 확인하는 함수. True 를 돌려주면 중단하고 None 반환
     rois = []
     try:
-        for i in range(10):
-            url = f"http://{ip}/cgi-bin/control/camthermalroi.cgi"
-            params = {
-                "id": user_id,
-                "passwd": user_pw,
-                "action": f"getthermalroi{i}"
-            }
-            resp = requests.get(url, params=params, timeout=2)
-
-            if resp.status_code != 200 or "Unauthorized" in resp.text:
-                return None
-
-            lines = resp.text.strip().splitlines()
-            data = {
-                k.strip(): v.strip()
-                for line in lines if "=" in line
-                for k, v in [line.split("=", 1)]
-            }
-            if data.get("roi_use") == "on":
-                try:
-                    sx = int(data["startx"])
-                    sy = int(data["starty"])
-                    ex = int(data["endx"])
-                    ey = int(data["endy"])
-
-                    alarm_data = {
-                        "alarm_use": data.get("alarm_use"),
-                        "mode": data.get("mode"),
-                        "condition": data.get("condition"),
-                        "temperature": data.get("temperature"),
-                        "start_delay": data.get("start_delay"),
-                        "stop_delay": data.get("stop_delay")
-                    }
-
-                    rois.append({
-                        "coords": (sx, sy, ex, ey),
-                        "alarm": alarm_data
-                    })
-                except Exception:
-                    continue
+        # 10개 요청이 같은 HTTP 연결을 재사용하도록 세션 사용
+        with requests.Session() as session:
+            for i in range(10):
+                if cancelled is not None and cancelled():
+                    return None
+                url = f"http://{ip}/cgi-bin/control/camthermalroi.cgi"
+                params = {
+                    "id": user_id,
+                    "passwd": user_pw,
+                    "action": f"getthermalroi{i}"
+                }
+                resp = session.get(url, params=params, timeout=2)
+
+                if resp.status_code != 200 or "Unauthorized" in resp.text:
+                    return None
+
+                roi = roi_from_cgi(parse_cgi(resp.text))
+                if roi is not None:
+                    rois.append(roi)
     except Exception:
         return None
     return rois
 
 
-def draw_rois(frame, rois, thermal_data=None, scale_x=1.0, scale_y=1.0):
+def format_value(value):
+    return "-" if value is None else f"{value:.1f}"
+
+
+def _color(rgb, bgr):
+    # 색은 RGB 로 적고, BGR 프레임(OpenCV 원본 순서)에 그릴 때만 뒤집는다
+    return rgb[::-1] if bgr else rgb
+
+
+def _scaled_coords(roi, scale_x, scale_y):
+    sx, sy, ex, ey = roi["coords"] if isinstance(roi, dict) else roi
+    return int(sx * scale_x), int(sy * scale_y), int(ex * scale_x), int(ey * scale_y)
+
+
+def _alarm_text(alarm):
+    # 사용자 알람 조건 영어 표기 (예: "Max > 60")
+    if alarm.get("alarm_use") != "on":
+        return None
+    mode_map = {"maximum": "Max", "minimum": "Min", "average": "Avg"}
+    m = mode_map.get(alarm.get("mode"), "")
+    op = ">" if alarm.get("condition") == "above" else "<"
+    t = alarm.get("temperature", "")
+    if m and op and t:
+        return f"{m} {op} {t}"
+    return None
+
+
+class RoiOverlay:
+    # ROI 테두리, 이름, 알람 조건 문구처럼 ROI 설정과 출력 크기에만 의존하는 정적 레이어.
+    # 설정(rois 참조)이나 크기/배율이 바뀔 때만 다시 그리고, 프레임마다 알파가 0 이 아닌
+    # 픽셀만 골라 한 번에 합성한다.
+    def __init__(self):
+        self._rois = None
+        self._key = None
+        self._opaque = None        # alpha = 255 픽셀의 채널 단위 평탄화 인덱스
+        self._opaque_color = None
+        self._index = None         # 0 < alpha < 255 (안티에일리어싱 가장자리)
+        self._alpha = None         # 남길 바탕 비율 (256 - alpha, uint16)
+        self._color = None         # alpha 를 미리 곱한 색 (uint16)
+        self.builds = 0
+
+    def update(self, rois, shape, scale_x, scale_y, bgr=False):
+        key = (shape[:2], scale_x, scale_y, bgr)
+        if rois is self._rois and key == self._key:
+            return
+        h, w = shape[:2]
+        color = np.zeros((h, w, 3), np.uint8)
+        mask = np.zeros((h, w), np.uint8)
+        for idx, roi in enumerate(rois):
+            sx_r, sy_r, ex_r, ey_r = _scaled_coords(roi, scale_x, scale_y)
+            alarm = roi.get("alarm", {}) if isinstance(roi, dict) else {}
+            for img, c in ((color, _color((0, 255, 0), bgr)), (mask, 255)):
+                cv2.rectangle(img, (sx_r, sy_r), (ex_r, ey_r), c, 1)
+            # ROI 이름 표시 (우측 상단)
+            for img, c in ((color, (255, 255, 255)), (mask, 255)):
+                cv2.putText(img, f"ROI{idx}", (ex_r - 25, sy_r + 15),
+                            cv2.FONT_HERSHEY_SIMPLEX, 0.3, c, 1, cv2.LINE_AA)
+            text = _alarm_text(alarm)
+            if text:
+                for img, c in ((color, _color((255, 255, 0), bgr)), (mask, 255)):
+                    cv2.putText(img, text, (sx_r + 3, ey_r - 5),  # 좌측 하단
+                                cv2.FONT_HERSHEY_SIMPLEX, 0.35, c, 1, cv2.LINE_AA)
+        # 불투명 픽셀(테두리 대부분)은 색을 그대로 대입하고, 안티에일리어싱 가장자리만 섞는다.
+        # 인덱스는 채널까지 펼친 1차원 (take/대입이 2차원 행 인덱싱보다 훨씬 빠름)
+        flat_mask = mask.ravel()
+        flat_color = color.reshape(-1)
+        opaque = _channel_index(np.flatnonzero(flat_mask == 255))
+        edge = np.flatnonzero((flat_mask > 0) & (flat_mask < 255))
+        alpha = flat_mask[edge].astype(np.uint16)
+        edge = _channel_index(edge)
+        self._opaque = opaque
+        self._opaque_color = flat_color[opaque]
+        self._index = edge
+        # (px * (256 - a')) >> 8 ≈ px * (255 - a) / 255
+        self._alpha = np.repeat(256 - alpha - (alpha > 127), 3).astype(np.uint16)
+        # color 는 검은 바탕에 그렸으므로 가장자리 색은 이미 alpha 가 곱해진 상태
+        self._color = flat_color[edge].astype(np.uint16)
+        self._rois = rois
+        self._key = key
+        self.builds += 1
+
+    def apply(self, frame):
+        if self._index is None:
+            return
+        flat = frame.reshape(-1)
+        if not np.shares_memory(flat, frame):
+            raise ValueError("RoiOverlay.apply 는 연속 배열 프레임이 필요합니다")
+        flat[self._opaque] = self._opaque_color
+        px = np.multiply(flat.take(self._index), self._alpha, dtype=np.uint16)
+        px >>= 8
+        px += self._color
+        np.minimum(px, 255, out=px)
+        flat[self._index] = px
+
+
+ALARM_FILL = (255, 0, 0)   # RGB 프레임 기준 빨강 (BGR 프레임은 _color 로 뒤집어 씀)
+ALARM_ALPHA = 0.3
+
+
+def _clip_rect(rect, w, h):
+    # 채운 사각형과 같은 영역 (끝점 포함) 을 프레임 안으로 자른 (x0, y0, x1, y1), 비어 있으면 None
+    sx, sy, ex, ey = rect
+    x0, x1 = max(min(sx, ex), 0), min(max(sx, ex) + 1, w)
+    y0, y1 = max(min(sy, ey), 0), min(max(sy, ey) + 1, h)
+    if x0 >= x1 or y0 >= y1:
+        return None
+    return x0, y0, x1, y1
+
+
+def _merge_overlapping(rects):
+    # 겹치는 사각형끼리 묶음 → [(묶음 bbox, [사각형...]), ...]
+    groups = [(r, [r]) for r in rects]
+    merged = True
+    while merged:
+        merged = False
+        for i in range(len(groups)):
+            for j in range(i + 1, len(groups)):
+                a, b = groups[i][0], groups[j][0]
+                if a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]:
+                    box = (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+                    groups[i] = (box, groups[i][1] + groups[j][1])
+                    del groups[j]
+                    merged = True
+                    break
+            if merged:
+                break
+    return groups
+
+
+_fill_cache = {}
+
+
+def _fill_frame(shape, dtype, color):
+    # 단색 프레임을 크기/색 별로 한 번만 만들어 두고 잘라 쓴다
+    key = (shape, dtype.str, color)
+    fill = _fill_cache.get(key)
+    if fill is None:
+        if len(_fill_cache) > 8:
+            _fill_cache.clear()
+        fill = np.empty(shape, dtype)
+        fill[:] = color
+        _fill_cache[key] = fill
+    return fill
+
+
+def blend_alarm_rects(frame, rects, color=ALARM_FILL, alpha=ALARM_ALPHA):
+    # 알람 ROI 영역만 제자리에서 반투명 채움. 겹치는 영역은 한 번만 섞는다.
+    # (예전 방식: ROI 마다 frame.copy() + 프레임 전체 addWeighted)
+    h, w = frame.shape[:2]
+    rects = [r for r in (_clip_rect(r, w, h) for r in rects) if r is not None]
+    fill_frame = _fill_frame(frame.shape, frame.dtype, color)
+    for (x0, y0, x1, y1), members in _merge_overlapping(rects):
+        sub = frame[y0:y1, x0:x1]
+        fill = fill_frame[y0:y1, x0:x1]
+        if len(members) == 1:
+            cv2.addWeighted(sub, 1 - alpha, fill, alpha, 0, dst=sub)
+            continue
+        mask = np.zeros(sub.shape[:2], np.uint8)
+        for mx0, my0, mx1, my1 in members:
+            mask[my0 - y0:my1 - y0, mx0 - x0:mx1 - x0] = 1
+        blended = cv2.addWeighted(sub, 1 - alpha, fill, alpha, 0)
+        cv2.copyTo(blended, mask, dst=sub)
+
+
+def _channel_index(pixels):
+    return (pixels[:, None] * 3 + np.arange(3)).ravel()
+
+
+_default_overlay = RoiOverlay()
+
+
+def draw_rois(frame, rois, thermal_data=None, scale_x=1.0, scale_y=1.0, overlay=None, alarms=(), bgr=False):
+    # 정적인 부분은 overlay 레이어(캐시)로, 프레임마다 바뀌는 알람 채우기/온도/고온·저온 점만 직접 그림
+    # alarms: 알람이 켜진 ROI 번호들 (alarm_utils.AlarmEngine 의 판정 결과)
+    # bgr: frame 이 BGR 순서 (cvtColor 없이 Format_BGR888 로 표시하는 경로)
+    if overlay is None:
+        overlay = _default_overlay
+    overlay.update(rois, frame.shape, scale_x, scale_y, bgr)
+
+    # 알람 경고 채워진 테두리
+    alarm_rects = [_scaled_coords(rois[i], scale_x, scale_y) for i in alarms if i < len(rois)]
+    if alarm_rects:
+        blend_alarm_rects(frame, alarm_rects, _color(ALARM_FILL, bgr))
+
+    # 테두리, ROI 이름, 알람 조건
+    overlay.apply(frame)
+
+    if not thermal_data:
+        return
     for idx, roi in enumerate(rois):
-        if isinstance(roi, dict):
-            sx, sy, ex, ey = roi["coords"]
-            alarm = roi.get("alarm", {})
-        else:
-            sx, sy, ex, ey = roi
-            alarm = {}
-
-        sx_r, sy_r, ex_r, ey_r = map(lambda v: int(v[0] * v[1]), zip((sx, sy, ex, ey), (scale_x, scale_y, scale_x, scale_y)))
-
-        # 알람 유무 판단
-        alert_triggered = False
-        if thermal_data and idx in thermal_data and isinstance(roi, dict):
-            td = thermal_data[idx]
-            if alarm.get("alarm_use") == "on" and alarm.get("condition") in ("above", "below") and alarm.get("temperature"):
-                try:
-                    threshold = float(alarm["temperature"])
-                    mode = alarm.get("mode", "maximum")
-                    key = {"maximum": "max", "minimum": "min", "average": "avr"}.get(mode)
-                    if key and key in td:
-                        temp = float(td[key])
-                        if (alarm["condition"] == "above" and temp > threshold) or \
-                           (alarm["condition"] == "below" and temp < threshold):
-                            alert_triggered = True
-                except:
-                    pass
-
-        # 알람 경고 채워진 테두리
-        if alert_triggered:
-            overlay = frame.copy()
-            cv2.rectangle(overlay, (sx_r, sy_r), (ex_r, ey_r), (255, 0, 0), -1)
-            cv2.addWeighted(overlay, 0.3, frame, 0.7, 0, frame)
-
-        # 테두리
-        cv2.rectangle(frame, (sx_r, sy_r), (ex_r, ey_r), (0, 255, 0), 1)
-
-        # ROI 이름 표시 (우측 상단)
-        label_pos = (ex_r - 25, sy_r + 15)
-        cv2.putText(
-            frame,
-            f"ROI{idx}",
-            label_pos,
-            cv2.FONT_HERSHEY_SIMPLEX,
-            0.3,
-            (255, 255, 255),
-            1,
-            cv2.LINE_AA
-        )
+        if idx not in thermal_data:
+            continue
+        sx_r, sy_r, ex_r, ey_r = _scaled_coords(roi, scale_x, scale_y)
 
         # 업데이트 데이터
-        if thermal_data and idx in thermal_data:
-            td = thermal_data[idx]
-            temp_lines = [
-                f"Max: {td['max']}",
-                f"Min: {td['min']}",
-                f"Avg: {td['avr']}"
-            ]
-            font_scale = 0.4
-            line_height = int(35 * font_scale)
-
-            for i, line in enumerate(temp_lines):
-                cv2.putText(
-                    frame,
-                    line,
-                    (sx_r + 3, sy_r + 15 + i * line_height),
-                    cv2.FONT_HERSHEY_SIMPLEX,
-                    font_scale,
-                    (255, 255, 255),
-                    1,
-                    cv2.LINE_AA
-                )
-
-            if td.get("point_min_x") is not None and td.get("point_min_y") is not None:
-                x_max = int(td["point_min_x"] * scale_x)
-                y_max = int(td["point_min_y"] * scale_y)
-                cv2.rectangle(frame, (x_max, y_max), (x_max + 4, y_max + 4), (255, 0, 0), -1)
-
-            if td.get("point_max_x") is not None and td.get("point_max_y") is not None:
-                x_min = int(td["point_max_x"] * scale_x)
-                y_min = int(td["point_max_y"] * scale_y)
-                cv2.rectangle(frame, (x_min, y_min), (x_min + 4, y_min + 4), (0, 0, 255), -1)
-
-            # ✅ 사용자 알람 조건 영어로 표시
-            if alarm.get("alarm_use") == "on":
-                mode_map = {"maximum": "Max", "minimum": "Min", "average": "Avg"}
-                m = mode_map.get(alarm.get("mode"), "")
-                op = ">" if alarm.get("condition") == "above" else "<"
-                t = alarm.get("temperature", "")
-                if m and op and t:
-                    text = f"{m} {op} {t}"
-                    cv2.putText(
-                        frame,
-                        text,
-                        (sx_r + 3, ey_r - 5),  # 좌측 하단
-                        cv2.FONT_HERSHEY_SIMPLEX,
-                        0.35,
-                        (255, 255, 0),
-                        1,
-                        cv2.LINE_AA
-                    )
+        td = thermal_data[idx]
+        temp_lines = [
+            f"Max: {format_value(td.max)}",
+            f"Min: {format_value(td.min)}",
+            f"Avg: {format_value(td.avr)}"
+        ]
+        font_scale = 0.4
+        line_height = int(35 * font_scale)
+
+        for i, line in enumerate(temp_lines):
+            cv2.putText(
+                frame,
+                line,
+                (sx_r + 3, sy_r + 15 + i * line_height),
+                cv2.FONT_HERSHEY_SIMPLEX,
+                font_scale,
+                (255, 255, 255),
+                1,
+                cv2.LINE_AA
+            )
+
+        if td.point_min_x is not None and td.point_min_y is not None:
+            x_max = int(td.point_min_x * scale_x)
+            y_max = int(td.point_min_y * scale_y)
+            cv2.rectangle(frame, (x_max, y_max), (x_max + 4, y_max + 4), _color((255, 0, 0), bgr), -1)
+
+        if td.point_max_x is not None and td.point_max_y is not None:
+            x_min = int(td.point_max_x * scale_x)
+            y_min = int(td.point_max_y * scale_y)
+            cv2.rectangle(frame, (x_min, y_min), (x_min + 4, y_min + 4), _color((0, 0, 255), bgr), -1)
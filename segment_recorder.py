@@ -0,0 +1,279 @@
+# segment_recorder.py
+# 영상 + 열화상 ROI 측정값 백그라운드 연속 녹화 (고정 길이 세그먼트, 보관 한도 넘으면 오래된 것부터 삭제)
+#
+# 영상은 FrameReader 의 FrameRing 슬롯을 그대로 읽어 인코딩한다 (캡처 경로에 복사 없음).
+# 녹화 스레드가 읽는 슬롯은 "record" 핀으로 잡혀 있어 인코딩이 끝날 때까지 덮어쓰이지 않고,
+# 녹화가 링 길이(약 DELAY_SEC)보다 밀리면 그 사이 프레임은 건너뛴다 (skipped).
+# cv2 인코딩/파일 쓰기는 GIL 을 놓기 때문에 별도 스레드로 충분하고, 스레드 우선순위를 낮춰
+# CPU 가 모자랄 때 수신/표시 대신 녹화 쪽이 밀리게 한다.
+#
+# 세그먼트 1개 = 파일 3개 (같은 이름, 확장자만 다름):
+#   {name}_{YYYYmmdd_HHMMSS_mmm}.mp4   영상 (RECORD_FOURCC)
+#   ....frames                         프레임마다 캡처 시각 f8 (time.time), 영상 프레임 순서와 같음
+#   ....thermal                        해당 구간에 받은 RoiSample 을 thermal_store.SAMPLE_DTYPE 로 연속 기록
+# 영상 fps 는 명목값이고, 열화상과 맞출 때는 .frames 의 실제 캡처 시각을 쓴다 (read_segment).
+#
+#   python segment_recorder.py 192.168.0.56 [--user admin --pw admin] [-o recordings] [--segment 60]
+import argparse
+import glob
+import os
+import struct
+import time
+from threading import Event, Thread, get_native_id
+
+import cv2
+import numpy as np
+
+from thermal_store import SAMPLE_DTYPE, sample_record
+
+SEGMENT_SEC = 60
+RETENTION_SEC = 24 * 3600           # 이보다 오래된 세그먼트 삭제
+RETENTION_BYTES = 20 * 1024 ** 3    # 전체 크기가 이를 넘으면 오래된 세그먼트부터 삭제
+RECORD_FOURCC = "mp4v"              # opencv-python 배포판에는 H.264 인코더가 없음
+RECORD_EXT = ".mp4"
+FRAMES_EXT = ".frames"
+THERMAL_EXT = ".thermal"
+RECORD_DIR = os.environ.get("RECORD_DIR", "recordings")
+SIDECAR_FLUSH_SEC = 1.0             # 비정상 종료 시 잃는 측정값 최대 구간
+POLL_SEC = 0.005                    # 새 프레임이 없을 때 대기
+RING_OWNER = "record"
+RECORD_NICE = 10                    # 녹화 스레드 우선순위를 낮춤 (CPU 가 모자라면 표시 대신 녹화가 프레임을 건너뜀)
+
+FRAME_TIME = struct.Struct("<d")
+CLIP_TAG = "_ROI"  # 알람 클립 파일 이름 표식 (alarm_clips)
+
+
+def segment_files(video_path):
+    base = os.path.splitext(video_path)[0]
+    return video_path, base + FRAMES_EXT, base + THERMAL_EXT
+
+
+def read_segment(video_path):
+    # (프레임별 캡처 시각 배열, SAMPLE_DTYPE 측정값 배열)
+    _, frames_path, thermal_path = segment_files(video_path)
+    frame_times = np.fromfile(frames_path, "<f8") if os.path.exists(frames_path) else np.zeros(0)
+    samples = np.fromfile(thermal_path, SAMPLE_DTYPE) if os.path.exists(thermal_path) else np.zeros(0, SAMPLE_DTYPE)
+    return frame_times, samples
+
+
+def list_segments(directory, prefix, ext=RECORD_EXT):
+    # prefix 카메라의 세그먼트 영상 경로, 오래된 것부터 (파일 이름의 시각 순).
+    # 알람 클립({prefix}_{시각}_ROI*) 은 같은 폴더에 있어도 빼서 녹화 보관 한도에 섞이지 않게 함
+    paths = glob.glob(os.path.join(glob.escape(directory), f"{glob.escape(prefix)}_*{ext}"))
+    skip = len(prefix) + 1
+    return sorted(p for p in paths if CLIP_TAG not in os.path.basename(p)[skip:])
+
+
+def enforce_retention(paths, retention_sec, retention_bytes):
+    # paths (오래된 것부터) 중 retention_sec 보다 오래됐거나 전체 크기가 retention_bytes 를 넘게 하는 것을
+    # 사이드카와 함께 삭제하고 지운 개수를 돌려줌
+    entries = []
+    total = 0
+    for path in paths:
+        size = sum(os.path.getsize(p) for p in segment_files(path) if os.path.exists(p))
+        entries.append((path, size))
+        total += size
+    cutoff = time.time() - retention_sec
+    deleted = 0
+    for path, size in entries:
+        if total <= retention_bytes and os.path.getmtime(path) >= cutoff:
+            break
+        for p in segment_files(path):
+            try:
+                os.remove(p)
+            except FileNotFoundError:
+                pass
+        total -= size
+        deleted += 1
+    return deleted
+
+
+def lower_priority():
+    # Linux 는 스레드별 nice 값이 있어 이 스레드(와 여기서 만드는 인코더 스레드)만 낮아진다.
+    # 지원하지 않는 OS 에서는 그대로 둠.
+    try:
+        os.setpriority(os.PRIO_PROCESS, get_native_id(), RECORD_NICE)
+    except (AttributeError, OSError):
+        pass
+
+
+class SegmentRecorder(Thread):
+    # reader: FrameReader, bus: ThermalBus (None 이면 영상만)
+    def __init__(self, reader, bus, directory=RECORD_DIR, name="camera", segment_sec=SEGMENT_SEC,
+                 retention_sec=RETENTION_SEC, retention_bytes=RETENTION_BYTES,
+                 fourcc=RECORD_FOURCC, ext=RECORD_EXT):
+        super().__init__(name=f"SegmentRecorder-{name}", daemon=True)
+        self.reader = reader
+        self.directory = directory
+        self.prefix = name.replace(":", "_").replace("/", "_")
+        self.segment_sec = segment_sec
+        self.retention_sec = retention_sec
+        self.retention_bytes = retention_bytes
+        self.fourcc = fourcc
+        self.ext = ext
+        self.frames = 0           # 기록한 프레임 수
+        self.samples = 0          # 기록한 열화상 측정값 수
+        self.segments = 0         # 연 세그먼트 수
+        self.deleted = 0          # 보관 한도로 지운 세그먼트 수
+        self.bytes_written = 0    # 닫은 세그먼트의 파일 크기 합
+        self.encode_sec = 0.0     # VideoWriter.write 누적 시간
+        self.current = None       # 기록 중인 세그먼트 영상 경로
+        self.error = None         # 녹화 스레드를 멈추게 한 오류 메시지 (GUI 가 확인)
+        self._start_count = reader.frames.count
+        self._writer = None
+        self._frames_file = None
+        self._thermal_file = None
+        self._segment_start = None
+        self._segment_frames = 0
+        self._shape = None
+        self._fps = reader.target_fps or 30
+        self._stop_event = Event()
+        self._sub = bus.subscribe(name=f"recorder-{name}") if bus is not None else None
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def skipped(self):
+        # 녹화가 밀려 링에서 덮어쓰인 프레임 수 (아직 읽지 않은 최근 프레임 몇 개 포함)
+        return max(0, self.reader.frames.count - self._start_count - self.frames)
+
+    def run(self):
+        lower_priority()
+        ring = self.reader.frames
+        last_time = None
+        last_flush = time.monotonic()
+        try:
+            while not self._stop_event.is_set():
+                frame, frame_time = ring.next_after(last_time, RING_OWNER)
+                if frame is None:
+                    self._stop_event.wait(POLL_SEC)
+                else:
+                    last_time = frame_time
+                    self._write_frame(frame, frame_time)
+                if self._writer is not None:
+                    self._write_samples()
+                    now = time.monotonic()
+                    if now - last_flush >= SIDECAR_FLUSH_SEC:
+                        self._frames_file.flush()
+                        self._thermal_file.flush()
+                        last_flush = now
+        except Exception as e:
+            self.error = str(e)
+            print(f"[SegmentRecorder] 녹화 중단: {e}")
+        finally:
+            ring.release(RING_OWNER)
+            self._close_segment()
+            if self._sub is not None:
+                self._sub.close()
+
+    def _write_frame(self, frame, frame_time):
+        if (self._writer is None or frame.shape != self._shape
+                or frame_time - self._segment_start >= self.segment_sec):
+            self._open_segment(frame, frame_time)
+        t0 = time.perf_counter()
+        self._writer.write(frame)
+        self.encode_sec += time.perf_counter() - t0
+        self._frames_file.write(FRAME_TIME.pack(frame_time))
+        self.frames += 1
+        self._segment_frames += 1
+
+    def _write_samples(self):
+        batch = self._sub.drain() if self._sub is not None else None
+        if not batch:
+            return
+        np.array([sample_record(s) for s in batch], SAMPLE_DTYPE).tofile(self._thermal_file)
+        self.samples += len(batch)
+
+    def _open_segment(self, frame, frame_time):
+        if self._writer is not None:
+            # 직전 세그먼트의 실제 프레임 속도를 다음 세그먼트의 명목 fps 로
+            span = frame_time - self._segment_start
+            if span > 0 and self._segment_frames > 1:
+                self._fps = self._segment_frames / span
+        self._close_segment()
+        self._enforce_retention()
+
+        stamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(frame_time))
+        stamp += f"_{int(frame_time * 1000) % 1000:03d}"
+        path = os.path.join(self.directory, f"{self.prefix}_{stamp}{self.ext}")
+        h, w = frame.shape[:2]
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*self.fourcc), self._fps, (w, h))
+        if not writer.isOpened():
+            raise RuntimeError(f"{path} 를 열 수 없습니다 ({self.fourcc})")
+        _, frames_path, thermal_path = segment_files(path)
+        self._writer = writer
+        self._frames_file = open(frames_path, "wb")
+        self._thermal_file = open(thermal_path, "wb")
+        self._segment_start = frame_time
+        self._segment_frames = 0
+        self._shape = frame.shape
+        self.current = path
+        self.segments += 1
+
+    def _close_segment(self):
+        if self._writer is None:
+            return
+        self._write_samples()
+        self._writer.release()
+        self._frames_file.close()
+        self._thermal_file.close()
+        self.bytes_written += sum(os.path.getsize(p) for p in segment_files(self.current) if os.path.exists(p))
+        self._writer = self._frames_file = self._thermal_file = None
+        self.current = None
+
+    def list_segments(self):
+        return list_segments(self.directory, self.prefix, self.ext)
+
+    def _enforce_retention(self):
+        self.deleted += enforce_retention(self.list_segments(), self.retention_sec, self.retention_bytes)
+
+    def status(self):
+        if self.error is not None:
+            return f"REC 실패: {self.error}"
+        return f"REC {self.segments}seg {self.frames}f skip {self.skipped}"
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def main():
+    from frame_reader import FrameReader, DELAY_SEC, VIDEO_URL
+    from thermal_bus import acquire_bus, release_bus
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("ip")
+    parser.add_argument("--user", default="admin")
+    parser.add_argument("--pw", default="admin")
+    parser.add_argument("--port", type=int, default=554)
+    parser.add_argument("--thermal-port", type=int, default=60110)
+    parser.add_argument("-o", "--output", default=RECORD_DIR)
+    parser.add_argument("--segment", type=float, default=SEGMENT_SEC)
+    parser.add_argument("--retention-hours", type=float, default=RETENTION_SEC / 3600)
+    parser.add_argument("--retention-gb", type=float, default=RETENTION_BYTES / 1024 ** 3)
+    parser.add_argument("--duration", type=float, default=None)
+    args = parser.parse_args()
+
+    # target_fps=None: 받은 프레임을 모두 retrieve (표시 주기로 줄이지 않음)
+    reader = FrameReader(VIDEO_URL.format(user=args.user, pw=args.pw, ip=args.ip, port=args.port),
+                         DELAY_SEC, target_fps=None)
+    reader.start()
+    bus = acquire_bus(args.ip, args.thermal_port)
+    recorder = SegmentRecorder(reader, bus, args.output, args.ip, args.segment,
+                               args.retention_hours * 3600, int(args.retention_gb * 1024 ** 3))
+    recorder.start()
+    deadline = None if args.duration is None else time.monotonic() + args.duration
+    try:
+        while (deadline is None or time.monotonic() < deadline) and recorder.error is None:
+            time.sleep(1)
+            print(f"\r[SegmentRecorder] {recorder.status()}  {recorder.current or ''}", end="", flush=True)
+    except KeyboardInterrupt:
+        pass
+    print()
+    recorder.stop()
+    reader.stop()
+    reader.join()
+    release_bus(bus)
+
+
+if __name__ == "__main__":
+    main()
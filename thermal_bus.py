@@ -0,0 +1,169 @@
+# thermal_bus.py
+# 카메라당 60110 연결 1개를 공유하고, 파싱된 RoiSample 을 여러 구독자에게 전달
+import threading
+from collections import deque
+
+from thermal_hub import create_receiver
+from link_supervisor import CONNECTING, FAILED
+from thermal_store import ThermalStore
+import perf_stats
+
+SUBSCRIPTION_MAXLEN = 2000
+
+
+# 구독자별 큐. 수신 스레드는 deque 에 넣기만 하므로 구독자가 느려도 막히지 않는다
+# (가득 차면 오래된 샘플부터 버리고 dropped 로 집계).
+class Subscription:
+    def __init__(self, bus, callback=None, maxlen=SUBSCRIPTION_MAXLEN, name=None):
+        self.bus = bus
+        self.queue = deque(maxlen=maxlen)
+        self.callback = callback
+        self.name = name or "subscriber"
+        self.dropped = 0
+        self._event = threading.Event()
+        self._closed = False
+        self._worker = None
+        if callback is not None:
+            # 콜백 구독자는 자기 스레드에서 배치 단위로 호출
+            self._worker = threading.Thread(target=self._dispatch, name=f"ThermalBus-{self.name}", daemon=True)
+            self._worker.start()
+
+    def push(self, samples):
+        overflow = len(self.queue) + len(samples) - self.queue.maxlen
+        if overflow > 0:
+            self.dropped += overflow
+            perf_stats.count("thermal.lost", overflow)  # 구독자가 밀려 버린 샘플
+        self.queue.extend(samples)
+        if self._worker is not None:
+            self._event.set()
+
+    def drain(self):
+        items = []
+        q = self.queue
+        while q:
+            try:
+                items.append(q.popleft())
+            except IndexError:
+                break
+        return items
+
+    def _dispatch(self):
+        while not self._closed:
+            self._event.wait()
+            self._event.clear()
+            batch = self.drain()
+            if batch and not self._closed:
+                try:
+                    self.callback(batch)
+                except Exception as e:
+                    print(f"[ThermalBus] {self.name} 콜백 오류: {e}")
+
+    def close(self):
+        self._closed = True
+        self._event.set()
+        self.bus.unsubscribe(self)
+
+
+class ThermalBus:
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.data_store = ThermalStore()  # ROI 별 시간순 이력 + 최신 값
+        self._subs = ()
+        self._refresh_listeners = ()
+        self._raw_listeners = ()
+        self._lock = threading.Lock()
+        self.refcount = 0
+        self.receiver = self._create_receiver()
+        self.link = self.receiver.link
+
+    def _create_receiver(self):
+        receiver = create_receiver(self.host, self.port, self.data_store,
+                                   on_roi_refresh=self._notify_refresh,
+                                   on_samples=self.publish)
+        receiver.raw_tap = self._publish_raw
+        return receiver
+
+    def start(self):
+        self.receiver.start()
+
+    def restart(self):
+        # 재시도 한도를 다 써서 멈춘 연결을 같은 링크 객체(리스너/통계 유지)로 다시 시작
+        self.receiver = self._create_receiver()
+        self.receiver.link = self.link
+        self.link.retries = 0
+        self.link.set_state(CONNECTING)
+        self.receiver.start()
+
+    def stop(self):
+        self.receiver.stop()
+        for sub in self._subs:
+            sub.close()
+
+    # 수신 스레드에서 호출. 구독자 목록은 튜플로 교체하므로 잠금 없이 순회
+    def publish(self, samples):
+        for sub in self._subs:
+            sub.push(samples)
+
+    def subscribe(self, callback=None, maxlen=SUBSCRIPTION_MAXLEN, name=None):
+        sub = Subscription(self, callback, maxlen, name)
+        with self._lock:
+            self._subs = self._subs + (sub,)
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            self._subs = tuple(s for s in self._subs if s is not sub)
+
+    def add_refresh_listener(self, fn):
+        with self._lock:
+            self._refresh_listeners = self._refresh_listeners + (fn,)
+
+    def remove_refresh_listener(self, fn):
+        with self._lock:
+            self._refresh_listeners = tuple(f for f in self._refresh_listeners if f != fn)
+
+    def add_raw_listener(self, fn):
+        # fn(data) 는 수신 스레드에서 호출되므로 즉시 반환해야 한다 (ThermalRecorder 참고)
+        with self._lock:
+            self._raw_listeners = self._raw_listeners + (fn,)
+
+    def remove_raw_listener(self, fn):
+        with self._lock:
+            self._raw_listeners = tuple(f for f in self._raw_listeners if f != fn)
+
+    def _publish_raw(self, data):
+        for fn in self._raw_listeners:
+            fn(data)
+
+    def _notify_refresh(self):
+        for fn in self._refresh_listeners:
+            fn()
+
+
+_buses = {}
+_registry_lock = threading.Lock()
+
+
+def acquire_bus(host, port):
+    # 같은 카메라에 대해서는 하나의 버스(=하나의 TCP 연결)를 공유
+    with _registry_lock:
+        bus = _buses.get((host, port))
+        if bus is None:
+            bus = ThermalBus(host, port)
+            _buses[(host, port)] = bus
+            bus.start()
+        elif bus.link.state == FAILED:
+            bus.restart()
+        bus.refcount += 1
+        return bus
+
+
+def release_bus(bus):
+    with _registry_lock:
+        bus.refcount -= 1
+        if bus.refcount > 0:
+            return
+        if _buses.get((bus.host, bus.port)) is bus:
+            del _buses[(bus.host, bus.port)]
+    bus.stop()
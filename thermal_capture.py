@@ -0,0 +1,193 @@
+# thermal_capture.py
+# 60110 포트 열화상 TCP 스트림 녹화(원본 바이트 + 수신 시각)와 재생 서버
+#
+# 파일 형식 (append-only, little-endian):
+#   헤더   b"THRC" + u16 버전
+#   레코드 f64 수신시각(time.time) + u32 길이 + recv() 로 받은 바이트 그대로
+#
+#   python thermal_capture.py record 192.168.0.56 -o capture.thrc --duration 600
+#   python thermal_capture.py replay capture.thrc --port 60110 [--speed max] [--loop]
+import argparse
+import socket
+import socketserver
+import struct
+import threading
+import time
+from collections import deque
+
+MAGIC = b"THRC"
+VERSION = 1
+HEADER = struct.Struct("<4sH")
+RECORD = struct.Struct("<dI")
+THERMAL_PORT = 60110
+
+
+class ThermalRecorder:
+    # 수신 스레드는 deque 에 넣기만 하고, 파일 쓰기는 별도 스레드에서 처리
+    def __init__(self, path):
+        self.path = path
+        self.records = 0
+        self.bytes = 0
+        self._queue = deque()
+        self._event = threading.Event()
+        self._closed = False
+        self._file = open(path, "wb")
+        self._file.write(HEADER.pack(MAGIC, VERSION))
+        self._writer = threading.Thread(target=self._write_loop, name="ThermalRecorder", daemon=True)
+        self._writer.start()
+
+    def write(self, data, recv_time=None):
+        self._queue.append((time.time() if recv_time is None else recv_time, bytes(data)))
+        self._event.set()
+
+    def attach(self, bus):
+        bus.add_raw_listener(self.write)
+        self._bus = bus
+
+    def _write_loop(self):
+        f = self._file
+        while True:
+            self._event.wait()
+            self._event.clear()
+            while self._queue:
+                t, data = self._queue.popleft()
+                f.write(RECORD.pack(t, len(data)))
+                f.write(data)
+                self.records += 1
+                self.bytes += len(data)
+            f.flush()
+            if self._closed and not self._queue:
+                break
+
+    def close(self):
+        bus = getattr(self, "_bus", None)
+        if bus is not None:
+            bus.remove_raw_listener(self.write)
+        self._closed = True
+        self._event.set()
+        self._writer.join()
+        self._file.close()
+
+
+def read_capture(path):
+    # (수신시각, 바이트) 목록
+    records = []
+    with open(path, "rb") as f:
+        magic, version = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path}: 열화상 녹화 파일이 아닙니다")
+        while True:
+            head = f.read(RECORD.size)
+            if len(head) < RECORD.size:
+                break
+            t, length = RECORD.unpack(head)
+            data = f.read(length)
+            if len(data) < length:
+                break  # 녹화 중 끊긴 마지막 레코드
+            records.append((t, data))
+    return records
+
+
+class _ReplayHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        server = self.server
+        records = server.records
+        if not records:
+            return
+        try:
+            while True:
+                start = time.monotonic()
+                t0 = records[0][0]
+                for t, data in records:
+                    if server.speed:
+                        delay = (t - t0) / server.speed - (time.monotonic() - start)
+                        if delay > 0:
+                            time.sleep(delay)
+                    self.request.sendall(data)
+                    server.sent_bytes += len(data)
+                if not server.loop:
+                    break
+        except OSError:
+            pass
+
+
+class ThermalReplayServer(socketserver.ThreadingTCPServer):
+    # 녹화 파일을 원래 recv 조각 단위로 다시 보내는 로컬 서버.
+    # speed=1.0 이면 원래 속도, speed=None 이면 최대 속도.
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, path_or_records, host="127.0.0.1", port=0, speed=1.0, loop=False):
+        if isinstance(path_or_records, str):
+            path_or_records = read_capture(path_or_records)
+        self.records = path_or_records
+        self.speed = speed
+        self.loop = loop
+        self.sent_bytes = 0
+        super().__init__((host, port), _ReplayHandler)
+        self.port = self.server_address[1]
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, name="ThermalReplay", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def record(host, port, path, duration=None):
+    recorder = ThermalRecorder(path)
+    deadline = None if duration is None else time.monotonic() + duration
+    try:
+        with socket.create_connection((host, port), timeout=10) as s:
+            s.settimeout(1.0)
+            while deadline is None or time.monotonic() < deadline:
+                try:
+                    data = s.recv(4096)
+                except socket.timeout:
+                    continue
+                if not data:
+                    break
+                recorder.write(data)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        recorder.close()
+    print(f"[ThermalRecorder] {recorder.records} records, {recorder.bytes} bytes -> {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rec = sub.add_parser("record")
+    rec.add_argument("host")
+    rec.add_argument("--port", type=int, default=THERMAL_PORT)
+    rec.add_argument("-o", "--output", required=True)
+    rec.add_argument("--duration", type=float)
+
+    rep = sub.add_parser("replay")
+    rep.add_argument("path")
+    rep.add_argument("--host", default="127.0.0.1")
+    rep.add_argument("--port", type=int, default=THERMAL_PORT)
+    rep.add_argument("--speed", default="1", help="재생 배속, max 면 최대 속도")
+    rep.add_argument("--loop", action="store_true")
+
+    args = parser.parse_args()
+    if args.command == "record":
+        record(args.host, args.port, args.output, args.duration)
+    else:
+        speed = None if args.speed == "max" else float(args.speed)
+        server = ThermalReplayServer(args.path, args.host, args.port, speed, args.loop)
+        print(f"[ThermalReplay] {len(server.records)} records on {args.host}:{server.port}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            server.server_close()
+
+
+if __name__ == "__main__":
+    main()
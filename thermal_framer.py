@@ -0,0 +1,78 @@
+# thermal_framer.py
+import re
+
+# 대괄호가 아닌 바이트와 완결된 JSON 문자열을 한 번에 건너뛴다 (정규식 엔진에서 처리)
+_SKIP = re.compile(rb'[^\[\]"]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^\[\]"]*)*')
+
+MAX_BUFFER_BYTES = 1024 * 1024
+
+
+# 60110 포트 TCP 스트림에서 최상위 JSON 배열을 잘라내는 증분 프레이머.
+# 수신 바이트는 하나의 bytearray 에 누적되고, 이미 스캔한 위치부터만 다시 스캔한다.
+# 완성된 배열만 잘라 돌려주므로 read 경계에 걸친 배열이나 UTF-8 멀티바이트 문자도
+# 안전하다 (json.loads 가 bytes 를 직접 디코딩).
+class ThermalFramer:
+    def __init__(self, max_buffer=MAX_BUFFER_BYTES):
+        self.max_buffer = max_buffer
+        self._buf = bytearray()
+        self._pos = 0          # 다음 스캔 시작 위치
+        self._start = -1       # 현재 배열의 '[' 위치
+        self._depth = 0
+        self.frames = 0
+        self.dropped_bytes = 0
+
+    def feed(self, data):
+        # 수신한 바이트를 추가하고 완성된 JSON 배열 목록을 반환
+        buf = self._buf
+        buf += data
+        frames = []
+        pos = self._pos
+        end = len(buf)
+
+        while pos < end:
+            pos = _SKIP.match(buf, pos).end()
+            if pos == end:
+                break
+            token = buf[pos]
+            if token == 0x22:
+                # 닫히지 않은 문자열: 다음 read 에서 이 위치부터 다시 스캔
+                break
+            if token == 0x5B:  # [
+                if self._depth == 0:
+                    self._start = pos
+                self._depth += 1
+            elif self._depth > 0:  # ]
+                self._depth -= 1
+                if self._depth == 0:
+                    frames.append(buf[self._start:pos + 1])
+                    self._start = -1
+            pos += 1
+
+        self._pos = pos
+        self._compact()
+        self.frames += len(frames)
+        return frames
+
+    def reset(self):
+        self.dropped_bytes += len(self._buf)
+        self._buf = bytearray()
+        self._pos = 0
+        self._start = -1
+        self._depth = 0
+
+    def buffered(self):
+        return len(self._buf)
+
+    def _compact(self):
+        # 완성된 배열과 배열 사이의 잡음만 앞에서 잘라낸다 (진행 중인 배열은 유지)
+        keep_from = self._start if self._start >= 0 else self._pos
+        if keep_from:
+            del self._buf[:keep_from]
+            self._pos -= keep_from
+            if self._start >= 0:
+                self._start = 0
+
+        if len(self._buf) > self.max_buffer:
+            # 닫히지 않는 배열이 계속 쌓이는 경우: 버리고 다시 동기화
+            print(f"[ThermalFramer] 버퍼 초과 ({len(self._buf)} bytes), 재동기화")
+            self.reset()
@@ -0,0 +1,129 @@
+# thermal_hub.py
+# 여러 카메라의 60110 TCP 스트림을 하나의 asyncio 이벤트 루프(스레드 1개)에서 수신
+import asyncio
+import os
+import threading
+
+from thermal_receiver import ThermalStream, ThermalReceiver, RECV_SIZE, CONNECT_TIMEOUT, READ_TIMEOUT
+
+# THERMAL_BACKEND=hub 이면 뷰어/그래프가 스레드 대신 허브를 사용
+USE_THERMAL_HUB = os.environ.get("THERMAL_BACKEND", "thread") == "hub"
+
+
+# ThermalReceiver 와 같은 start()/stop()/is_alive() 인터페이스를 가진 허브 연결
+class HubReceiver(ThermalStream):
+    def __init__(self, hub, host, port, data_store, on_roi_refresh=None, roi_data=None, on_samples=None):
+        super().__init__(data_store, on_roi_refresh, roi_data, on_samples)
+        self.hub = hub
+        self.host = host
+        self.port = port
+        self.running = False
+        self._future = None
+
+    def start(self):
+        self.running = True
+        self._future = self.hub.submit(self._run())
+
+    def stop(self):
+        self.running = False
+        self.link.stop()
+        if self._future is not None:
+            self.hub.cancel(self._future)
+
+    def is_alive(self):
+        return self._future is not None and not self._future.done()
+
+    async def _run(self):
+        try:
+            while self.running:
+                await self._session()
+                delay = self.link.next_retry_delay() if self.running else None
+                if delay is None:
+                    break
+                print(f"[HubReceiver] {self.host}:{self.port} {delay:.1f}초 후 재연결 "
+                      f"({self.link.retries}/{self.link.max_retries})")
+                await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self.running = False
+
+    async def _session(self):
+        writer = None
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port), CONNECT_TIMEOUT)
+            self.framer.reset()
+            self.link.connected()
+            while self.running:
+                data = await asyncio.wait_for(reader.read(RECV_SIZE), READ_TIMEOUT)
+                if not data:
+                    print(f"[HubReceiver] {self.host}:{self.port} connection closed by peer")
+                    break
+                self.feed(data)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"[HubReceiver] Connection error {self.host}:{self.port}: {e!r}")
+        finally:
+            if writer is not None:
+                writer.close()
+
+
+class ThermalHub:
+    def __init__(self):
+        self.loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self):
+        with self._lock:
+            if self._thread is None:
+                self.loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self.loop.run_forever, name="ThermalHub", daemon=True)
+                self._thread.start()
+
+    def submit(self, coro):
+        self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def cancel(self, future):
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(future.cancel)
+
+    def connect(self, host, port, data_store, on_roi_refresh=None, roi_data=None, on_samples=None):
+        return HubReceiver(self, host, port, data_store, on_roi_refresh, roi_data, on_samples)
+
+    async def _cancel_all(self):
+        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def shutdown(self):
+        with self._lock:
+            if self._thread is None:
+                return
+            asyncio.run_coroutine_threadsafe(self._cancel_all(), self.loop).result(timeout=2)
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout=2)
+            self.loop.close()
+            self.loop = None
+            self._thread = None
+
+
+_default_hub = None
+
+
+def get_hub():
+    global _default_hub
+    if _default_hub is None:
+        _default_hub = ThermalHub()
+    return _default_hub
+
+
+def create_receiver(host, port, data_store, on_roi_refresh=None, roi_data=None, on_samples=None):
+    # 설정된 백엔드에 맞는 수신기 생성 (반환값은 start() 후 사용)
+    if USE_THERMAL_HUB:
+        return get_hub().connect(host, port, data_store, on_roi_refresh, roi_data, on_samples)
+    return ThermalReceiver(host, port, data_store, on_roi_refresh, roi_data, on_samples)
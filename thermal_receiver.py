@@ -2,67 +2,154 @@ import socket
 import threading
 import json
 import time
-from alarm_utils import evaluate_alarms  # ✅ 추가
+from collections import namedtuple
+from alarm_utils import AlarmEngine  # ✅ 추가
+from thermal_framer import ThermalFramer
+from link_supervisor import LinkSupervisor
+import perf_stats
 
-class ThermalReceiver(threading.Thread):
-    def __init__(self, host, port, data_store, on_roi_refresh=None, roi_data=None):
-        super().__init__(daemon=True)
-        self.host = host
-        self.port = port
+RECV_SIZE = 4096
+CONNECT_TIMEOUT = 10
+READ_TIMEOUT = 10  # 이 시간 동안 아무것도 오지 않으면 끊긴 것으로 보고 재연결
+
+# 한 ROI 의 열화상 측정값 (온도는 float, 좌표는 int, 값이 없으면 None)
+RoiSample = namedtuple("RoiSample", [
+    "area_id", "recv_time", "max", "min", "avr",
+    "point_max_x", "point_max_y", "point_min_x", "point_min_y",
+])
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError, OverflowError):  # OverflowError: Infinity
+        return None
+
+
+# 수신 방식(스레드/asyncio 허브)과 무관한 60110 스트림 처리부
+class ThermalStream:
+    def __init__(self, data_store, on_roi_refresh=None, roi_data=None, on_samples=None):
         self.data_store = data_store
-        self.running = False
         self.on_roi_refresh = on_roi_refresh
+        self.on_samples = on_samples
         self.rois = roi_data or []  # ✅ 알람 조건 보관용
+        self.alarms = AlarmEngine(self.rois) if self.rois else None
+        self.framer = ThermalFramer()
+        self.parse_errors = 0
+        self.link = LinkSupervisor("Thermal")
+        self.raw_tap = None  # 수신 원본 바이트를 받는 함수 (녹화용)
+
+    def feed(self, data):
+        if self.raw_tap:
+            self.raw_tap(data)
+        dropped = self.framer.dropped_bytes
+        t0 = perf_stats.begin()
+        frames = self.framer.feed(data)
+        perf_stats.end("thermal.frame", t0)
+        if self.framer.dropped_bytes != dropped:
+            perf_stats.count("thermal.dropped_bytes", self.framer.dropped_bytes - dropped)
+        for frame in frames:
+            self.handle_frame(frame)
+        self.link.stats.add(len(data), len(frames))
+
+    def handle_frame(self, frame):
+        t0 = perf_stats.begin()
+        try:
+            json_data = json.loads(frame)
+        except ValueError as e:
+            self.parse_errors += 1
+            perf_stats.count("thermal.parse_errors")
+            if self.parse_errors == 1 or self.parse_errors % 100 == 0:
+                print(f"[{type(self).__name__}] JSON parse error ({self.parse_errors}회): {e}")
+            return
+
+        now = time.time()
+        samples = []
+        for item in json_data:
+            if not isinstance(item, dict):
+                continue
+            area_id = item.get("area_id")
+            if area_id is None:
+                continue
+            if type(area_id) is not int:
+                # "3", 3.0, True 같은 id 는 저장소 인덱스로 쓸 수 없으므로 연결은 유지하고 건너뜀
+                self.data_store.ignored += 1
+                continue
+            if area_id == 100:
+                if self.on_roi_refresh:
+                    self.on_roi_refresh()
+            else:
+                sample = RoiSample(
+                    area_id, now,
+                    _to_float(item.get("temp_max")),
+                    _to_float(item.get("temp_min")),
+                    _to_float(item.get("temp_avr")),
+                    _to_int(item.get("point_max_x")),
+                    _to_int(item.get("point_max_y")),
+                    _to_int(item.get("point_min_x")),
+                    _to_int(item.get("point_min_y")),
+                )
+                self.data_store.append(sample)
+                samples.append(sample)
+        perf_stats.end("thermal.parse", t0)
+        perf_stats.count("thermal.messages")
+
+        if samples and self.on_samples:
+            self.on_samples(samples)
+
+        # 알람 조건 평가
+        if self.alarms is not None:
+            self.alarms.update(samples)
+
+
+class ThermalReceiver(ThermalStream, threading.Thread):
+    def __init__(self, host, port, data_store, on_roi_refresh=None, roi_data=None, on_samples=None):
+        threading.Thread.__init__(self, daemon=True)
+        ThermalStream.__init__(self, data_store, on_roi_refresh, roi_data, on_samples)
+        self.host = host
+        self.port = port
+        self.running = False
+        self._sock = None
 
     def run(self):
         self.running = True
-        try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.settimeout(10)
-                s.connect((self.host, self.port))
-                s.settimeout(None)
-
-                while self.running:
-                    data = s.recv(4096)
-                    if not data:
-                        break
-                    try:
-                        decoded = data.decode('utf-8').strip()
-
-                        # 여러 JSON 배열이 붙어있는 경우 처리
-                        chunks = decoded.replace('][', ']|[').split('|')
-
-                        for chunk in chunks:
-                            try:
-                                json_data = json.loads(chunk)
-
-                                for item in json_data:
-                                    area_id = item.get("area_id")
-                                    if area_id == 100 and self.on_roi_refresh:
-                                        self.on_roi_refresh()
-                                    elif area_id is not None:
-                                        self.data_store[area_id] = {
-                                            "max": item.get("temp_max", "-"),
-                                            "min": item.get("temp_min", "-"),
-                                            "avr": item.get("temp_avr", "-"),
-                                            "point_max_x": item.get("point_max_x"),
-                                            "point_max_y": item.get("point_max_y"),
-                                            "point_min_x": item.get("point_min_x"),
-                                            "point_min_y": item.get("point_min_y")
-                                        }
-
-                                # 알람 조건 평가
-                                if self.rois:
-                                    evaluate_alarms(self.rois, self.data_store)
-
-                            except Exception as e:
-                                print(f"[ThermalReceiver] JSON parse error: {e}")
-
-                    except Exception as e:
-                        print(f"[ThermalReceiver] Decode error: {e}")
-        except Exception as e:
-            print(f"[ThermalReceiver] Connection error: {e}")
+        while self.running:
+            try:
+                with socket.create_connection((self.host, self.port), timeout=CONNECT_TIMEOUT) as s:
+                    self._sock = s
+                    s.settimeout(READ_TIMEOUT)
+                    self.framer.reset()
+                    self.link.connected()
 
+                    while self.running:
+                        data = s.recv(RECV_SIZE)
+                        if not data:
+                            print("[ThermalReceiver] Connection closed by peer")
+                            break
+                        self.feed(data)
+            except Exception as e:
+                if self.running:
+                    print(f"[ThermalReceiver] Connection error: {e}")
+            finally:
+                self._sock = None
+            if not self.running or not self.link.wait_retry():
+                break
+        self.running = False
 
     def stop(self):
         self.running = False
+        self.link.stop()
+        sock = self._sock
+        if sock is not None:
+            # 블로킹 recv 를 즉시 깨운다
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
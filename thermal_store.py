@@ -0,0 +1,206 @@
+# thermal_store.py
+# 카메라 1대의 열화상 측정값을 ROI 별 NumPy 링 버퍼에 저장
+#
+# 샘플 1개 = SAMPLE_DTYPE 30 bytes (area_id i2, recv_time f8, max/min/avr f4, 고온/저온 좌표 i2 x4)
+# 각 링은 같은 샘플을 i, i + capacity 두 곳에 써 두는 미러 구조라서 길이 capacity 이하의
+# 어떤 구간도 연속 슬라이스(복사 없는 view)로 꺼낼 수 있다. 대신 메모리는 2배.
+#
+# 카메라·시간당 메모리 (ROI 10개, 초당 10 메시지 기준, 미리 할당):
+#   36,000 샘플/ROI x 10 ROI x 30 B x 2(미러) = 21.6 MB (20.6 MiB)
+# 같은 이력을 기존 dict-of-dicts 형태(샘플마다 7키 dict)로 쌓으면 JSON 값 객체를 빼고도
+# 샘플당 약 280 B, 시간당 약 96 MiB (benchmarks/bench_thermal_store.py 로 측정).
+import bisect
+import math
+import threading
+
+import numpy as np
+
+from thermal_receiver import RoiSample
+
+SAMPLE_DTYPE = np.dtype([
+    ("area_id", "<i2"),
+    ("recv_time", "<f8"),
+    ("max", "<f4"),
+    ("min", "<f4"),
+    ("avr", "<f4"),
+    ("point_max_x", "<i2"),
+    ("point_max_y", "<i2"),
+    ("point_min_x", "<i2"),
+    ("point_min_y", "<i2"),
+])
+
+MAX_AREAS = 10
+HISTORY_SEC = 3600
+EXPECTED_RATE = 10  # 카메라 메시지 수신 빈도 (Hz)
+ALIGN_MAX_SKEW = 1.0  # 시각 맞춤 조회에서 이보다 멀리 떨어진 샘플은 없는 것으로 봄 (초)
+
+NO_POINT = -1
+POINT_MAX = np.iinfo(np.int16).max
+
+
+def valid_point(value):
+    return value is not None and 0 <= value <= POINT_MAX
+
+
+def bad_points(sample):
+    # 값은 있지만 i2 좌표 칸에 담을 수 없는 (음수 또는 int16 초과) 좌표 수
+    return sum(v is not None and not valid_point(v) for v in sample[5:])
+
+
+def sample_record(sample):
+    # RoiSample → SAMPLE_DTYPE 한 행 (None 은 NaN, 없거나 범위 밖 좌표는 NO_POINT)
+    return (
+        sample.area_id,
+        sample.recv_time,
+        math.nan if sample.max is None else sample.max,
+        math.nan if sample.min is None else sample.min,
+        math.nan if sample.avr is None else sample.avr,
+        sample.point_max_x if valid_point(sample.point_max_x) else NO_POINT,
+        sample.point_max_y if valid_point(sample.point_max_y) else NO_POINT,
+        sample.point_min_x if valid_point(sample.point_min_x) else NO_POINT,
+        sample.point_min_y if valid_point(sample.point_min_y) else NO_POINT,
+    )
+
+
+def memory_per_hour(areas=MAX_AREAS, rate=EXPECTED_RATE):
+    return areas * rate * 3600 * SAMPLE_DTYPE.itemsize * 2
+
+
+class ThermalStore:
+    def __init__(self, capacity=HISTORY_SEC * EXPECTED_RATE, max_areas=MAX_AREAS):
+        self.capacity = capacity
+        self.max_areas = max_areas
+        self._data = np.zeros((max_areas, 2 * capacity), SAMPLE_DTYPE)
+        self._count = np.zeros(max_areas, np.int64)  # ROI 별 누적 기록 수
+        self.ignored = 0  # 버린 샘플 + 범위 밖 좌표가 있던 샘플 수
+        self._lock = threading.Lock()  # 쓰기 스레드가 여럿일 때만 의미 있음
+
+    def append(self, sample):
+        area = sample.area_id
+        if type(area) is not int or not 0 <= area < self.max_areas:
+            self.ignored += 1
+            return
+        if bad_points(sample):
+            self.ignored += 1  # 샘플은 저장하되 범위 밖 좌표만 NO_POINT 로
+        row = sample_record(sample)
+        with self._lock:
+            i = self._count[area] % self.capacity
+            ring = self._data[area]
+            ring[i] = row
+            ring[i + self.capacity] = row
+            # 두 곳 모두 기록한 뒤에 count 를 올려야 읽는 쪽이 반쯤 쓴 샘플을 보지 않는다
+            self._count[area] += 1
+
+    # --- 최신 값 (O(1)) ---
+
+    def latest_record(self, area):
+        n = self._count[area]
+        if n == 0:
+            return None
+        return self._data[area, (n - 1) % self.capacity]
+
+    def latest(self, area):
+        if not 0 <= area < self.max_areas:
+            return None
+        rec = self.latest_record(area)
+        if rec is None:
+            return None
+        return _to_sample(rec)
+
+    # 기존 dict 형태 data_store 와 같은 방식으로 쓸 수 있도록 매핑 인터페이스 제공
+    def get(self, area, default=None):
+        sample = self.latest(area)
+        return default if sample is None else sample
+
+    def __getitem__(self, area):
+        sample = self.latest(area)
+        if sample is None:
+            raise KeyError(area)
+        return sample
+
+    def __contains__(self, area):
+        return isinstance(area, int) and 0 <= area < self.max_areas and self._count[area] > 0
+
+    def __bool__(self):
+        return bool(self._count.any())
+
+    def count(self, area):
+        return int(self._count[area])
+
+    # --- 이력 (복사 없는 view) ---
+
+    def last(self, area, n):
+        # 가장 최근 n 개 샘플 (오래된 것 → 최신 순)
+        total = self._count[area]
+        n = min(n, total, self.capacity)
+        end = (total - 1) % self.capacity + self.capacity + 1
+        return self._data[area, end - n:end]
+
+    def history(self, area):
+        return self.last(area, self.capacity)
+
+    def window(self, area, start_time, end_time=None):
+        # recv_time 이 [start_time, end_time] 인 샘플 view (이진 탐색)
+        hist = self.history(area)
+        times = hist["recv_time"]
+        lo = np.searchsorted(times, start_time, side="left")
+        hi = len(times) if end_time is None else np.searchsorted(times, end_time, side="right")
+        return hist[lo:hi]
+
+    # --- 시각 기준 조회 (recv_time 이진 탐색, O(log n)) ---
+
+    def nearest_record(self, area, t, max_skew=None):
+        hist = self.history(area)
+        times = hist["recv_time"]
+        n = len(times)
+        if n == 0:
+            return None
+        # recv_time 은 구조체 배열의 strided view 라서 np.searchsorted 는 전체를 복사한다 → bisect
+        i = bisect.bisect_left(times, t)
+        if i == n or (i > 0 and t - times[i - 1] <= times[i] - t):
+            i -= 1
+        if max_skew is not None and abs(times[i] - t) > max_skew:
+            return None
+        return hist[i]
+
+    def nearest(self, area, t, max_skew=None):
+        if not 0 <= area < self.max_areas:
+            return None
+        rec = self.nearest_record(area, t, max_skew)
+        return None if rec is None else _to_sample(rec)
+
+    def at(self, t, max_skew=ALIGN_MAX_SKEW):
+        # 시각 t (time.time) 에 가장 가까운 ROI 별 샘플 {area_id: RoiSample}
+        # 지연 표시되는 영상 프레임에 overlay 를 맞출 때 사용
+        snapshot = {}
+        for area in np.flatnonzero(self._count):
+            sample = self.nearest(int(area), t, max_skew)
+            if sample is not None:
+                snapshot[int(area)] = sample
+        return snapshot
+
+    def clear(self):
+        with self._lock:
+            self._count[:] = 0
+
+    def nbytes(self):
+        return self._data.nbytes
+
+
+def _temp(value):
+    # float32 로 저장된 값을 카메라가 보낸 소수 자릿수로 되돌림 (NaN 은 None)
+    return None if value != value else round(value, 3)
+
+
+def _to_sample(rec):
+    area, t, t_max, t_min, t_avr, mx, my, nx, ny = rec.item()
+    return RoiSample(
+        area, t,
+        _temp(t_max),
+        _temp(t_min),
+        _temp(t_avr),
+        None if mx == NO_POINT else mx,
+        None if my == NO_POINT else my,
+        None if nx == NO_POINT else nx,
+        None if ny == NO_POINT else ny,
+    )
@@ -0,0 +1,282 @@
+# video_wall.py
+# 여러 카메라를 격자로 보는 영상 월.
+#  - 카메라마다 FrameReader 스레드 1개 (grab 안에서 코덱 디코딩, FFmpeg 디코더 스레드는 1개로 제한해
+#    카메라 수 x CPU 코어 수 만큼 스레드가 생기지 않게 함)
+#  - 리사이즈/색 변환/ROI overlay 합성은 카메라 수와 관계없이 RENDER_WORKERS 개의 공용 렌더 스레드가 처리
+#  - 타일마다 화면에 보이는 크기의 재사용 버퍼에 합성 (고정 640x480 이 아님), 종횡비 유지
+#  - 최소화된 창이나 가려진 타일은 렌더 요청을 하지 않고 FrameReader 를 grab 전용으로 돌리며,
+#    HIDDEN_RELEASE_SEC 넘게 가려져 있으면 영상 연결을 끊었다가 다시 보일 때 연결
+#  - GUI 스레드는 WALL_FPS 타이머에서 완성된 이미지를 그리기만 함
+#
+#   python video_wall.py 192.168.0.56 192.168.0.57 ... [--user admin --pw admin]
+#   (시뮬레이터: VIDEO_URL="http://{ip}:554/stream1" python video_wall.py 127.0.1.1 127.0.1.2 ...)
+import argparse
+import math
+import os
+import queue
+import sys
+import threading
+import time
+
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QPixmap
+from PyQt5.QtWidgets import QApplication, QGridLayout, QLabel, QMainWindow, QSizePolicy, QWidget
+
+from alarm_utils import AlarmEngine
+from frame_reader import FrameReader, VIDEO_URL, capture_profile
+from frame_renderer import DISPLAY_FORMAT, DisplayBuffers, RenderedFrame, fit_size, render_into
+from link_supervisor import CONNECTED, FAILED
+from roi_refresh import RoiRefreshWorker
+from roi_utils import RoiOverlay
+from thermal_bus import acquire_bus, release_bus
+
+THERMAL_PORT = 60110
+WALL_FPS = 15                                 # 타일 갱신 주기 (영상 디코딩도 이 주기까지만)
+RENDER_WORKERS = min(4, os.cpu_count() or 1)  # 공용 렌더 스레드 수
+HIDDEN_RELEASE_SEC = 10                       # 이보다 오래 가려진 타일은 영상 연결을 끊음
+TEXT_MIN_WIDTH = 400                          # 이보다 작은 타일에는 ROI 온도 글자를 그리지 않음
+MIN_TILE_SIZE = (160, 120)
+
+
+class WallCamera:
+    # 카메라 1대: 영상 수신, 열화상 버스 구독, 알람 판정, ROI 설정 (GUI 스레드에서 생성/정지)
+    def __init__(self, ip, user_id, user_pw, port=554):
+        self.ip = ip
+        self.url = VIDEO_URL.format(user=user_id, pw=user_pw, ip=ip, port=port)
+        self.reader = self._make_reader()
+        self.hidden_since = None  # 타일이 화면에서 사라진 시각 (보이면 None)
+        self._released = []       # 오래 가려져서 연결을 끊었고 아직 끝나지 않은 FrameReader (종료 시 join)
+        self.bus = acquire_bus(ip, THERMAL_PORT)
+        self.alarm_engine = AlarmEngine()
+        self.alarm_sub = self.bus.subscribe(callback=self.alarm_engine.update, name=f"wall-{ip}")
+        self.rois = []
+        self.overlay = RoiOverlay()
+        self.buffers = DisplayBuffers()  # 타일 크기 표시 버퍼 + 최신 RenderedFrame 슬롯
+        self.rendered = 0
+        self.busy = False        # 렌더 큐에 들어가 있거나 렌더 중 (카메라당 한 작업만)
+        self._last_time = None
+
+        # ROI 설정은 첫 조회도 백그라운드에서 (카메라 여러 대를 열 때 GUI 가 멈추지 않게)
+        self.roi_refresher = RoiRefreshWorker(ip, user_id, user_pw)
+        self.roi_refresher.rois_ready.connect(self.on_rois_refreshed)
+        self.bus.add_refresh_listener(self.roi_refresher.request)
+
+    def _make_reader(self):
+        profile = capture_profile()  # CAPTURE_PROFILE 환경변수
+        return FrameReader(self.url, profile.delay_sec, WALL_FPS, decode_threads=1, open_async=True, profile=profile)
+
+    def start(self):
+        self.reader.start()
+        self.roi_refresher.start()
+        self.roi_refresher.request()
+
+    def on_rois_refreshed(self, rois):
+        self.rois = rois
+        self.alarm_engine.configure(rois, time.time())
+
+    def render(self, size):
+        # 렌더 스레드: 새 지연 프레임이 있으면 타일 크기로 합성
+        reader = self.reader
+        if reader is None:
+            return
+        frame = reader.get_delayed()
+        frame_time = reader.frame_time
+        if frame is None or frame_time == self._last_time:
+            return
+        self._last_time = frame_time
+        t0 = time.perf_counter()
+        size = fit_size(frame.shape[1], frame.shape[0], *size)
+        thermal = self.bus.data_store.at(frame_time) if size[0] >= TEXT_MIN_WIDTH else None
+        alarms = self.alarm_engine.active_fields(frame_time)
+        buffer, image = render_into(self.buffers, frame, size, DISPLAY_FORMAT,
+                                    self.rois, thermal, alarms, self.overlay)
+        self.rendered += 1
+        self.buffers.latest = RenderedFrame(self.rendered, image, buffer, frame_time, thermal, alarms,
+                                            time.perf_counter() - t0)
+
+    def set_visible(self, visible, now):
+        # GUI 스레드. 가려지면 retrieve 중지, HIDDEN_RELEASE_SEC 넘게 가려져 있으면 영상 연결 자체를 끊음
+        # (FFmpeg 는 grab 안에서 디코딩하므로 grab 만 해도 디코딩 비용은 남는다)
+        # 스레드가 끝난 reader 는 참조를 버려서 프레임 링 메모리가 풀리게 함 (숨김/표시를 반복해도 쌓이지 않음)
+        self._released = [r for r in self._released if r.is_alive()]
+        if visible:
+            if self.hidden_since is None:
+                return
+            self.hidden_since = None
+            self.buffers.clear()  # 가려지기 직전에 끝난 렌더 결과는 버림
+            if self.reader is None:
+                self.reader = self._make_reader()
+                self.reader.start()
+            self.reader.paused = False
+            return
+        if self.hidden_since is None:
+            self.hidden_since = now
+            if self.reader is not None:
+                self.reader.paused = True
+            self.buffers.clear()
+            self._last_time = None
+        elif self.reader is not None and now - self.hidden_since >= HIDDEN_RELEASE_SEC:
+            self.reader.stop()  # 스레드는 진행 중인 grab 이 끝나면 스스로 연결을 닫음
+            self._released.append(self.reader)
+            self.reader = None
+
+    def stop(self):
+        self.bus.remove_refresh_listener(self.roi_refresher.request)
+        self.roi_refresher.stop()
+        if self.reader is not None:
+            self.reader.stop()
+            self._released.append(self.reader)
+            self.reader = None
+        for reader in self._released:
+            if reader.is_alive():
+                reader.join()
+        self.alarm_sub.close()
+        release_bus(self.bus)
+
+
+class WallRenderPool:
+    # 모든 카메라가 공유하는 렌더 스레드 (작업: (camera, tile_size))
+    def __init__(self, workers=RENDER_WORKERS):
+        self._jobs = queue.Queue()
+        self._threads = [
+            threading.Thread(target=self._work, name=f"WallRender-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for t in self._threads:
+            t.start()
+
+    def submit(self, camera, size):
+        # GUI 스레드에서 호출. 카메라당 대기 작업은 최대 1개
+        if camera.busy:
+            return False
+        camera.busy = True
+        self._jobs.put((camera, size))
+        return True
+
+    def _work(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            camera, size = job
+            try:
+                camera.render(size)
+            except Exception as e:
+                print(f"[WallRenderPool] {camera.ip} 렌더 오류: {e}")
+            finally:
+                camera.busy = False
+
+    def stop(self):
+        for _ in self._threads:
+            self._jobs.put(None)
+        for t in self._threads:
+            t.join(3)
+
+
+class CameraTile(QLabel):
+    def __init__(self, camera, parent=None):
+        super().__init__(parent)
+        self.camera = camera
+        self.shown_seq = 0
+        self.setAlignment(Qt.AlignCenter)
+        self.setMinimumSize(*MIN_TILE_SIZE)
+        # 픽스맵 크기가 레이아웃을 키우지 않도록 (타일 크기는 창이 정함)
+        self.setSizePolicy(QSizePolicy.Ignored, QSizePolicy.Ignored)
+        self.setStyleSheet("background-color: black; color: gray;")
+        self.setToolTip(camera.ip)
+        self.show_connecting()
+
+    def show_connecting(self):
+        self.shown_seq = 0
+        self.setText(f"{self.camera.ip}\n연결중...")
+
+    def is_on_screen(self):
+        return self.isVisible() and not self.visibleRegion().isEmpty()
+
+    def show_latest(self):
+        rendered = self.camera.buffers.take()
+        if rendered is None or rendered.seq == self.shown_seq:
+            return False
+        self.shown_seq = rendered.seq
+        self.setPixmap(QPixmap.fromImage(rendered.image))
+        return True
+
+    def show_state(self):
+        reader = self.camera.reader
+        if reader is None:
+            return
+        link = reader.link
+        if link.state != CONNECTED and self.shown_seq:
+            self.shown_seq = 0
+            self.setText(f"{self.camera.ip}\n{'연결 끊김' if link.state == FAILED else '재연결중...'}")
+
+
+class VideoWallWindow(QMainWindow):
+    def __init__(self, ips, user_id, user_pw, fps=WALL_FPS, workers=RENDER_WORKERS):
+        super().__init__()
+        self.setWindowTitle(f"Video Wall ({len(ips)})")
+        self.pool = WallRenderPool(workers)
+        self.cameras = [WallCamera(ip, user_id, user_pw) for ip in ips]
+        self.tiles = []
+        self.blits = 0
+
+        central = QWidget()
+        grid = QGridLayout(central)
+        grid.setContentsMargins(2, 2, 2, 2)
+        grid.setSpacing(2)
+        cols = max(1, math.ceil(math.sqrt(len(ips))))
+        for i, camera in enumerate(self.cameras):
+            tile = CameraTile(camera)
+            grid.addWidget(tile, i // cols, i % cols)
+            self.tiles.append(tile)
+        self.setCentralWidget(central)
+
+        for camera in self.cameras:
+            camera.start()
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.tick)
+        self.timer.start(int(1000 / fps))
+
+    def tick(self):
+        # 보이는 타일: 완성된 프레임을 그리고 다음 프레임 렌더 요청 / 안 보이는 타일: 디코딩 중지
+        window_visible = self.isVisible() and not self.isMinimized()
+        now = time.monotonic()
+        for tile in self.tiles:
+            camera = tile.camera
+            visible = window_visible and tile.is_on_screen()
+            camera.set_visible(visible, now)
+            if not visible:
+                if camera.reader is None and tile.shown_seq:
+                    tile.show_connecting()  # 연결을 끊은 타일: 다시 보일 때 오래된 그림 대신
+                continue
+            if tile.show_latest():
+                self.blits += 1
+            else:
+                tile.show_state()
+            self.pool.submit(camera, (tile.width(), tile.height()))
+
+    def closeEvent(self, event):
+        self.timer.stop()
+        self.pool.stop()
+        for camera in self.cameras:
+            camera.stop()
+        super().closeEvent(event)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("ips", nargs="+")
+    parser.add_argument("--user", default="admin")
+    parser.add_argument("--pw", default="admin")
+    parser.add_argument("--fps", type=int, default=WALL_FPS)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    wall = VideoWallWindow(args.ips, args.user, args.pw, args.fps)
+    wall.resize(1280, 720)
+    wall.show()
+    sys.exit(app.exec_())
+
+
+if __name__ == "__main__":
+    main()